@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+NoTouchPad Benchmark - Conversão de cor
+Compara o caminho antigo (BGR→RGB na câmera + RGB→"RGB" no reconhecedor, com
+alocação a cada frame) com o caminho atual (uma única conversão em buffer reaproveitado)
+
+Author: Renato Castellani
+Version: 1.0.0
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+sys.path.append(str(Path(__file__).resolve().parent.parent / "src"))
+
+from frame_types import CapturedFrame, ColorFormat, convert_color  # noqa: E402
+
+RESOLUTIONS = [(640, 480), (1280, 720)]
+
+
+def legacy_path(bgr: np.ndarray) -> np.ndarray:
+    """Reproduz o fluxo anterior: duas conversões completas com arrays novos."""
+
+    rgb = cv2.cvtColor(bgr, cv2.COLOR_BGR2RGB)  # CameraDetector.capture_frame
+    return cv2.cvtColor(rgb, cv2.COLOR_BGR2RGB)  # GestureRecognizer.detect_hands
+
+
+def current_path(bgr: np.ndarray, rgb_buffer: np.ndarray) -> np.ndarray:
+    """Fluxo atual: a câmera converte uma vez no anel; o reconhecedor recebe RGB e não converte."""
+
+    convert_color(bgr, ColorFormat.BGR, ColorFormat.RGB, dst=rgb_buffer)
+    frame = CapturedFrame(image=rgb_buffer, timestamp=0.0, sequence=0)
+    return frame.as_format(ColorFormat.RGB)
+
+
+def time_per_frame(func, iterations: int) -> float:
+    func()  # aquecimento
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations * 1000.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de conversão de cor por frame")
+    parser.add_argument("--iterations", type=int, default=300)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"🎨 Conversão de cor por frame ({args.iterations} iterações)")
+    for width, height in RESOLUTIONS:
+        bgr = rng.integers(0, 256, (height, width, 3), dtype=np.uint8)
+        rgb_buffer = np.empty_like(bgr)
+
+        legacy_ms = time_per_frame(lambda: legacy_path(bgr), args.iterations)
+        current_ms = time_per_frame(lambda: current_path(bgr, rgb_buffer), args.iterations)
+        saved_ms = legacy_ms - current_ms
+        saved_mb = 2 * bgr.nbytes / 1e6
+
+        print(
+            f"  {width}x{height}: antes {legacy_ms:.3f} ms | depois {current_ms:.3f} ms | "
+            f"economia {saved_ms:.3f} ms/frame ({saved_ms / legacy_ms * 100:.0f}%), "
+            f"{saved_mb:.1f} MB/frame sem alocação"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+NoTouchPad Benchmark - Latência do gamepad virtual
+Mede o tempo entre a chamada de GamepadController.process_gestures e a escrita do
+SYN_REPORT, usando o writer em memória (dispensa /dev/uinput e o módulo do kernel)
+
+Author: Renato Castellani
+Version: 1.0.0
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).resolve().parent.parent / "src"))
+
+from gamepad_controller import GamepadController  # noqa: E402
+from gesture_mapping import GestureBinding, MappingProfile  # noqa: E402
+from hand_landmarks import GestureType, HandPosition  # noqa: E402
+from virtual_gamepad import (  # noqa: E402
+    BTN_A,
+    BTN_B,
+    EV_KEY,
+    EV_SYN,
+    GamepadButton,
+    RecordingUInputWriter,
+    UInputGamepad,
+)
+
+# Sequência cíclica de frames: cada passo muda pelo menos um botão.
+FRAMES = [
+    [HandPosition(0.4, 0.5, GestureType.FIST, handedness="Right")],
+    [HandPosition(0.4, 0.5, GestureType.OPEN_HAND, handedness="Right")],
+    [
+        HandPosition(0.4, 0.5, GestureType.FIST, handedness="Right"),
+        HandPosition(0.6, 0.5, GestureType.OPEN_HAND, handedness="Left"),
+    ],
+    [],
+]
+
+PROFILE = MappingProfile(
+    "benchmark",
+    [GestureBinding(GestureType.FIST, GamepadButton.A), GestureBinding(GestureType.OPEN_HAND, GamepadButton.B)],
+)
+
+
+def check_event_stream() -> None:
+    """Confere o contrato: só eventos alterados e um SYN_REPORT por frame."""
+
+    writer = RecordingUInputWriter()
+    controller = GamepadController(UInputGamepad(writer), PROFILE)
+
+    controller.process_gestures(FRAMES[0])
+    controller.process_gestures(FRAMES[0])  # sem mudança: nada escrito
+    controller.process_gestures(FRAMES[2])
+    controller.process_gestures(FRAMES[3])
+    stream = [event[1:] for event in writer.events]
+    expected = [
+        (EV_KEY, BTN_A, 1), (EV_SYN, 0, 0),
+        (EV_KEY, BTN_B, 1), (EV_SYN, 0, 0),
+    ]
+    assert stream[:4] == expected, stream
+    assert sorted(stream[4:6]) == [(EV_KEY, BTN_A, 0), (EV_KEY, BTN_B, 0)], stream
+    assert stream[6:] == [(EV_SYN, 0, 0)], stream
+    assert writer.reports == 3
+
+
+def measure(iterations: int) -> np.ndarray:
+    writer = RecordingUInputWriter()
+    controller = GamepadController(UInputGamepad(writer), PROFILE)
+
+    latencies = np.empty(iterations, dtype=np.float64)
+    for idx in range(iterations):
+        writer.clear()
+        start = time.perf_counter_ns()
+        controller.process_gestures(FRAMES[idx % len(FRAMES)])
+        latencies[idx] = (writer.events[-1][0] - start) / 1000.0
+    return latencies
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    check_event_stream()
+    latencies = measure(args.iterations)
+    p50, p99 = np.percentile(latencies, [50, 99])
+    print(f"🎮 process_gestures → SYN_REPORT ({args.iterations} frames, writer em memória)")
+    print(f"  p50 {p50:.1f} µs   p99 {p99:.1f} µs   máx {latencies.max():.1f} µs")
+
+
+if __name__ == "__main__":
+    main()
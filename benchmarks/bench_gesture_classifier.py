@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+NoTouchPad Benchmark - Classificador de gestos
+Compara o custo por mão do classificador antigo (landmark a landmark via atributos
+do protobuf do MediaPipe) com o classificador vetorizado em NumPy
+
+Author: Renato Castellani
+Version: 1.0.0
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).resolve().parent.parent / "src"))
+
+import hand_landmarks as hl  # noqa: E402
+from hand_landmarks import GESTURES_BY_CODE, GestureType  # noqa: E402
+
+# Dedos estendidos (polegar, indicador, médio, anelar, mínimo) de cada pose sintética.
+POSES = {
+    GestureType.FIST: (False, False, False, False, False),
+    GestureType.OPEN_HAND: (True, True, True, True, True),
+    GestureType.POINTING: (False, True, False, False, False),
+    GestureType.THUMBS_UP: (True, False, False, False, False),
+    GestureType.PEACE: (False, True, True, False, False),
+}
+
+
+def synthetic_hand(extended, rng=None, noise: float = 0.003) -> np.ndarray:
+    """Gera landmarks (21, 3) plausíveis de uma mão direita com os dedos indicados."""
+
+    hand = np.zeros((hl.NUM_LANDMARKS, 3), dtype=np.float32)
+    hand[hl.WRIST] = (0.5, 0.8, 0.0)
+    for finger, base_x in enumerate((0.44, 0.47, 0.5, 0.53, 0.56)):
+        first = 1 + finger * 4
+        for joint in range(4):
+            if finger == 0:
+                # Polegar (mão direita): estendido aponta para x menor.
+                step = -0.03 if extended[0] else 0.005
+                hand[first + joint] = (base_x + step * joint, 0.72 - 0.01 * joint, 0.0)
+            else:
+                rise = 0.05 if extended[finger] else (0.03 if joint < 2 else -0.01)
+                hand[first + joint] = (base_x, 0.7 - rise * joint, 0.0)
+    if rng is not None:
+        hand += rng.normal(0.0, noise, hand.shape).astype(np.float32)
+    return hand
+
+
+def to_protobuf_like(hand: np.ndarray):
+    """Imita NormalizedLandmarkList: objetos com atributos x/y/z."""
+
+    return SimpleNamespace(landmark=[SimpleNamespace(x=float(x), y=float(y), z=float(z)) for x, y, z in hand])
+
+
+def legacy_recognize(landmarks, handed_label: str, threshold: float = 0.02) -> GestureType:
+    """Cópia do classificador anterior (dict de dedos + leituras individuais de atributos)."""
+
+    def finger(tip_idx, pip_idx):
+        return (landmarks.landmark[pip_idx].y - landmarks.landmark[tip_idx].y) > threshold
+
+    tip = landmarks.landmark[hl.THUMB_TIP]
+    mcp = landmarks.landmark[hl.THUMB_MCP]
+    if handed_label.lower() == "right":
+        thumb = (mcp.x - tip.x) > threshold
+    elif handed_label.lower() == "left":
+        thumb = (tip.x - mcp.x) > threshold
+    else:
+        wrist = landmarks.landmark[hl.WRIST]
+        thumb = abs(tip.x - wrist.x) > abs(mcp.x - wrist.x) + threshold
+
+    states = {
+        "index": finger(hl.INDEX_FINGER_TIP, hl.INDEX_FINGER_PIP),
+        "middle": finger(hl.MIDDLE_FINGER_TIP, hl.MIDDLE_FINGER_PIP),
+        "ring": finger(hl.RING_FINGER_TIP, hl.RING_FINGER_PIP),
+        "pinky": finger(hl.PINKY_TIP, hl.PINKY_PIP),
+        "thumb": thumb,
+    }
+    count = sum(states.values())
+    if count == 0:
+        return GestureType.FIST
+    if count == 5:
+        return GestureType.OPEN_HAND
+    if count == 1 and states["index"]:
+        return GestureType.POINTING
+    if count == 1 and states["thumb"]:
+        return GestureType.THUMBS_UP
+    if count == 2 and states["index"] and states["middle"]:
+        return GestureType.PEACE
+    return GestureType.UNKNOWN
+
+
+def legacy_hand(landmarks, label):
+    gesture = legacy_recognize(landmarks, label)
+    xs = [lm.x for lm in landmarks.landmark]
+    ys = [lm.y for lm in landmarks.landmark]
+    return gesture, float(np.mean(xs)), float(np.mean(ys))
+
+
+def vectorized_hands(hands, handedness):
+    stack = hl.stack_landmarks(hands)
+    codes = hl.classify_gestures(stack, handedness)
+    centroids = hl.hand_centroids(stack)
+    return codes, centroids
+
+
+def time_us(func, iterations: int, repeats: int = 5) -> float:
+    """Melhor média de `repeats` rodadas (como o timeit): menos ruído de outros processos."""
+
+    func()
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        best = min(best, time.perf_counter() - start)
+    return best / iterations * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-benchmark do classificador de gestos")
+    parser.add_argument("--iterations", type=int, default=5000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    arrays = [synthetic_hand(ext, rng) for ext in POSES.values()]
+    hands = [to_protobuf_like(arr) for arr in arrays]
+
+    for expected, arr, hand in zip(POSES, arrays, hands):
+        vector = GESTURES_BY_CODE[hl.classify_gestures(arr, np.int8(1))[0]]
+        legacy = legacy_recognize(hand, "Right")
+        assert vector is legacy is expected, (expected, vector, legacy)
+
+    print(f"🖐️ Classificação de gestos ({args.iterations} iterações)")
+    for n_hands in (1, 2, 5):
+        batch = hands[:n_hands]
+        handedness = np.ones(n_hands, dtype=np.int8)
+        legacy_us = time_us(lambda: [legacy_hand(h, "Right") for h in batch], args.iterations)
+        vector_us = time_us(lambda: vectorized_hands(batch, handedness), args.iterations)
+        stack = np.stack(arrays[:n_hands])
+        classify_us = time_us(lambda: hl.classify_gestures(stack, handedness), args.iterations)
+        print(
+            f"  {n_hands} mão(s): antes {legacy_us / n_hands:.1f} µs/mão | "
+            f"depois {vector_us / n_hands:.1f} µs/mão (conversão + regras) | "
+            f"só regras {classify_us / n_hands:.1f} µs/mão"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+NoTouchPad Benchmark - Filtros de posição da mão
+Reproduz uma trajetória (sintética ou gravada em .npy) pelos filtros One Euro e
+Kalman e relata tremor (jitter) x atraso (lag), além de alocações por frame
+
+Author: Renato Castellani
+Version: 1.0.0
+"""
+
+import argparse
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).resolve().parent.parent / "src"))
+
+from hand_filters import CENTROID, HandMotionFilter  # noqa: E402
+from hand_landmarks import NUM_LANDMARKS  # noqa: E402
+
+FPS = 30.0
+
+
+def synthetic_replay(seconds: float, noise: float, seed: int = 0):
+    """Mão parada, depois varrendo em seno, depois parada; landmarks com ruído gaussiano."""
+
+    rng = np.random.default_rng(seed)
+    times = np.arange(0.0, seconds, 1.0 / FPS)
+    truth = np.full((len(times), 2), 0.5)
+    moving = (times > seconds / 3) & (times < 2 * seconds / 3)
+    phase = (times[moving] - seconds / 3) * 2.0 * np.pi * 0.8
+    truth[moving, 0] = 0.5 + 0.25 * np.sin(phase)
+    truth[moving, 1] = 0.5 + 0.1 * np.sin(2 * phase)
+
+    offsets = rng.normal(0.0, 0.05, (NUM_LANDMARKS, 2))
+    offsets -= offsets.mean(axis=0)
+    landmarks = np.zeros((len(times), NUM_LANDMARKS, 3), dtype=np.float32)
+    landmarks[:, :, :2] = truth[:, None, :] + offsets[None]
+    # Ruído comum à mão inteira (tremor do detector) mais ruído por landmark.
+    landmarks[:, :, :2] += rng.normal(0.0, noise, (len(times), 1, 2))
+    landmarks[:, :, :2] += rng.normal(0.0, noise / 2, (len(times), NUM_LANDMARKS, 2))
+    return times, landmarks, truth, moving
+
+
+def recorded_replay(path: Path):
+    """Carrega landmarks (T, 21, 3) gravados; a referência é uma média móvel centrada."""
+
+    landmarks = np.load(path).astype(np.float32)
+    times = np.arange(len(landmarks)) / FPS
+    raw = landmarks[:, :, :2].mean(axis=1)
+    kernel = np.ones(7) / 7.0
+    truth = np.stack([np.convolve(raw[:, axis], kernel, mode="same") for axis in range(2)], axis=1)
+    speed = np.linalg.norm(np.gradient(truth, axis=0), axis=1) * FPS
+    return times, landmarks, truth, speed > 0.05
+
+
+def run(filter_factory, times, landmarks):
+    outputs = np.zeros((len(times), 2))
+    hand_filter = filter_factory()
+    for idx, (timestamp, frame) in enumerate(zip(times, landmarks)):
+        if hand_filter is None:
+            outputs[idx] = frame[:, :2].mean(axis=0)
+        else:
+            hand_filter.update(frame, timestamp)
+            outputs[idx] = hand_filter.predicted[CENTROID]
+    return outputs
+
+
+def lag_ms(output, truth, times, moving) -> float:
+    """Atraso (em passos de 2 ms) que melhor alinha a saída com a referência em movimento."""
+
+    idx = np.flatnonzero(moving)
+    idx = idx[(idx > 10) & (idx < len(truth) - 10)]
+    best_shift, best_error = 0.0, np.inf
+    for shift in np.arange(-60.0, 150.0, 2.0):
+        shifted_times = times[idx] - shift / 1000.0
+        reference = np.stack([np.interp(shifted_times, times, truth[:, axis]) for axis in range(2)], axis=1)
+        error = np.mean(np.sum((output[idx] - reference) ** 2, axis=1))
+        if error < best_error:
+            best_shift, best_error = shift, error
+    return best_shift
+
+
+def allocations_per_frame(factory, times, landmarks) -> float:
+    hand_filter = factory()
+    if hand_filter is None:
+        return float("nan")
+    hand_filter.update(landmarks[0], times[0])
+    hand_filter.update(landmarks[1], times[1])
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    for timestamp, frame in zip(times[2:], landmarks[2:]):
+        hand_filter.update(frame, timestamp)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    growth = sum(stat.size_diff for stat in after.compare_to(before, "filename") if stat.size_diff > 0)
+    return growth / max(1, len(times) - 2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Jitter x lag dos filtros de mão")
+    parser.add_argument("--replay", type=Path, help="arquivo .npy com landmarks (T, 21, 3)")
+    parser.add_argument("--seconds", type=float, default=12.0)
+    parser.add_argument("--noise", type=float, default=0.004)
+    parser.add_argument("--lead-ms", type=float, default=30.0)
+    args = parser.parse_args()
+
+    if args.replay:
+        times, landmarks, truth, moving = recorded_replay(args.replay)
+    else:
+        times, landmarks, truth, moving = synthetic_replay(args.seconds, args.noise)
+
+    lead = args.lead_ms / 1000.0
+    variants = {
+        "bruto": lambda: None,
+        "one_euro": lambda: HandMotionFilter("one_euro", lead_time=0.0),
+        f"one_euro +{args.lead_ms:.0f}ms": lambda: HandMotionFilter("one_euro", lead_time=lead),
+        "kalman": lambda: HandMotionFilter("kalman", lead_time=0.0),
+        f"kalman +{args.lead_ms:.0f}ms": lambda: HandMotionFilter("kalman", lead_time=lead),
+    }
+
+    # Jitter medido no trecho parado antes do primeiro movimento (ignora a convergência inicial).
+    static = np.zeros_like(moving)
+    static[10:np.flatnonzero(moving)[0]] = True
+    print(f"🖐️ Filtros de mão: {len(times)} frames @ {FPS:.0f} fps")
+    print(f"  {'variante':<18} {'jitter (parado)':>16} {'erro (movendo)':>15} {'lag':>8} {'µs/frame':>9} {'B/frame':>8}")
+    for name, factory in variants.items():
+        start = time.perf_counter()
+        output = run(factory, times, landmarks)
+        per_frame_us = (time.perf_counter() - start) / len(times) * 1e6
+        jitter = np.sqrt(np.mean(np.sum((output[static] - truth[static]) ** 2, axis=1)))
+        moving_error = np.sqrt(np.mean(np.sum((output[moving] - truth[moving]) ** 2, axis=1)))
+        print(
+            f"  {name:<18} {jitter:>16.5f} {moving_error:>15.5f} {lag_ms(output, truth, times, moving):>6.0f}ms "
+            f"{per_frame_us:>9.1f} {allocations_per_frame(factory, times, landmarks):>8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
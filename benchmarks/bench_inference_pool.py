@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+NoTouchPad Benchmark - Pool de inferência multiprocesso
+Mede a vazão (frames/s) do InferencePool com 1..N workers usando um reconhecedor
+sintético preso à GIL (número fixo de iterações em Python puro por frame), simulando
+várias câmeras. O speedup é comparado com o ideal min(workers, os.cpu_count()): com
+trabalho fixo por frame, vazão maior só vem de paralelismo real.
+
+Com `--source bus` cada câmera publica num FrameBus a `--camera-fps` (como o
+CameraDetector com `attach_frame_bus`) e os workers leem o slot do barramento via
+`submit_bus`, sem cópia.
+
+Author: Renato Castellani
+Version: 1.0.0
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).resolve().parent.parent / "src"))
+
+from frame_bus import FrameBus  # noqa: E402
+from frame_types import ColorFormat  # noqa: E402
+from hand_landmarks import GestureType, HandPosition  # noqa: E402
+from inference_pool import InferencePool  # noqa: E402
+
+
+def synthetic_work(iterations: int) -> int:
+    acc = 0
+    for _ in range(iterations):
+        acc += sum(range(200))
+    return acc
+
+
+def calibrate(cost_ms: float) -> int:
+    """Iterações de `synthetic_work` que custam ~`cost_ms` em um núcleo (medido uma vez)."""
+
+    iterations = 100
+    while True:
+        started = time.perf_counter()
+        synthetic_work(iterations)
+        elapsed_ms = (time.perf_counter() - started) * 1000.0
+        if elapsed_ms >= 50.0:
+            return max(1, int(iterations * cost_ms / elapsed_ms))
+        iterations *= 2
+
+
+class SyntheticRecognizer:
+    """Substituto do GestureRecognizer: `iterations` fixas de Python puro por frame.
+
+    O trabalho por frame não depende do relógio, então frames/s só cresce se os workers
+    realmente rodarem em paralelo.
+    """
+
+    def __init__(self, iterations: int) -> None:
+        self.iterations = iterations
+
+    def detect_hands(self, frame: np.ndarray, color_format: ColorFormat = ColorFormat.RGB):
+        synthetic_work(self.iterations)
+        landmarks = np.full((21, 3), frame[0, 0, 0] / 255.0, dtype=np.float32)
+        return [HandPosition(0.5, 0.5, GestureType.FIST, score=0.9, handedness="Right", landmarks=landmarks)]
+
+
+def measure(
+    workers: int, cameras: int, mode: str, seconds: float, shape, iterations: int, source: str, camera_fps: float
+) -> float:
+    frames = [np.full(shape, cam, dtype=np.uint8) for cam in range(cameras)]
+    buses = [FrameBus.create(shape) for _ in range(cameras)] if source == "bus" else []
+    sequences = [0] * cameras
+    next_capture = [0.0] * cameras
+
+    def submit(pool: InferencePool, cam: int) -> None:
+        if buses:
+            now = time.perf_counter()
+            if now < next_capture[cam]:
+                return
+            next_capture[cam] = now + 1.0 / camera_fps
+            buses[cam].publish(frames[cam])
+            pool.submit_bus(cam, buses[cam])
+        else:
+            sequences[cam] += 1
+            pool.submit(cam, frames[cam], sequence=sequences[cam])
+
+    def valid(results) -> int:
+        return sum(result.error is None for result in results)
+
+    processed = 0
+    with InferencePool(
+        workers,
+        frame_shape=shape,
+        mode=mode,
+        recognizer_factory=SyntheticRecognizer,
+        recognizer_kwargs={"iterations": iterations},
+    ) as pool:
+        # Aquecimento: espera todos os workers subirem.
+        for cam in range(cameras):
+            submit(pool, cam)
+        while pool.in_flight:
+            pool.poll_results(timeout=1.0)
+
+        start = time.perf_counter()
+        while time.perf_counter() - start < seconds:
+            for cam in range(cameras):
+                submit(pool, cam)
+            processed += valid(pool.poll_results(timeout=0.002))
+        elapsed = time.perf_counter() - start
+        while pool.in_flight:
+            processed += valid(pool.poll_results(timeout=1.0))
+        failed = pool.failed_frames
+    for bus in buses:
+        bus.close()
+    if failed:
+        print(f"  ⚠️  {failed} frames sobrescritos no barramento durante a inferência")
+    return processed / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--cost-ms", type=float, default=8.0)
+    parser.add_argument("--max-workers", type=int, default=min(4, os.cpu_count() or 1))
+    parser.add_argument("--mode", choices=("per_camera", "round_robin"), default="per_camera")
+    parser.add_argument("--source", choices=("copy", "bus"), default="copy",
+                        help="copy: submit() copia o frame; bus: submit_bus() lê do FrameBus")
+    parser.add_argument("--camera-fps", type=float, default=30.0, help="ritmo de publicação no modo bus")
+    args = parser.parse_args()
+
+    shape = (480, 640, 3)
+    cpus = os.cpu_count() or 1
+    iterations = calibrate(args.cost_ms)
+    print(f"🧵 InferencePool ({args.mode}, {args.source}), {iterations} iterações/frame "
+          f"(~{args.cost_ms:.0f} ms), {cpus} CPUs")
+    if args.source == "bus":
+        # Uma câmera por worker a `camera_fps`: a vazão é limitada pela oferta de frames.
+        print(f"  {'workers':>7} {'frames/s':>9} {'ofertados':>9} {'atendidos':>9}")
+        for workers in range(1, args.max_workers + 1):
+            fps = measure(workers, workers, args.mode, args.seconds, shape, iterations, "bus", args.camera_fps)
+            offered = workers * args.camera_fps
+            print(f"  {workers:>7} {fps:>9.1f} {offered:>9.1f} {fps / offered:>9.0%}")
+        return
+
+    print(f"  {'workers':>7} {'frames/s':>9} {'speedup':>8} {'ideal':>6} {'eficiência':>10}")
+    baseline = None
+    for workers in range(1, args.max_workers + 1):
+        fps = measure(workers, workers, args.mode, args.seconds, shape, iterations, "copy", args.camera_fps)
+        baseline = baseline or fps
+        speedup = fps / baseline
+        ideal = min(workers, cpus)
+        print(f"  {workers:>7} {fps:>9.1f} {speedup:>7.2f}x {ideal:>5}x {speedup / ideal:>9.0%}")
+
+if __name__ == "__main__":
+    main()
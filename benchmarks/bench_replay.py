@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+NoTouchPad Benchmark - Replay de sessões gravadas
+Passa uma sessão gravada (vídeo, diretório de imagens ou dump .npy) pelo mesmo caminho da
+webcam (CameraDetector → GestureRecognizer → GestureSmoother) e relata FPS, latência por
+estágio e acurácia contra os rótulos da sessão; roda em máquinas sem câmera (CI)
+
+Exemplos:
+    python benchmarks/bench_replay.py sessoes/punho.npy --pacing fast
+    python benchmarks/bench_replay.py sessoes/mista.mp4 --pacing realtime --profile competitive
+    python benchmarks/bench_replay.py sessoes/punho.npy --output atual.json --compare base.json
+
+Author: Renato Castellani
+Version: 1.0.0
+"""
+
+import argparse
+import json
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent / "src"))
+
+from camera_detector import CameraDetector  # noqa: E402
+from frame_sources import Pacing, expand_labels, load_metadata, open_frame_source  # noqa: E402
+from gesture_recognizer import GestureRecognizer, GestureType  # noqa: E402
+from gesture_smoothing import GestureSmoother  # noqa: E402
+from instrumentation import PipelineMetrics, Rate, Stage  # noqa: E402
+from performance_profiles import PROFILES, apply_to_recognizer  # noqa: E402
+
+
+def accuracy(predicted, expected) -> str:
+    pairs = [(p, e) for p, e in zip(predicted, expected) if e is not None]
+    if not pairs:
+        return "sem rótulos"
+    hits = sum(p == e for p, e in pairs)
+    return f"{hits / len(pairs):.1%} ({hits}/{len(pairs)})"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Replay determinístico de sessões gravadas")
+    parser.add_argument("session", type=Path)
+    parser.add_argument("--pacing", choices=[p.value for p in Pacing], default=Pacing.FAST.value)
+    parser.add_argument("--speed", type=float, default=1.0, help="multiplicador do ritmo em tempo real")
+    parser.add_argument("--profile", choices=sorted(PROFILES), help="perfil de desempenho do recognizer")
+    parser.add_argument("--output", type=Path, help="grava as predições por frame em JSON")
+    parser.add_argument("--compare", type=Path, help="predições de referência para comparar (regressão)")
+    args = parser.parse_args()
+
+    pacing = Pacing(args.pacing)
+    source = open_frame_source(args.session, pacing=pacing, speed=args.speed)
+    metadata = load_metadata(args.session)
+    total_frames = source.frame_count
+    expected = expand_labels(metadata.get("labels", []), total_frames)
+
+    metrics = PipelineMetrics()
+    # A sessão dita a resolução: o CameraDetector só empresta o anel e faz a conversão de cor.
+    camera = CameraDetector(capture_factory=lambda: source)
+    camera.metrics = metrics
+    recognizer = GestureRecognizer()
+    recognizer.metrics = metrics
+    smoother = GestureSmoother()
+    if args.profile:
+        profile = PROFILES[args.profile]
+        apply_to_recognizer(profile, recognizer)
+        smoother.configure(profile.smoothing_window, profile.enter_votes, profile.exit_votes, profile.min_hold)
+    if not camera.initialize_camera():
+        sys.exit(f"❌ Não foi possível abrir {args.session}")
+
+    frames = []
+    raw_predictions = [None] * total_frames
+    smoothed_predictions = [None] * total_frames
+    last_hand = None
+    started = time.perf_counter()
+    # Sem thread leitora: em tempo real a própria fonte descarta os frames que ficaram para trás.
+    while True:
+        lease = camera.lease_frame()
+        if lease is None:
+            break
+        index = source.position - 1
+        with lease:
+            hands = recognizer.detect_hands(lease.frame)
+        smoother.update(hands, source.frame_time(index))
+        metrics.tick(Rate.INFERENCE)
+        if hands:
+            last_hand = hands[0].handedness
+        raw = hands[0].gesture if hands else GestureType.UNKNOWN
+        smoothed = smoother.stable_gesture(last_hand) if last_hand else GestureType.UNKNOWN
+        raw_predictions[index] = raw.value
+        smoothed_predictions[index] = smoothed.value
+        frames.append([index, raw.value, smoothed.value])
+    elapsed = time.perf_counter() - started
+    camera.release_camera()
+    recognizer.close()
+
+    processed = len(frames)
+    print(f"🎞️ Replay {args.session} ({total_frames} frames, {pacing.value}, perfil {args.profile or 'padrão'})")
+    print(f"  processados: {processed} frames em {elapsed:.2f}s → {processed / max(elapsed, 1e-9):.1f} fps"
+          f" (descartados pelo ritmo: {source.dropped_frames})")
+    for stage in (Stage.COLOR_CONVERSION, Stage.INFERENCE_CONVERSION, Stage.INFERENCE, Stage.CLASSIFICATION):
+        summary = metrics.histograms[stage].summary()
+        if summary["count"]:
+            print(f"  {stage.value:<20} p50 {summary['p50_ms']:6.2f} ms  p95 {summary['p95_ms']:6.2f} ms"
+                  f"  p99 {summary['p99_ms']:6.2f} ms")
+    print(f"  gestos (bruto): {dict(Counter(p for _, p, _ in frames))}")
+    print(f"  acurácia bruta: {accuracy(raw_predictions, expected)}")
+    print(f"  acurácia suavizada: {accuracy(smoothed_predictions, expected)}")
+
+    if args.compare:
+        reference = {index: raw for index, raw, _ in json.loads(args.compare.read_text())["frames"]}
+        common = [(reference[index], raw) for index, raw, _ in frames if index in reference]
+        same = sum(a == b for a, b in common)
+        print(f"  concordância com {args.compare}: {same}/{len(common)} frames")
+
+    if args.output:
+        report = {
+            "session": str(args.session),
+            "pacing": pacing.value,
+            "profile": args.profile,
+            "fps": processed / max(elapsed, 1e-9),
+            "metrics": metrics.snapshot(),
+            "frames": frames,
+        }
+        args.output.write_text(json.dumps(report), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
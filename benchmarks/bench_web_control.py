@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+NoTouchPad Benchmark - Round-trip do controle remoto da Web GUI
+Compara o round-trip de um gesto pelo WebSocket binário (/ws/control) com o POST JSON
+(/api/gesture) em conexão keep-alive e em conexão nova por requisição (como um navegador
+sem keep-alive), e mede a vazão de eventos de analógico
+
+Exemplo:
+    python benchmarks/bench_web_control.py --rounds 2000
+
+Author: Renato Castellani
+Version: 1.0.0
+"""
+
+import argparse
+import base64
+import http.client
+import os
+import socket
+import sys
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).resolve().parent.parent / "src"))
+
+from main_web_gui import NoTouchPadWebGUI, create_server  # noqa: E402
+from web_control import (  # noqa: E402
+    ACK_FLAG,
+    STICK,
+    encode_frame,
+    encode_gesture,
+    encode_ping,
+    encode_stick,
+    parse_frames,
+    websocket_accept,
+)
+
+
+class ControlClient:
+    """Cliente WebSocket mínimo e bloqueante (frames mascarados, como exige o protocolo)."""
+
+    def __init__(self, port: int) -> None:
+        self.sock = socket.create_connection(("127.0.0.1", port))
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        key = base64.b64encode(os.urandom(16)).decode("ascii")
+        self.sock.sendall(
+            f"GET /ws/control HTTP/1.1\r\nHost: bench\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+            f"Sec-WebSocket-Key: {key}\r\nSec-WebSocket-Version: 13\r\n\r\n".encode("ascii")
+        )
+        response = b""
+        while b"\r\n\r\n" not in response:
+            response += self.sock.recv(4096)
+        head, _, rest = response.partition(b"\r\n\r\n")
+        if b" 101 " not in head or websocket_accept(key).encode("ascii") not in head:
+            raise RuntimeError(f"handshake recusado: {head!r}")
+        self.buffer = bytearray(rest)
+
+    def send(self, payload: bytes) -> None:
+        self.sock.sendall(encode_frame(payload, mask=os.urandom(4)))
+
+    def receive(self) -> bytes:
+        while True:
+            for _, _, payload in parse_frames(self.buffer, require_mask=False):
+                return payload
+            self.buffer += self.sock.recv(65536)
+
+    def close(self) -> None:
+        self.sock.close()
+
+
+def percentiles(samples_ms):
+    samples = np.asarray(samples_ms)
+    return np.percentile(samples, 50), np.percentile(samples, 99)
+
+
+def bench_websocket(port: int, rounds: int, payload_of):
+    client = ControlClient(port)
+    samples = []
+    for idx in range(rounds):
+        started = time.perf_counter()
+        client.send(payload_of(idx))
+        reply = client.receive()
+        samples.append((time.perf_counter() - started) * 1000)
+        if reply[0] & ACK_FLAG == 0:
+            raise RuntimeError("resposta inesperada")
+    client.close()
+    return samples
+
+
+def bench_post(port: int, rounds: int, keep_alive: bool):
+    samples = []
+    connection = http.client.HTTPConnection("127.0.0.1", port)
+    for _ in range(rounds):
+        if not keep_alive:
+            connection = http.client.HTTPConnection("127.0.0.1", port)
+        started = time.perf_counter()
+        connection.request("POST", "/api/gesture", body=b'{"gesture":"punch"}',
+                           headers={"Content-Type": "application/json"})
+        connection.getresponse().read()
+        samples.append((time.perf_counter() - started) * 1000)
+        if not keep_alive:
+            connection.close()
+    connection.close()
+    return samples
+
+
+def bench_stick_throughput(port: int, count: int) -> float:
+    """Eventos de analógico enviados em rajada; a vazão conta até a última resposta."""
+
+    client = ControlClient(port)
+    started = time.perf_counter()
+    sender = threading.Thread(target=lambda: [
+        client.send(encode_stick(0, np.sin(idx / 50), np.cos(idx / 50), idx)) for idx in range(count)
+    ])
+    sender.start()
+    for _ in range(count):
+        client.receive()
+    sender.join()
+    elapsed = time.perf_counter() - started
+    client.close()
+    return count / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rounds", type=int, default=2000)
+    parser.add_argument("--sticks", type=int, default=20000)
+    args = parser.parse_args()
+
+    gui = NoTouchPadWebGUI(port=0)
+    server = create_server(gui, 0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    port = server.server_address[1]
+
+    cases = [
+        ("WebSocket PING (transporte)", lambda: bench_websocket(port, args.rounds, lambda i: encode_ping(i))),
+        ("WebSocket GESTURE", lambda: bench_websocket(port, args.rounds, lambda i: encode_gesture(i % 5, i))),
+        ("POST keep-alive", lambda: bench_post(port, args.rounds, keep_alive=True)),
+        ("POST conexão nova", lambda: bench_post(port, args.rounds, keep_alive=False)),
+    ]
+    print(f"🎮 Round-trip de gesto, {args.rounds} mensagens por caso")
+    print(f"  {'canal':<28} {'p50':>8} {'p99':>8}")
+    for name, run in cases:
+        p50, p99 = percentiles(run())
+        print(f"  {name:<28} {p50:>6.3f}ms {p99:>6.3f}ms")
+
+    rate = bench_stick_throughput(port, args.sticks)
+    print(f"\n🕹️ Analógico: {rate:,.0f} eventos/s ({STICK.size} bytes por evento)")
+    print(f"  resets pendentes no agendador: {gui.scheduler.pending}, threads ativas: {threading.active_count()}")
+
+    gui.close()
+    server.shutdown()
+    server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+NoTouchPad Benchmark - Carga de espectadores da Web GUI
+Sobe o servidor da Web GUI em processo, conecta N espectadores SSE (/api/events) e envia
+gestos por POST em uma conexão keep-alive; mede a latência do POST e o tempo até cada
+espectador receber o evento, para N crescente
+
+Exemplo:
+    python benchmarks/bench_web_viewers.py --viewers 1 100 300 500 --rounds 40
+
+Author: Renato Castellani
+Version: 1.0.0
+"""
+
+import argparse
+import http.client
+import selectors
+import socket
+import sys
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).resolve().parent.parent / "src"))
+
+from main_web_gui import NoTouchPadWebGUI, create_server  # noqa: E402
+
+LOG_EVENT = b"event: log\n"
+
+
+class ViewerPool:
+    """N conexões SSE lidas por uma única thread; anota quando cada uma recebe cada evento de log."""
+
+    def __init__(self, port: int, count: int) -> None:
+        self.selector = selectors.DefaultSelector()
+        self.lock = threading.Lock()
+        self.seen = [0] * count
+        self.arrivals = {}
+        self.snapshots = 0
+        self.sockets = []
+        for idx in range(count):
+            sock = socket.create_connection(("127.0.0.1", port))
+            sock.sendall(b"GET /api/events HTTP/1.1\r\nHost: bench\r\n\r\n")
+            sock.setblocking(False)
+            self.selector.register(sock, selectors.EVENT_READ, [idx, b""])
+            self.sockets.append(sock)
+        self.running = True
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def _run(self) -> None:
+        while self.running:
+            for key, _ in self.selector.select(0.1):
+                try:
+                    data = key.fileobj.recv(65536)
+                except BlockingIOError:
+                    continue
+                if not data:
+                    self.selector.unregister(key.fileobj)
+                    continue
+                now = time.perf_counter()
+                idx, tail = key.data
+                chunk = tail + data
+                key.data[1] = chunk[-len(LOG_EVENT):]
+                with self.lock:
+                    self.snapshots += chunk.count(b"event: snapshot\n")
+                    for _ in range(chunk.count(LOG_EVENT)):
+                        self.seen[idx] += 1
+                        self.arrivals.setdefault(self.seen[idx], []).append(now)
+
+    def wait(self, predicate, timeout: float = 10.0) -> bool:
+        deadline = time.perf_counter() + timeout
+        while time.perf_counter() < deadline:
+            with self.lock:
+                if predicate():
+                    return True
+            time.sleep(0.0005)
+        return False
+
+    def close(self) -> None:
+        self.running = False
+        self.thread.join()
+        for sock in self.sockets:
+            sock.close()
+
+
+def run(viewers: int, rounds: int, workers: int):
+    gui = NoTouchPadWebGUI(port=0, heartbeat_interval=60.0)
+    server = create_server(gui, 0, max_workers=workers)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    port = server.server_address[1]
+
+    control = http.client.HTTPConnection("127.0.0.1", port)
+    control.request("POST", "/api/start_manual")
+    control.getresponse().read()
+
+    pool = ViewerPool(port, viewers)
+    connected = pool.wait(lambda: pool.snapshots >= viewers)
+
+    post_ms, delivery_ms, last_ms = [], [], []
+    for round_idx in range(1, rounds + 1):
+        started = time.perf_counter()
+        control.request("POST", "/api/gesture", body=b'{"gesture":"punch"}',
+                        headers={"Content-Type": "application/json"})
+        control.getresponse().read()
+        post_ms.append((time.perf_counter() - started) * 1000)
+        pool.wait(lambda: len(pool.arrivals.get(round_idx, ())) >= viewers)
+        with pool.lock:
+            arrivals = np.array(pool.arrivals.get(round_idx, [])) - started
+        delivery_ms.extend(arrivals * 1000)
+        last_ms.append(arrivals.max() * 1000 if len(arrivals) else float("nan"))
+        time.sleep(0.01)
+
+    threads = sum(thread.name.startswith("WebGUIWorker") for thread in threading.enumerate())
+    pool.close()
+    control.close()
+    gui.close()
+    server.shutdown()
+    server.server_close()
+    return connected, np.array(post_ms), np.array(delivery_ms), np.array(last_ms), threads
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--viewers", type=int, nargs="+", default=[1, 50, 200, 500])
+    parser.add_argument("--rounds", type=int, default=40)
+    parser.add_argument("--workers", type=int, default=32, help="tamanho do pool de workers HTTP")
+    args = parser.parse_args()
+
+    print(f"🌐 Web GUI: {args.rounds} gestos por POST keep-alive, pool de {args.workers} workers")
+    print(f"  {'espectadores':>12} {'POST p50':>9} {'POST p99':>9} {'entrega p50':>12} {'p99':>8} "
+          f"{'último p99':>11} {'workers':>8}")
+    for viewers in args.viewers:
+        connected, post_ms, delivery_ms, last_ms, threads = run(viewers, args.rounds, args.workers)
+        if not connected:
+            print(f"  {viewers:>12} ⚠️ nem todos os espectadores receberam o snapshot")
+            continue
+        print(
+            f"  {viewers:>12} {np.percentile(post_ms, 50):>7.2f}ms {np.percentile(post_ms, 99):>7.2f}ms "
+            f"{np.percentile(delivery_ms, 50):>10.2f}ms {np.percentile(delivery_ms, 99):>6.2f}ms "
+            f"{np.nanpercentile(last_ms, 99):>9.2f}ms {threads:>8}"
+        )
+
+
+if __name__ == "__main__":
+    main()
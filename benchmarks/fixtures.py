@@ -0,0 +1,174 @@
+"""
+NoTouchPad Benchmark - Fixtures
+Entradas reprodutíveis para os benchmarks: frames sintéticos, um VideoCapture falso que
+os entrega sem câmera e landmarks de mãos (poses sintéticas ou uma gravação real do
+landmark_recording) no formato de resultado do MediaPipe
+
+Author: Renato Castellani
+Version: 1.0.0
+"""
+
+import sys
+import types
+from pathlib import Path
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+import cv2
+import numpy as np
+
+sys.path.append(str(Path(__file__).resolve().parent.parent / "src"))
+
+from hand_landmarks import NUM_LANDMARKS  # noqa: E402
+
+# Dedos na ordem de finger_states: polegar, indicador, médio, anelar, mínimo.
+GESTURE_POSES = {
+    "fist": (),
+    "open_hand": (0, 1, 2, 3, 4),
+    "pointing": (1,),
+    "thumbs_up": (0,),
+    "peace": (1, 2),
+}
+
+
+def synthetic_frames(count: int, size: Tuple[int, int] = (1280, 720), seed: int = 0) -> List[np.ndarray]:
+    """Frames BGR com fundo fixo, uma "mão" que se desloca e ruído de sensor."""
+
+    width, height = size
+    rng = np.random.default_rng(seed)
+    background = np.zeros((height, width, 3), dtype=np.uint8)
+    cv2.rectangle(background, (0, int(height * 0.7)), (width, height), (50, 70, 90), -1)
+    frames = []
+    for idx in range(count):
+        frame = background.copy()
+        center = (int(width * (0.3 + 0.4 * idx / max(1, count - 1))), height // 2)
+        cv2.ellipse(frame, center, (width // 20, height // 10), 0, 0, 360, (120, 140, 180), -1)
+        noise = rng.integers(-3, 4, frame.shape, dtype=np.int16)
+        frames.append(np.clip(frame + noise, 0, 255).astype(np.uint8))
+    return frames
+
+
+class FakeVideoCapture:
+    """Substituto do cv2.VideoCapture: entrega os frames em ciclo, sem esperar pelo "sensor"."""
+
+    def __init__(self, frames: Sequence[np.ndarray], fps: float = 30.0) -> None:
+        self.frames = list(frames)
+        self.fps = fps
+        self.position = 0
+        self._opened = True
+
+    def isOpened(self) -> bool:  # noqa: N802 - mesmo nome do cv2.VideoCapture
+        return self._opened
+
+    def read(self, image: Optional[np.ndarray] = None):
+        if not self._opened:
+            return False, None
+        frame = self.frames[self.position % len(self.frames)]
+        self.position += 1
+        if image is not None and image.shape == frame.shape:
+            np.copyto(image, frame)
+            return True, image
+        return True, frame.copy()
+
+    def grab(self) -> bool:
+        self.position += 1
+        return self._opened
+
+    def set(self, prop: int, value: float) -> bool:
+        return False
+
+    def get(self, prop: int) -> float:
+        if prop == cv2.CAP_PROP_FPS:
+            return self.fps
+        if prop == cv2.CAP_PROP_FRAME_WIDTH:
+            return float(self.frames[0].shape[1])
+        if prop == cv2.CAP_PROP_FRAME_HEIGHT:
+            return float(self.frames[0].shape[0])
+        return 0.0
+
+    def release(self) -> None:
+        self._opened = False
+
+
+def hand_pose(extended: Iterable[int], handedness: int = 1) -> np.ndarray:
+    """Landmarks (21, 3) de uma mão vertical com os dedos `extended` esticados.
+
+    `handedness` 1 = direita (polegar para x menor), -1 = esquerda (espelhada).
+    """
+
+    extended = set(extended)
+    pose = np.zeros((NUM_LANDMARKS, 3), dtype=np.float32)
+    pose[0] = (0.5, 0.8, 0.0)  # punho
+    thumb_tip_x = 0.33 if 0 in extended else 0.42
+    pose[1:5, 0] = (0.45, 0.40, (0.40 + thumb_tip_x) / 2, thumb_tip_x)  # CMC, MCP, IP, ponta
+    pose[1:5, 1] = (0.72, 0.66, 0.62, 0.58)
+    for finger in range(1, 5):
+        first = 1 + 4 * finger
+        x = 0.44 + 0.04 * finger
+        tip_y = 0.40 if finger in extended else 0.55
+        pose[first:first + 4, 0] = x
+        pose[first:first + 4, 1] = (0.60, 0.50, (0.50 + tip_y) / 2, tip_y)
+    if handedness < 0:
+        pose[:, 0] = 1.0 - pose[:, 0]
+    return pose
+
+
+def synthetic_landmarks(count: int, noise: float = 0.004, seed: int = 0) -> Tuple[np.ndarray, np.ndarray, List[str]]:
+    """`count` mãos (N, 21, 3) alternando gestos e lateralidade, com ruído gaussiano."""
+
+    rng = np.random.default_rng(seed)
+    gestures = list(GESTURE_POSES)
+    landmarks = np.empty((count, NUM_LANDMARKS, 3), dtype=np.float32)
+    handedness = np.empty(count, dtype=np.int8)
+    labels = []
+    for idx in range(count):
+        gesture = gestures[(idx // 30) % len(gestures)]
+        side = 1 if (idx // 150) % 2 == 0 else -1
+        landmarks[idx] = hand_pose(GESTURE_POSES[gesture], side)
+        handedness[idx] = side
+        labels.append(gesture)
+    landmarks += rng.normal(0.0, noise, landmarks.shape).astype(np.float32)
+    return landmarks, handedness, labels
+
+
+def load_landmark_fixture(path: Optional[Path], count: int = 3000) -> Tuple[np.ndarray, np.ndarray]:
+    """Landmarks e lateralidade de uma gravação (landmark_recording) ou das poses sintéticas."""
+
+    if path is None:
+        landmarks, handedness, _ = synthetic_landmarks(count)
+        return landmarks, handedness
+    from landmark_recording import load_landmark_recording
+
+    records = load_landmark_recording(path)
+    return np.array(records["landmarks"]), np.array(records["handedness"])
+
+
+def mediapipe_result(landmarks: np.ndarray, handedness: int):
+    """Monta um objeto com a forma do resultado de `Hands.process` para uma mão."""
+
+    points = [types.SimpleNamespace(x=float(x), y=float(y), z=float(z)) for x, y, z in landmarks]
+    label = {1: "Right", -1: "Left"}.get(int(handedness), "Unknown")
+    classification = types.SimpleNamespace(label=label, score=0.98)
+    return types.SimpleNamespace(
+        multi_hand_landmarks=[types.SimpleNamespace(landmark=points)],
+        multi_handedness=[types.SimpleNamespace(classification=[classification])],
+    )
+
+
+class RecordedHands:
+    """Modelo de mãos que devolve landmarks gravados em ciclo, no lugar do grafo do MediaPipe.
+
+    Isola o custo do pós-processamento do GestureRecognizer (recorte, conversão dos
+    landmarks, classificação) do custo do modelo.
+    """
+
+    def __init__(self, landmarks: np.ndarray, handedness: np.ndarray) -> None:
+        self._results = [mediapipe_result(lm, side) for lm, side in zip(landmarks, handedness)]
+        self._index = 0
+
+    def process(self, image: np.ndarray):
+        result = self._results[self._index % len(self._results)]
+        self._index += 1
+        return result
+
+    def close(self) -> None:
+        pass
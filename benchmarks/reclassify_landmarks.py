@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+NoTouchPad - Reclassificação offline de landmarks
+Reaplica o classificador de gestos sobre uma gravação de landmarks (landmark_recording)
+sem rodar o MediaPipe: compara limiares com o gesto gravado ao vivo e mede a vazão
+
+Exemplos:
+    python benchmarks/reclassify_landmarks.py sessao_landmarks.npy --threshold 0.02 0.03 0.04
+    python benchmarks/reclassify_landmarks.py --synthetic 2000000 /tmp/sintetico.npy
+
+Author: Renato Castellani
+Version: 1.0.0
+"""
+
+import argparse
+import sys
+import time
+from functools import partial
+from pathlib import Path
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).resolve().parent.parent / "src"))
+
+from hand_landmarks import GESTURES_BY_CODE, NUM_LANDMARKS, classify_gestures  # noqa: E402
+from landmark_recording import (  # noqa: E402
+    LandmarkRecorder,
+    confusion_matrix,
+    gesture_counts,
+    load_landmark_recording,
+    reclassify,
+)
+
+
+def write_synthetic(path: Path, rows: int, seed: int = 0) -> None:
+    """Gravação sintética: mãos de referência com ruído; cada lote de 4096 mãos conta como um frame."""
+
+    rng = np.random.default_rng(seed)
+    base = rng.uniform(0.3, 0.7, (NUM_LANDMARKS, 3)).astype(np.float32)
+    batch = 4096
+    with LandmarkRecorder(path, chunk_size=batch) as recorder:
+        for start in range(0, rows, batch):
+            count = min(batch, rows - start)
+            landmarks = base + rng.normal(0.0, 0.05, (count, NUM_LANDMARKS, 3)).astype(np.float32)
+            handedness = rng.choice(np.array([-1, 1], dtype=np.int8), count)
+            codes = classify_gestures(landmarks, handedness)
+            recorder.write(start / 30.0, start, landmarks, handedness, np.ones(count, np.float32), codes)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Reclassificação offline de landmarks gravados")
+    parser.add_argument("recording", type=Path)
+    parser.add_argument("--threshold", type=float, nargs="+", default=[0.02], help="limiares de dedo estendido")
+    parser.add_argument("--synthetic", type=int, metavar="N", help="gera antes uma gravação sintética com N mãos")
+    args = parser.parse_args()
+
+    if args.synthetic:
+        started = time.perf_counter()
+        write_synthetic(args.recording, args.synthetic)
+        print(f"📝 {args.synthetic} registros sintéticos gravados em {time.perf_counter() - started:.2f}s")
+
+    records = load_landmark_recording(args.recording)
+    live = np.asarray(records["gesture"])
+    size_mb = args.recording.stat().st_size / 1e6
+    print(f"🖐️ {args.recording}: {len(records)} mãos em {len(np.unique(records['frame']))} frames ({size_mb:.0f} MB)")
+    print(f"  ao vivo: {gesture_counts(live)}")
+
+    for threshold in args.threshold:
+        started = time.perf_counter()
+        codes = reclassify(records, partial(classify_gestures, threshold=threshold))
+        elapsed = time.perf_counter() - started
+        agreement = float(np.mean(codes == live)) if len(live) else 0.0
+        print(f"\n  limiar {threshold:.3f}: {len(records) / max(elapsed, 1e-9) / 1e6:.1f} M mãos/s, "
+              f"concordância com o ao vivo {agreement:.1%}")
+        print(f"    gestos: {gesture_counts(codes)}")
+        matrix = confusion_matrix(live, codes)
+        changed = [
+            (matrix[a, b], GESTURES_BY_CODE[a].value, GESTURES_BY_CODE[b].value)
+            for a in range(len(matrix))
+            for b in range(len(matrix))
+            if a != b and matrix[a, b]
+        ]
+        for count, before, after in sorted(changed, reverse=True)[:5]:
+            print(f"    {before} → {after}: {count}")
+
+
+if __name__ == "__main__":
+    main()
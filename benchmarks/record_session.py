@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+NoTouchPad - Gravador de sessões
+Grava a webcam (frames como saem da câmera, com instantes e rótulo do gesto) para replay
+determinístico em bench_replay.py, sem precisar de câmera na máquina do benchmark
+
+Exemplos:
+    python benchmarks/record_session.py sessoes/punho.npy --seconds 10 --label fist
+    python benchmarks/record_session.py sessoes/mista.mp4 --seconds 20
+
+Author: Renato Castellani
+Version: 1.0.0
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent / "src"))
+
+from camera_detector import CameraDetector  # noqa: E402
+from frame_sources import SessionRecorder  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Grava uma sessão da webcam para replay")
+    parser.add_argument("output", type=Path, help=".npy (sem perdas), .mp4/.avi ou diretório de PNGs")
+    parser.add_argument("--camera", type=int, default=0)
+    parser.add_argument("--size", default="640x480")
+    parser.add_argument("--fps", type=int, default=30)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--label", help="gesto esperado na sessão inteira (ex.: fist, open_hand)")
+    args = parser.parse_args()
+
+    width, height = (int(v) for v in args.size.split("x"))
+    camera = CameraDetector(args.camera, frame_size=(width, height), fps=args.fps)
+    if not camera.initialize_camera() or not camera.start_background_capture():
+        sys.exit(f"❌ Não foi possível abrir a câmera {args.camera}")
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    recorder = SessionRecorder(args.output, fps=args.fps, color_format=camera.output_format, label=args.label)
+    sequence = 0
+    deadline = time.perf_counter() + args.seconds
+    print(f"🔴 Gravando {args.seconds:.0f}s de {width}x{height} em {args.output}...")
+    try:
+        while time.perf_counter() < deadline:
+            lease = camera.lease_newer_frame(sequence, timeout=0.5)
+            if lease is None:
+                if not camera.is_active:
+                    break
+                continue
+            with lease:
+                sequence = lease.frame.sequence
+                recorder.write(lease.image, lease.frame.timestamp)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        recorder.close()
+        camera.release_camera()
+
+    print(f"✅ {recorder.frames_written} frames gravados (perdidos na captura: {camera.ring_overruns})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,351 @@
+#!/usr/bin/env python3
+"""
+NoTouchPad Benchmark - Suíte do pipeline
+Mede latência (p50/p95) e vazão de cada estágio — captura, conversão de cor, detecção,
+classificação, suavização, gamepad e preview — com entradas reprodutíveis (frames
+sintéticos, VideoCapture falso, landmarks sintéticos ou gravados) e compara com uma
+linha de base JSON, falhando quando um estágio regride além do limiar
+
+Exemplos:
+    python benchmarks/run_benchmarks.py --save-baseline          # grava a linha de base desta máquina
+    python benchmarks/run_benchmarks.py                          # compara; sai com 1 se houver regressão
+    python benchmarks/run_benchmarks.py --filter classifier --threshold 0.1
+    python benchmarks/run_benchmarks.py --landmarks sessao_landmarks.npy --json resultado.json
+
+Estágios que dependem de MediaPipe ou PySide6 são pulados (e informados) quando a
+dependência não está instalada. Linhas de base valem para a máquina que as gerou.
+
+Author: Renato Castellani
+Version: 1.0.0
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).resolve().parent.parent / "src"))
+
+from fixtures import FakeVideoCapture, RecordedHands, load_landmark_fixture, synthetic_frames  # noqa: E402
+
+from camera_detector import CameraDetector  # noqa: E402
+from frame_types import ColorFormat, convert_color  # noqa: E402
+from gamepad_controller import GamepadController  # noqa: E402
+from gesture_smoothing import GestureSmoother  # noqa: E402
+from hand_landmarks import GESTURES_BY_CODE, HandPosition, classify_gestures, hand_centroids  # noqa: E402
+from motion_gate import MotionGate  # noqa: E402
+from virtual_gamepad import RecordingUInputWriter, UInputGamepad  # noqa: E402
+
+BASELINE_DIR = Path(__file__).resolve().parent / "baselines"
+DEFAULT_THRESHOLD = 0.25
+
+
+class Skip(Exception):
+    """Dependência opcional ausente: o caso é pulado, não reprovado."""
+
+
+@dataclass
+class Inputs:
+    frames: List[np.ndarray]
+    rgb_frames: List[np.ndarray]
+    landmarks: np.ndarray
+    handedness: np.ndarray
+
+
+@dataclass
+class BenchCase:
+    name: str
+    # Recebe as entradas e devolve (operação, itens processados por chamada).
+    setup: Callable[[Inputs], tuple]
+
+
+def _cycle(items):
+    state = {"index": 0}
+
+    def next_item():
+        item = items[state["index"] % len(items)]
+        state["index"] += 1
+        return item
+
+    return next_item
+
+
+def _camera(inputs: Inputs) -> CameraDetector:
+    camera = CameraDetector(capture_factory=lambda: FakeVideoCapture(inputs.frames))
+    camera.initialize_camera()
+    return camera
+
+
+def case_capture_frame(inputs: Inputs):
+    camera = _camera(inputs)
+    return camera.capture_frame, 1
+
+
+def case_lease_frame(inputs: Inputs):
+    camera = _camera(inputs)
+
+    def op():
+        camera.lease_frame().release()
+
+    return op, 1
+
+
+def case_color_conversion(inputs: Inputs):
+    next_frame = _cycle(inputs.frames)
+    dst = np.empty_like(inputs.frames[0])
+    return (lambda: convert_color(next_frame(), ColorFormat.BGR, ColorFormat.RGB, dst=dst)), 1
+
+
+def _recognizer():
+    try:
+        from gesture_recognizer import GestureRecognizer
+    except ImportError as exc:
+        raise Skip(f"MediaPipe indisponível ({exc})") from exc
+    return GestureRecognizer
+
+
+def case_detect_hands(inputs: Inputs):
+    recognizer = _recognizer()()
+    next_frame = _cycle(inputs.rgb_frames)
+    return (lambda: recognizer.detect_hands(next_frame())), 1
+
+
+def case_detect_hands_postprocess(inputs: Inputs):
+    recognizer = _recognizer()(roi_tracking=True)
+    # Modelo trocado por landmarks gravados: mede só o que o NoTouchPad faz em volta do MediaPipe.
+    recognizer._hands.close()
+    recognizer._hands = RecordedHands(inputs.landmarks[:300], inputs.handedness[:300])
+    next_frame = _cycle(inputs.rgb_frames)
+    return (lambda: recognizer.detect_hands(next_frame())), 1
+
+
+def case_recognize_gesture(inputs: Inputs):
+    recognize = _recognizer()._recognize_gesture
+    labels = {1: "Right", -1: "Left", 0: "Unknown"}
+    hands = [(lm, labels[int(side)]) for lm, side in zip(inputs.landmarks, inputs.handedness)]
+    next_hand = _cycle(hands)
+
+    def op():
+        landmarks, label = next_hand()
+        return recognize(landmarks, label)
+
+    return op, 1
+
+
+def case_classify_batch(inputs: Inputs):
+    return (lambda: classify_gestures(inputs.landmarks, inputs.handedness)), len(inputs.landmarks)
+
+
+def _hand_positions(inputs: Inputs, count: int = 300) -> List[HandPosition]:
+    codes = classify_gestures(inputs.landmarks[:count], inputs.handedness[:count])
+    centroids = hand_centroids(inputs.landmarks[:count])
+    labels = {1: "Right", -1: "Left", 0: "Unknown"}
+    return [
+        HandPosition(
+            x=float(centroids[idx, 0]),
+            y=float(centroids[idx, 1]),
+            gesture=GESTURES_BY_CODE[codes[idx]],
+            score=0.98,
+            handedness=labels[int(inputs.handedness[idx])],
+            landmarks=inputs.landmarks[idx],
+        )
+        for idx in range(len(codes))
+    ]
+
+
+def case_smoother(inputs: Inputs):
+    smoother = GestureSmoother()
+    next_hand = _cycle(_hand_positions(inputs))
+    clock = {"now": 0.0}
+
+    def op():
+        clock["now"] += 1 / 30
+        return smoother.update([next_hand()], clock["now"])
+
+    return op, 1
+
+
+def case_gamepad(inputs: Inputs):
+    writer = RecordingUInputWriter()
+    controller = GamepadController(UInputGamepad(writer))
+    next_hand = _cycle(_hand_positions(inputs))
+    clock = {"now": 0.0, "frames": 0}
+
+    def op():
+        clock["now"] += 1 / 30
+        clock["frames"] += 1
+        if clock["frames"] % 1000 == 0:
+            writer.clear()
+        controller.process_gestures([next_hand()], clock["now"])
+
+    return op, 1
+
+
+def case_motion_gate(inputs: Inputs):
+    gate = MotionGate()
+    next_frame = _cycle(inputs.rgb_frames)
+    clock = {"now": 0.0}
+
+    def op():
+        clock["now"] += 1 / 30
+        return gate.should_infer(next_frame(), clock["now"])
+
+    return op, 1
+
+
+def case_preview(inputs: Inputs):
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    try:
+        from PySide6.QtWidgets import QApplication
+
+        from desktop_app import frame_to_pixmap
+    except ImportError as exc:
+        raise Skip(f"PySide6 indisponível ({exc})") from exc
+    case_preview.app = QApplication.instance() or QApplication([])  # type: ignore[attr-defined]
+    next_frame = _cycle(inputs.rgb_frames)
+    return (lambda: frame_to_pixmap(next_frame(), 640, 360)), 1
+
+
+CASES = [
+    BenchCase("camera.capture_frame", case_capture_frame),
+    BenchCase("camera.lease_frame", case_lease_frame),
+    BenchCase("color.bgr_to_rgb", case_color_conversion),
+    BenchCase("recognizer.detect_hands", case_detect_hands),
+    BenchCase("recognizer.postprocess", case_detect_hands_postprocess),
+    BenchCase("recognizer.recognize_gesture", case_recognize_gesture),
+    BenchCase("classifier.batch", case_classify_batch),
+    BenchCase("smoother.update", case_smoother),
+    BenchCase("gamepad.process_gestures", case_gamepad),
+    BenchCase("motion_gate.should_infer", case_motion_gate),
+    BenchCase("ui.preview_pixmap", case_preview),
+]
+
+
+def measure(op: Callable[[], object], items: int, min_time: float, min_samples: int = 20) -> Dict[str, float]:
+    """Cronometra chamadas individuais até `min_time` segundos (após aquecimento)."""
+
+    warmup_deadline = time.perf_counter() + min(0.2, min_time / 4)
+    while time.perf_counter() < warmup_deadline:
+        op()
+
+    samples = []
+    deadline = time.perf_counter() + min_time
+    while len(samples) < min_samples or time.perf_counter() < deadline:
+        started = time.perf_counter_ns()
+        op()
+        samples.append(time.perf_counter_ns() - started)
+
+    micros = np.asarray(samples, dtype=np.float64) / 1000.0
+    p50, p95 = np.percentile(micros, [50, 95])
+    mean = float(micros.mean())
+    return {
+        "p50_us": float(p50),
+        "p95_us": float(p95),
+        "mean_us": mean,
+        "items_per_s": items / (mean / 1e6) if mean else 0.0,
+        "samples": len(samples),
+    }
+
+
+def compare(name: str, current: Dict, baseline: Dict, threshold: float) -> Optional[str]:
+    """Anota a variação do p50 e descreve a regressão se passou do limiar (global ou do caso)."""
+
+    reference = baseline.get("cases", {}).get(name)
+    if reference is None or not reference["p50_us"]:
+        return None
+    limit = baseline.get("thresholds", {}).get(name, threshold)
+    change = current["p50_us"] / reference["p50_us"] - 1.0
+    current["baseline_p50_us"] = reference["p50_us"]
+    current["change"] = change
+    if change <= limit:
+        return None
+    return f"{name}: p50 {reference['p50_us']:.1f} → {current['p50_us']:.1f} µs ({change:+.0%}, limite {limit:.0%})"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Suíte de benchmarks do pipeline NoTouchPad")
+    parser.add_argument("--filter", default="", help="roda só casos cujo nome contém o texto")
+    parser.add_argument("--min-time", type=float, default=1.0, help="segundos de medição por caso")
+    parser.add_argument("--size", default="1280x720", help="resolução dos frames sintéticos")
+    parser.add_argument("--landmarks", type=Path, help="gravação de landmarks (landmark_recording) como fixture")
+    parser.add_argument("--baseline", type=Path, help=f"padrão: {BASELINE_DIR.name}/<máquina>.json")
+    parser.add_argument("--save-baseline", action="store_true", help="grava os resultados como nova linha de base")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="regressão tolerada no p50 (0.25 = 25%%)")
+    parser.add_argument("--json", type=Path, help="grava os resultados desta execução")
+    args = parser.parse_args()
+
+    width, height = (int(v) for v in args.size.split("x"))
+    frames = synthetic_frames(8, (width, height))
+    landmarks, handedness = load_landmark_fixture(args.landmarks)
+    inputs = Inputs(
+        frames=frames,
+        rgb_frames=[convert_color(frame, ColorFormat.BGR, ColorFormat.RGB) for frame in frames],
+        landmarks=landmarks,
+        handedness=handedness,
+    )
+    baseline_path = args.baseline or BASELINE_DIR / f"{platform.node() or 'local'}.json"
+    baseline: Optional[Dict] = None
+    if baseline_path.exists() and not args.save_baseline:
+        baseline = json.loads(baseline_path.read_text(encoding="utf-8"))
+
+    print(f"🏁 NoTouchPad benchmarks ({width}x{height}, {len(landmarks)} mãos de fixture)")
+    print(f"  {'caso':<30} {'p50 µs':>10} {'p95 µs':>10} {'itens/s':>12} {'vs base':>9}")
+    results: Dict[str, Dict] = {}
+    skipped: Dict[str, str] = {}
+    regressions: List[str] = []
+    for case in CASES:
+        if args.filter not in case.name:
+            continue
+        try:
+            op, items = case.setup(inputs)
+        except Skip as reason:
+            skipped[case.name] = str(reason)
+            print(f"  {case.name:<30} {'pulado':>10}  {reason}")
+            continue
+        result = results[case.name] = measure(op, items, args.min_time)
+        regression = compare(case.name, result, baseline, args.threshold) if baseline else None
+        if regression:
+            regressions.append(regression)
+        change = f"{result['change']:+.0%}" if "change" in result else "--"
+        flag = " ❌" if regression else ""
+        print(f"  {case.name:<30} {result['p50_us']:>10.1f} {result['p95_us']:>10.1f} {result['items_per_s']:>12.0f} {change:>9}{flag}")
+
+    report = {
+        "machine": platform.node(),
+        "platform": platform.platform(),
+        "python": platform.python_version(),
+        "frame_size": [width, height],
+        "created_at": time.time(),
+        "cases": results,
+        "skipped": skipped,
+    }
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    if args.save_baseline:
+        if baseline_path.exists():
+            # Mantém os limiares ajustados à mão para casos ruidosos.
+            report["thresholds"] = json.loads(baseline_path.read_text(encoding="utf-8")).get("thresholds", {})
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        baseline_path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"\n💾 Linha de base gravada em {baseline_path}")
+    elif baseline is None:
+        print(f"\nℹ️ Sem linha de base em {baseline_path}; rode com --save-baseline para criá-la.")
+
+    if regressions:
+        print("\n❌ Regressões:")
+        for line in regressions:
+            print(f"  {line}")
+        sys.exit(1)
+    if baseline is not None:
+        print(f"\n✅ Nenhum estágio regrediu mais que o limiar ({baseline_path})")
+
+
+if __name__ == "__main__":
+    main()
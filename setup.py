@@ -45,10 +45,15 @@ setup(
         "pygame>=2.5.0",
         "pynput>=1.7.6",
         "PySide6>=6.6.0",
+        'evdev>=1.6.0; sys_platform == "linux"',  # gamepad virtual via /dev/uinput
         "Pillow>=10.0.0",
         "requests>=2.31.0",
     ],
     extras_require={
+        # Assets da Web GUI pré-comprimidos em brotli (sem ele, só gzip)
+        "web": [
+            "brotli>=1.1.0",
+        ],
         "dev": [
             "pyinstaller>=6.0.0",
             "pytest>=7.4.0",
@@ -64,6 +69,6 @@ setup(
     },
     include_package_data=True,
     package_data={
-        "src": ["assets/*"],
+        "src": ["assets/*", "web/*"],
     },
 )
@@ -8,100 +8,532 @@ Version: 1.0.0
 
 from __future__ import annotations
 
+import sys
+import threading
 import time
-from typing import List, Optional, Tuple
+from typing import Any, Callable, List, Optional, Tuple
 
 import cv2
 import numpy as np
 
+from camera_discovery import scan_available_cameras  # noqa: F401 - reexportado
+from frame_bus import FrameBus, FrameBusReader
+from frame_types import CapturedFrame, ColorFormat, convert_color, converted_shape
+from instrumentation import PipelineMetrics, Rate, Stage
+
+
+class FrameRing:
+    """Anel fixo de buffers pré-alocados (BGR bruto + saída convertida) com contagem de empréstimos.
+
+    Uma posição com empréstimos ativos, ou a última publicada, nunca é sobrescrita.
+    Quando o formato de saída é BGR não há buffers de conversão: a saída é o próprio buffer bruto.
+    """
+
+    def __init__(
+        self,
+        frame_shape: Tuple[int, ...],
+        size: int = 4,
+        output_format: ColorFormat = ColorFormat.RGB,
+    ) -> None:
+        if size < 2:
+            raise ValueError("FrameRing precisa de pelo menos 2 posições")
+
+        self.frame_shape = tuple(frame_shape)
+        self.size = size
+        self.output_format = output_format
+        self.raw_buffers = [np.empty(self.frame_shape, dtype=np.uint8) for _ in range(size)]
+        if output_format is ColorFormat.BGR:
+            self.output_buffers = self.raw_buffers
+        else:
+            out_shape = converted_shape(self.frame_shape, output_format)
+            self.output_buffers = [np.empty(out_shape, dtype=np.uint8) for _ in range(size)]
+        self.lock = threading.Lock()
+        self._leases = [0] * size
+        self._published = -1
+        self._cursor = 0
+
+    @property
+    def nbytes(self) -> int:
+        buffers = {id(buf): buf for buf in self.raw_buffers + self.output_buffers}
+        return sum(buf.nbytes for buf in buffers.values())
+
+    def acquire_write_slot(self) -> Optional[int]:
+        """Reserva uma posição livre para escrita ou retorna None se todas estiverem ocupadas."""
+
+        with self.lock:
+            for offset in range(self.size):
+                slot = (self._cursor + offset) % self.size
+                if self._leases[slot] == 0 and slot != self._published:
+                    self._cursor = (slot + 1) % self.size
+                    self._leases[slot] = 1
+                    return slot
+            return None
+
+    def mark_published(self, slot: int, keep_lease: bool = False) -> None:
+        """Encerra a reserva de escrita e marca a posição como a mais recente.
+
+        Deve ser chamado com `lock` adquirido. Com `keep_lease` a reserva vira um empréstimo.
+        """
+
+        if not keep_lease:
+            self._leases[slot] -= 1
+        self._published = slot
+
+    def lease_locked(self, slot: int) -> None:
+        """Incrementa os empréstimos da posição; deve ser chamado com `lock` adquirido."""
+
+        self._leases[slot] += 1
+
+    def release(self, slot: int) -> None:
+        with self.lock:
+            if self._leases[slot] > 0:
+                self._leases[slot] -= 1
+
+    def owns(self, frame: CapturedFrame) -> bool:
+        return 0 <= frame.slot < self.size and frame.image is self.output_buffers[frame.slot]
+
+
+class FrameLease:
+    """Empréstimo de um frame do anel; devolva com release() ou use como context manager."""
+
+    def __init__(self, frame: CapturedFrame, ring: FrameRing) -> None:
+        self.frame = frame
+        self._ring = ring
+        self._released = False
+
+    @property
+    def image(self) -> np.ndarray:
+        return self.frame.image
+
+    def release(self) -> None:
+        if self._released:
+            return
+        self._released = True
+        self._ring.release(self.frame.slot)
+
+    def __enter__(self) -> "FrameLease":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.release()
+
+    def __del__(self) -> None:  # pragma: no cover - segurança extra
+        try:
+            self.release()
+        except Exception:
+            pass
+
+
+class LatestFrameSlot:
+    """Slot de posição única: guarda apenas o frame mais recente e descarta os antigos."""
+
+    def __init__(self) -> None:
+        self._condition = threading.Condition()
+        self._frame: Optional[CapturedFrame] = None
+        self._consumed = True
+        self.dropped_frames = 0
+
+    def publish(self, frame: CapturedFrame) -> None:
+        with self._condition:
+            if not self._consumed:
+                self.dropped_frames += 1
+            self._frame = frame
+            self._consumed = False
+            self._condition.notify_all()
+
+    def latest(self) -> Optional[CapturedFrame]:
+        """Retorna o frame mais recente sem bloquear (pode repetir o último entregue)."""
+
+        with self._condition:
+            self._consumed = True
+            return self._frame
+
+    def wait_for_newer(self, sequence: int, timeout: Optional[float] = None) -> Optional[CapturedFrame]:
+        """Bloqueia até existir um frame com sequência maior que `sequence` ou estourar o timeout."""
+
+        with self._condition:
+            self._condition.wait_for(
+                lambda: self._frame is not None and self._frame.sequence > sequence,
+                timeout=timeout,
+            )
+            if self._frame is None or self._frame.sequence <= sequence:
+                return None
+            self._consumed = True
+            return self._frame
+
+    def clear(self) -> None:
+        with self._condition:
+            self._frame = None
+            self._consumed = True
+
+
 class CameraDetector:
-    """Encapsula captura de vídeo com OpenCV."""
+    """Encapsula captura de vídeo com OpenCV.
+
+    `capture_factory` troca a webcam por outra fonte com a interface do VideoCapture
+    (ex.: `lambda: frame_sources.open_frame_source("sessao.npy")` para replay).
+    """
 
-    def __init__(self, camera_index: int = 0, frame_size: Tuple[int, int] = (1280, 720)):
+    def __init__(
+        self,
+        camera_index: int = 0,
+        frame_size: Tuple[int, int] = (1280, 720),
+        ring_size: int = 4,
+        output_format: ColorFormat = ColorFormat.RGB,
+        fps: int = 30,
+        capture_factory: Optional[Callable[[], Any]] = None,
+    ):
         self.camera_index = camera_index
+        self.capture_factory = capture_factory
         self.frame_size = frame_size
+        self.fps = fps
+        self.ring_size = ring_size
+        self.output_format = output_format
+        self.frame_ring: Optional[FrameRing] = None
+        self.ring_overruns = 0
         self.capture: Optional[cv2.VideoCapture] = None
         self.is_active = False
         self.last_frame_timestamp: float = 0.0
+        self.frame_slot = LatestFrameSlot()
+        self._sequence = 0
+        self._reader_thread: Optional[threading.Thread] = None
+        self._reader_stop = threading.Event()
+        # Protege a troca de dono do dispositivo entre a leitora e release_camera().
+        self._reader_lock = threading.Lock()
+        self._orphaned_captures: List[cv2.VideoCapture] = []
+        self.frame_bus: Optional[FrameBus] = None
+        self.bus_mismatches = 0
+        self.metrics: Optional[PipelineMetrics] = None
+        # Barramento próprio (share_frames): slots, e todos os criados até serem fechados.
+        self._bus_slots = 0
+        self._owned_buses: List[FrameBus] = []
 
     def initialize_camera(self) -> bool:
         """Inicializa a câmera e aplica configurações básicas."""
 
         self.release_camera()
-        self.capture = cv2.VideoCapture(self.camera_index)
+        if self.capture_factory is not None:
+            self.capture = self.capture_factory()
+        else:
+            self.capture = cv2.VideoCapture(self.camera_index)
 
         if not self.capture.isOpened():  # type: ignore[union-attr]
             self.capture = None
             self.is_active = False
             return False
 
-        width, height = self.frame_size
-        self.capture.set(cv2.CAP_PROP_FRAME_WIDTH, width)
-        self.capture.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
-        self.capture.set(cv2.CAP_PROP_FPS, 30)
+        self._apply_capture_settings()
         self.is_active = True
         return True
 
+    def _apply_capture_settings(self) -> None:
+        width, height = self.frame_size
+        self.capture.set(cv2.CAP_PROP_FRAME_WIDTH, width)  # type: ignore[union-attr]
+        self.capture.set(cv2.CAP_PROP_FRAME_HEIGHT, height)  # type: ignore[union-attr]
+        self.capture.set(cv2.CAP_PROP_FPS, self.fps)  # type: ignore[union-attr]
+
+    def configure(self, frame_size: Optional[Tuple[int, int]] = None, fps: Optional[int] = None) -> bool:
+        """Altera resolução/FPS sem reabrir o dispositivo.
+
+        A thread leitora é pausada enquanto as propriedades mudam (o VideoCapture não é
+        thread-safe); o anel de buffers se realoca sozinho se a resolução real mudar.
+        """
+
+        if frame_size is not None:
+            self.frame_size = frame_size
+        if fps is not None:
+            self.fps = fps
+        if not self.capture or not self.is_active:
+            return False
+
+        was_background = self.is_background_capture
+        if not self.stop_background_capture():
+            return False
+        self._apply_capture_settings()
+        if was_background:
+            return self.start_background_capture()
+        return True
+
     def reinitialize(self, camera_index: int) -> bool:
         """Switch to a different camera index."""
 
+        was_background = self.is_background_capture
         self.camera_index = camera_index
-        return self.initialize_camera()
+        if not self.initialize_camera():
+            return False
+        if was_background:
+            return self.start_background_capture()
+        return True
 
-    def capture_frame(self) -> Optional[np.ndarray]:
-        """Retorna um frame RGB normalizado ou None se indisponível."""
+    @property
+    def is_background_capture(self) -> bool:
+        return self._reader_thread is not None and self._reader_thread.is_alive()
+
+    def start_background_capture(self) -> bool:
+        """Inicia a thread leitora que mantém sempre o frame mais recente no slot."""
 
         if not self.capture or not self.is_active:
+            return False
+        if self.is_background_capture:
+            # Uma leitora que não saiu a tempo em stop_background_capture ainda usa o dispositivo.
+            return not self._reader_stop.is_set()
+
+        self.frame_slot.clear()
+        self._reader_stop.clear()
+        self._reader_thread = threading.Thread(
+            target=self._reader_loop,
+            name=f"CameraReader-{self.camera_index}",
+            daemon=True,
+        )
+        self._reader_thread.start()
+        return True
+
+    def stop_background_capture(self, timeout: float = 1.0) -> bool:
+        """Sinaliza a thread leitora para parar e aguarda seu término.
+
+        Retorna False se ela continua viva após `timeout` (ex.: presa num read()): a
+        referência é mantida e o dispositivo continua sendo dela até a thread sair.
+        """
+
+        thread = self._reader_thread
+        if thread is None:
+            return True
+        self._reader_stop.set()
+        if thread is not threading.current_thread():
+            thread.join(timeout)
+        with self._reader_lock:
+            if thread.is_alive():
+                return False
+            if self._reader_thread is thread:
+                self._reader_thread = None
+        return True
+
+    def get_latest_frame(self) -> Optional[CapturedFrame]:
+        """Retorna o frame mais recente sem bloquear.
+
+        A imagem é um buffer do anel e pode ser reaproveitada; use lease_latest_frame()
+        para mantê-la enquanto estiver em uso.
+        """
+
+        return self.frame_slot.latest()
+
+    def lease_latest_frame(self) -> Optional[FrameLease]:
+        """Empresta o frame mais recente; o buffer não é sobrescrito até release()."""
+
+        ring = self.frame_ring
+        if ring is None:
             return None
 
-        ret, frame = self.capture.read()
-        if not ret:
-            self.is_active = False
+        with ring.lock:
+            frame = self.frame_slot.latest()
+            if frame is None or not ring.owns(frame):
+                return None
+            ring.lease_locked(frame.slot)
+        return FrameLease(frame, ring)
+
+    def lease_newer_frame(self, sequence: int, timeout: Optional[float] = None) -> Optional[FrameLease]:
+        """Espera um frame mais novo que `sequence` e empresta o mais recente disponível."""
+
+        if self.frame_slot.wait_for_newer(sequence, timeout) is None:
             return None
+        return self.lease_latest_frame()
 
-        self.last_frame_timestamp = time.time()
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        return rgb_frame
+    def lease_frame(self) -> Optional[FrameLease]:
+        """Captura (ou, em segundo plano, empresta) um frame sem alocar novos arrays."""
 
-    def release_camera(self) -> None:
-        """Libera o dispositivo de captura se estiver em uso."""
+        if self._reader_thread is not None:
+            # Inclui uma leitora ainda parando: o VideoCapture não pode ser lido por duas threads.
+            return self.lease_latest_frame()
 
-        if self.capture:
-            self.capture.release()
-        self.capture = None
-        self.is_active = False
+        frame = self._read_frame()
+        if frame is None:
+            return None
+        ring = self.frame_ring
+        self._publish(frame, keep_lease=True)
+        return FrameLease(frame, ring)  # type: ignore[arg-type]
+
+    def _reader_loop(self) -> None:
+        try:
+            while not self._reader_stop.is_set() and self.is_active:
+                frame = self._read_frame()
+                if frame is not None:
+                    self._publish(frame)
+        finally:
+            with self._reader_lock:
+                if self._reader_thread is threading.current_thread():
+                    self._reader_thread = None
+                orphaned, self._orphaned_captures = self._orphaned_captures, []
+            # Dispositivos que release_camera() deixou para a leitora liberar ao sair.
+            for capture in orphaned:
+                capture.release()
 
+    def attach_frame_bus(self, bus: Optional[FrameBus]) -> None:
+        """Publica também cada frame num barramento externo (None desliga).
 
-def scan_available_cameras(max_devices: int = 5) -> List[Tuple[int, bool]]:
-    """Return camera indices with a flag telling whether frames can be read."""
+        A conversão de cor escreve direto no slot do barramento; frames com formato ou
+        resolução diferentes do barramento não são publicados (`bus_mismatches`).
+        """
 
-    available: List[Tuple[int, bool]] = []
-    for index in range(max_devices):
-        cap = cv2.VideoCapture(index)
-        if cap is None or not cap.isOpened():
-            continue
+        self._bus_slots = 0
+        self.frame_bus = bus
 
-        has_frame = False
-        has_variation = False
-        for _ in range(3):
-            ret, frame = cap.read()
-            if ret and frame is not None:
-                has_frame = True
-                if _frame_has_variation(frame):
-                    has_variation = True
-                break
+    def share_frames(self, slots: int = 8) -> None:
+        """Publica os frames num FrameBus próprio, lido pelos consumidores via `bus_reader`.
 
-        available.append((index, has_frame and has_variation))
-        cap.release()
+        O barramento é criado com o formato do primeiro frame e recriado se a resolução
+        ou o formato de saída mudarem; é fechado em `release_camera`.
+        """
 
-    return available
+        self._bus_slots = slots
 
+    def bus_reader(self, reader: Optional[FrameBusReader] = None) -> Optional[FrameBusReader]:
+        """Cursor no barramento atual; devolve `reader` enquanto o barramento for o mesmo.
 
-def _frame_has_variation(frame: np.ndarray, threshold: float = 8.0) -> bool:
-    """Rough check to ensure the frame isn't just a solid color or frozen image."""
+        None se não há barramento (share_frames desligado ou nenhum frame ainda).
+        """
 
-    if frame is None or frame.size == 0:
-        return False
+        bus = self.frame_bus
+        if bus is None:
+            return None
+        if reader is not None and reader.bus is bus:
+            return reader
+        return bus.reader()
+
+    def _owned_bus_for(self, output: np.ndarray) -> Optional[FrameBus]:
+        bus = self.frame_bus
+        if bus is not None and bus.accepts(output) and bus.color_format is self.output_format:
+            return bus
+        try:
+            bus = FrameBus.create(output.shape, self._bus_slots, self.output_format)
+        except OSError as exc:
+            print(f"⚠️  FrameBus indisponível ({exc}); consumidores usam o anel local", file=sys.stderr)
+            self._bus_slots = 0
+            self.frame_bus = None
+            return None
+        # O anterior continua mapeado até release_camera: um consumidor pode estar lendo dele.
+        self._owned_buses.append(bus)
+        self.frame_bus = bus
+        return bus
+
+    def _close_owned_buses(self) -> None:
+        if self.frame_bus in self._owned_buses:
+            self.frame_bus = None
+        still_mapped = []
+        for bus in self._owned_buses:
+            try:
+                bus.close()
+            except BufferError:
+                still_mapped.append(bus)  # Um BusFrame ainda aponta para ele; tenta de novo depois
+        self._owned_buses = still_mapped
+
+    def _publish(self, frame: CapturedFrame, keep_lease: bool = False) -> None:
+        ring = self.frame_ring
+        with ring.lock:  # type: ignore[union-attr]
+            ring.mark_published(frame.slot, keep_lease)  # type: ignore[union-attr]
+            self.frame_slot.publish(frame)
+
+    def _read_frame(self) -> Optional[CapturedFrame]:
+        capture = self.capture
+        if not capture or not self.is_active:
+            return None
+
+        ring = self.frame_ring
+        slot: Optional[int] = None
+        raw: Optional[np.ndarray] = None
+        if ring is not None:
+            slot = ring.acquire_write_slot()
+            if slot is None:
+                # Todos os buffers estão emprestados: descarta o frame sem decodificá-lo.
+                self.ring_overruns += 1
+                if not capture.grab():
+                    self.is_active = False
+                return None
+            raw = ring.raw_buffers[slot]
+
+        metrics = self.metrics
+        read_started = time.perf_counter()
+        ret, frame = capture.read(image=raw) if raw is not None else capture.read()
+        if not ret or frame is None:
+            if ring is not None and slot is not None:
+                ring.release(slot)
+            self.is_active = False
+            return None
+
+        timestamp = time.perf_counter()
+        self.last_frame_timestamp = time.time()
+        if metrics is not None:
+            metrics.record(Stage.CAPTURE, timestamp - read_started)
+            metrics.tick(Rate.CAPTURE, timestamp)
+
+        if ring is None or slot is None or frame.shape != ring.frame_shape:
+            # Primeiro frame ou mudança de resolução: (re)aloca o anel com o formato real.
+            if ring is not None and slot is not None:
+                ring.release(slot)
+            ring = self.frame_ring = FrameRing(frame.shape, self.ring_size, self.output_format)
+            self.frame_slot.clear()
+            slot = ring.acquire_write_slot()
+            np.copyto(ring.raw_buffers[slot], frame)  # type: ignore[index]
+        elif frame is not raw:
+            np.copyto(raw, frame)  # type: ignore[arg-type]
+
+        assert slot is not None
+        # Única conversão de cor do frame; BGR não converte nada. Com barramento, a conversão
+        # escreve direto no slot dele e o buffer local do anel recebe uma cópia.
+        output = ring.output_buffers[slot]
+        target = output
+        bus = self._owned_bus_for(output) if self._bus_slots else self.frame_bus
+        bus_sequence = 0
+        if bus is not None:
+            if bus.accepts(output) and bus.color_format is self.output_format:
+                bus_sequence, target = bus.begin_write()
+            else:
+                self.bus_mismatches += 1
+        convert_started = time.perf_counter() if metrics is not None else 0.0
+        converted = convert_color(ring.raw_buffers[slot], ColorFormat.BGR, self.output_format, dst=target)
+        if converted is not target:
+            np.copyto(target, converted)  # Sem conversão (BGR): só a cópia para o barramento
+        if metrics is not None and self.output_format is not ColorFormat.BGR:
+            metrics.record_since(Stage.COLOR_CONVERSION, convert_started)
+        if bus_sequence:
+            bus.commit_write(bus_sequence, timestamp)  # type: ignore[union-attr]
+            if converted is not output:
+                np.copyto(output, target)
+        self._sequence += 1
+        return CapturedFrame(
+            image=output,
+            timestamp=timestamp,
+            sequence=self._sequence,
+            slot=slot,
+            color_format=self.output_format,
+        )
+
+    def capture_frame(self) -> Optional[np.ndarray]:
+        """Retorna uma cópia do frame (RGB por padrão) ou None se indisponível.
+
+        Mantido por compatibilidade; o caminho quente deve usar lease_frame().
+        """
 
-    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-    return float(gray.std()) >= threshold
+        lease = self.lease_frame()
+        if lease is None:
+            return None
+        with lease:
+            return lease.image.copy()
+
+    def release_camera(self) -> None:
+        """Libera o dispositivo de captura se estiver em uso."""
+
+        stopped = self.stop_background_capture()
+        capture, self.capture = self.capture, None
+        self.is_active = False
+        if stopped:
+            self._close_owned_buses()
+        if not capture:
+            return
+        if not stopped:
+            with self._reader_lock:
+                if self._reader_thread is not None:
+                    # A leitora ainda está dentro de um read(): liberar agora derrubaria o
+                    # dispositivo sob ela. Ela mesma o libera ao sair.
+                    self._orphaned_captures.append(capture)
+                    return
+        capture.release()
@@ -0,0 +1,276 @@
+"""
+Camera Discovery Module
+Descoberta de câmeras: enumeração por /dev/video* e sysfs, teste concorrente dos
+dispositivos com timeout individual e cache invalidado por hotplug
+
+No Linux só os nós de captura são testados (nós de metadados UVC ficam de fora) e o
+resultado fica em cache até o conjunto de /dev/video* mudar (assinatura por inode/ctime,
+checada em microssegundos) ou, com pyudev instalado, até um evento de hotplug do
+subsistema video4linux. Em outros sistemas, sem enumeração, cada varredura testa os
+índices 0..max_devices-1 (em paralelo).
+
+Author: Renato Castellani
+Version: 1.0.0
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+import cv2
+import numpy as np
+
+DEV_DIR = Path("/dev")
+SYSFS_V4L = Path("/sys/class/video4linux")
+_VIDEO_NODE = re.compile(r"^video(\d+)$")
+
+
+@dataclass(frozen=True)
+class VideoDevice:
+    index: int
+    path: str
+    name: str = ""
+    # Nós extras do mesmo dispositivo (ex.: metadados UVC) têm sysfs `index` > 0.
+    node_index: int = 0
+
+
+def _read_sysfs(node: str, attribute: str) -> Optional[str]:
+    try:
+        return (SYSFS_V4L / node / attribute).read_text(encoding="utf-8").strip()
+    except OSError:
+        return None
+
+
+def list_video_devices() -> List[VideoDevice]:
+    """Nós /dev/videoN com nome e índice do sysfs, em ordem numérica (só Linux)."""
+
+    devices = []
+    try:
+        entries = list(os.scandir(DEV_DIR))
+    except OSError:
+        return []
+    for entry in entries:
+        match = _VIDEO_NODE.match(entry.name)
+        if not match:
+            continue
+        node_index = _read_sysfs(entry.name, "index")
+        devices.append(
+            VideoDevice(
+                index=int(match.group(1)),
+                path=entry.path,
+                name=_read_sysfs(entry.name, "name") or "",
+                node_index=int(node_index) if node_index and node_index.isdigit() else 0,
+            )
+        )
+    return sorted(devices, key=lambda device: device.index)
+
+
+def device_signature() -> Tuple[Tuple[str, int, int], ...]:
+    """Identidade dos nós de vídeo: muda quando um dispositivo é conectado ou removido."""
+
+    signature = []
+    try:
+        for entry in os.scandir(DEV_DIR):
+            if _VIDEO_NODE.match(entry.name):
+                stat = entry.stat()
+                signature.append((entry.name, stat.st_ino, stat.st_ctime_ns))
+    except OSError:
+        return ()
+    return tuple(sorted(signature))
+
+
+def frame_has_variation(frame: np.ndarray, threshold: float = 8.0) -> bool:
+    """Rough check to ensure the frame isn't just a solid color or frozen image."""
+
+    if frame is None or frame.size == 0:
+        return False
+
+    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    return float(gray.std()) >= threshold
+
+
+def probe_camera(index: int, reads: int = 3, api_preference: int = cv2.CAP_ANY) -> Optional[bool]:
+    """Abre a câmera: None se não abre; senão, se entregou um frame com conteúdo."""
+
+    cap = cv2.VideoCapture(index, api_preference)
+    try:
+        if cap is None or not cap.isOpened():
+            return None
+        for _ in range(reads):
+            ret, frame = cap.read()
+            if ret and frame is not None:
+                return frame_has_variation(frame)
+        return False
+    finally:
+        if cap is not None:
+            cap.release()
+
+
+# Testes em andamento por índice. Um teste que estourou o prazo continua rodando (e com o
+# dispositivo aberto): enquanto ele não termina, o índice não é aberto de novo.
+_running_probes: Dict[int, threading.Thread] = {}
+_running_lock = threading.Lock()
+
+
+def probe_cameras(indices: List[int], timeout: float = 3.0, api_preference: int = cv2.CAP_ANY) -> Dict[int, Optional[bool]]:
+    """Testa os índices em paralelo; quem não responde em `timeout` segundos fica fora do resultado.
+
+    Cada teste roda numa thread daemon própria: um driver travado não segura a varredura
+    nem o encerramento do processo. Um índice cujo teste anterior ainda não terminou não é
+    testado de novo (também fica fora do resultado).
+    """
+
+    results: Dict[int, Optional[bool]] = {}
+    lock = threading.Lock()
+
+    def worker(index: int) -> None:
+        outcome: Optional[bool] = None
+        try:
+            outcome = probe_camera(index, api_preference=api_preference)
+        except cv2.error:
+            pass
+        finally:
+            with lock:
+                results[index] = outcome
+            with _running_lock:
+                if _running_probes.get(index) is threading.current_thread():
+                    del _running_probes[index]
+
+    threads = []
+    with _running_lock:
+        for index in indices:
+            previous = _running_probes.get(index)
+            if previous is not None and previous.is_alive():
+                continue
+            thread = threading.Thread(target=worker, args=(index,), name=f"CameraProbe-{index}", daemon=True)
+            _running_probes[index] = thread
+            threads.append(thread)
+    for thread in threads:
+        thread.start()
+    # Todos começam juntos: um prazo único dá a cada dispositivo o mesmo `timeout`.
+    deadline = time.monotonic() + timeout
+    for thread in threads:
+        thread.join(max(0.0, deadline - time.monotonic()))
+
+    with lock:
+        return dict(results)
+
+
+class CameraScanner:
+    """Varredura com cache; `scan()` só testa os dispositivos de novo após hotplug.
+
+    Dispositivos que não responderam no prazo não entram no cache: aparecem como não
+    prontos e são testados de novo no próximo `scan()` (se o teste anterior já terminou).
+    """
+
+    def __init__(self, max_devices: int = 5, timeout: float = 3.0) -> None:
+        self.max_devices = max_devices
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        # Resultado por índice, na ordem da enumeração; None = não abriu (fica de fora).
+        self._cache: Optional[Dict[int, Optional[bool]]] = None
+        self._unsettled: Set[int] = set()
+        self._signature: Optional[tuple] = None
+        self._generation = 0
+        self._cached_generation = -1
+        self._monitor = None
+        self.scans = 0
+        self._start_udev_monitor()
+
+    def _start_udev_monitor(self) -> None:
+        """Com pyudev (opcional), eventos do video4linux invalidam o cache na hora."""
+
+        if not self._enumerates():
+            return
+        try:
+            import pyudev
+        except ImportError:
+            return
+        try:
+            monitor = pyudev.Monitor.from_netlink(pyudev.Context())
+            monitor.filter_by(subsystem="video4linux")
+            self._monitor = pyudev.MonitorObserver(monitor, callback=lambda device: self.invalidate(), name="CameraHotplug")
+            self._monitor.daemon = True
+            self._monitor.start()
+        except Exception:  # pragma: no cover - sem permissão de netlink, etc.
+            self._monitor = None
+
+    def invalidate(self) -> None:
+        self._generation += 1
+
+    @staticmethod
+    def _enumerates() -> bool:
+        return sys.platform.startswith("linux")
+
+    def _candidates(self) -> Tuple[List[int], int]:
+        if not self._enumerates():
+            return list(range(self.max_devices)), cv2.CAP_ANY
+        # Só o nó principal de cada dispositivo; abrir via V4L2 pula a sondagem de backends.
+        return [device.index for device in list_video_devices() if device.node_index == 0], cv2.CAP_V4L2
+
+    def scan(self, force: bool = False) -> List[Tuple[int, bool]]:
+        with self._lock:
+            signature = device_signature()
+            generation = self._generation
+            cached = (
+                not force
+                and self._enumerates()
+                and self._cache is not None
+                and signature == self._signature
+                and generation == self._cached_generation
+            )
+            if cached and not self._unsettled:
+                return self._listing()
+
+            if cached:
+                # Só os que estouraram o prazo da última vez; o resto continua valendo.
+                indices = sorted(self._unsettled)
+                api_preference = self._candidates()[1]
+            else:
+                indices, api_preference = self._candidates()
+                self._cache = dict.fromkeys(indices)
+            outcomes = probe_cameras(indices, self.timeout, api_preference)
+            self._cache.update(outcomes)
+            self._unsettled = {index for index in indices if index not in outcomes}
+            self._signature = signature
+            self._cached_generation = generation
+            self.scans += 1
+            return self._listing()
+
+    def _listing(self) -> List[Tuple[int, bool]]:
+        # Sem resposta ainda: aparece como não pronto, mas continua pendente de teste.
+        return [
+            (index, bool(ready))
+            for index, ready in self._cache.items()
+            if ready is not None or index in self._unsettled
+        ]
+
+    def close(self) -> None:
+        if self._monitor is not None:
+            self._monitor.stop()
+            self._monitor = None
+
+
+_default_scanner: Optional[CameraScanner] = None
+_default_lock = threading.Lock()
+
+
+def scan_available_cameras(max_devices: int = 5, force: bool = False) -> List[Tuple[int, bool]]:
+    """Return camera indices with a flag telling whether frames can be read (cached)."""
+
+    global _default_scanner
+    with _default_lock:
+        if _default_scanner is None:
+            _default_scanner = CameraScanner(max_devices)
+        scanner = _default_scanner
+    # Um único scanner (e um único monitor de hotplug): `max_devices` só limita os índices
+    # testados sem enumeração, e esse caminho não usa o cache.
+    scanner.max_devices = max_devices
+    return scanner.scan(force)
@@ -1,18 +1,28 @@
 """Desktop GUI for NoTouchPad using PySide6."""
 
 import sys
+import threading
+import time
 from dataclasses import dataclass
 from typing import Dict, List, Optional, Tuple
 
 from camera_detector import CameraDetector, scan_available_cameras
+from frame_bus import FrameBusReader
+from gamepad_controller import GamepadController
 from gesture_recognizer import GestureRecognizer, GestureType
+from gesture_smoothing import GestureEvent, GestureSmoother
+from inference_pipeline import InferencePipeline, InferenceResult
+from instrumentation import PipelineMetrics, Rate, Stage
+from motion_gate import GatedRecognizer
+from performance_profiles import DEFAULT_PROFILE, PROFILES, PerformanceProfile, get_profile
 
 try:
-    from PySide6.QtCore import Qt, QTimer, QTime
+    from PySide6.QtCore import Qt, QTimer, QTime, Signal
     from PySide6.QtGui import QFont, QImage, QPixmap
     from PySide6.QtWidgets import (
         QApplication,
         QComboBox,
+        QFileDialog,
         QGridLayout,
         QGroupBox,
         QHBoxLayout,
@@ -48,9 +58,51 @@ def build_gestures() -> Dict[str, GestureInfo]:
     }
 
 
+STAGE_LABELS: Dict[Stage, str] = {
+    Stage.CAPTURE: "Captura",
+    Stage.COLOR_CONVERSION: "Conversão de cor (câmera)",
+    Stage.INFERENCE_CONVERSION: "Conversão para RGB",
+    Stage.QUEUE: "Fila até a inferência",
+    Stage.INFERENCE: "Inferência (MediaPipe)",
+    Stage.CLASSIFICATION: "Classificação",
+    Stage.SMOOTHING: "Suavização",
+    Stage.MAPPING: "Mapeamento",
+    Stage.GAMEPAD_EMIT: "Envio ao gamepad",
+    Stage.END_TO_END: "Captura → gamepad",
+    Stage.UI_PAINT: "Pintura da UI",
+    Stage.DISPLAY: "Captura → tela",
+}
+
+RATE_LABELS: Dict[Rate, str] = {
+    Rate.CAPTURE: "Câmera",
+    Rate.INFERENCE: "Inferência",
+    Rate.UI: "Preview",
+}
+
+
+GESTURE_KEYS: Dict[GestureType, str] = {
+    GestureType.FIST: "punch",
+    GestureType.OPEN_HAND: "open",
+    GestureType.POINTING: "point",
+    GestureType.THUMBS_UP: "thumbs",
+    GestureType.PEACE: "stop",
+}
+
+
+def frame_to_pixmap(frame, width: int, height: int) -> "QPixmap":
+    """Converte um frame RGB (H, W, 3) num pixmap do tamanho do preview, mantendo a proporção."""
+
+    frame_height, frame_width, _ = frame.shape
+    image = QImage(frame.data, frame_width, frame_height, 3 * frame_width, QImage.Format_RGB888)
+    return QPixmap.fromImage(image).scaled(width, height, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+
+
 class DesktopWindow(QMainWindow):
     """Janela principal do NoTouchPad."""
 
+    # Resultado da varredura de câmeras (feita fora da thread da interface).
+    camerasScanned = Signal(object, bool)
+
     def __init__(self) -> None:
         super().__init__()
         self.setWindowTitle("NoTouchPad v1.0.0 - Desktop")
@@ -62,19 +114,36 @@ class DesktopWindow(QMainWindow):
         self.is_running = False
         self.is_auto = False
         self.preview_has_video = False
+        self.last_preview_sequence = 0
+        self.preview_reader: Optional[FrameBusReader] = None
         self.camera_detector: Optional[CameraDetector] = None
         self.camera_timer = QTimer(self)
         self.camera_timer.timeout.connect(self._update_camera_preview)
         self.available_cameras: List[Tuple[int, bool]] = []
+        self._camera_scan_running = False
         self.camera_selector: Optional[QComboBox] = None
         self.gesture_recognizer: Optional[GestureRecognizer] = None
         self.last_detected_gesture: GestureType = GestureType.UNKNOWN
+        self.performance_profile: PerformanceProfile = get_profile(DEFAULT_PROFILE)
+        self.gesture_smoother = GestureSmoother(
+            window=self.performance_profile.smoothing_window,
+            enter_votes=self.performance_profile.enter_votes,
+            exit_votes=self.performance_profile.exit_votes,
+            min_hold=self.performance_profile.min_hold,
+        )
+        self.gamepad: Optional[GamepadController] = None
+        self.inference_pipeline: Optional[InferencePipeline] = None
+        # Medição por estágio compartilhada por câmera, inferência, gamepad e UI.
+        self.metrics = PipelineMetrics()
+        self.stage_value_labels: Dict[Stage, List[QLabel]] = {}
         self.gesture_indicator_labels: Dict[str, QLabel] = {}
         self.gesture_indicator_timers: Dict[str, QTimer] = {}
 
         self._build_ui()
         self._setup_timers()
         self._init_gesture_recognizer()
+        self._init_gamepad()
+        self._init_inference_pipeline()
         self._init_camera()
         self._log("Interface desktop iniciada. Detecção automática habilitada.")
         self._resume_detection()
@@ -100,6 +169,7 @@ class DesktopWindow(QMainWindow):
 
         self._build_detection_tab()
         self._build_simulation_tab()
+        self._build_performance_tab()
 
         log_group = QGroupBox("📝 Log de Eventos")
         log_layout = QVBoxLayout(log_group)
@@ -163,6 +233,17 @@ class DesktopWindow(QMainWindow):
         self.progress_indicator.setStyleSheet("color: #a0a0a0; font-size: 14px")
         status_layout.addWidget(self.progress_indicator)
 
+        profile_controls = QHBoxLayout()
+        profile_controls.setSpacing(8)
+        profile_controls.addWidget(QLabel("Perfil:"))
+        self.profile_selector = QComboBox()
+        for profile in PROFILES.values():
+            self.profile_selector.addItem(profile.label, profile.name)
+        self.profile_selector.setCurrentIndex(list(PROFILES).index(self.performance_profile.name))
+        self.profile_selector.currentIndexChanged.connect(self._on_profile_selected)
+        profile_controls.addWidget(self.profile_selector, 1)
+        status_layout.addLayout(profile_controls)
+
         top_panel.addWidget(status_group)
 
         gesture_group = QGroupBox("🖐️ Gestos Disponíveis")
@@ -227,6 +308,47 @@ class DesktopWindow(QMainWindow):
 
         self.tab_widget.addTab(simulation_widget, "Simulação")
 
+    def _build_performance_tab(self) -> None:
+        performance_widget = QWidget()
+        perf_layout = QVBoxLayout(performance_widget)
+        perf_layout.setSpacing(16)
+
+        self.fps_label = QLabel("FPS: --")
+        self.fps_label.setStyleSheet("font-size: 14px;")
+        perf_layout.addWidget(self.fps_label)
+
+        latency_group = QGroupBox("⏱️ Latência por estágio (ms)")
+        grid = QGridLayout(latency_group)
+        grid.setHorizontalSpacing(24)
+        for column, title in enumerate(("Estágio", "p50", "p95", "p99", "Amostras")):
+            header = QLabel(title)
+            header.setStyleSheet("font-weight: bold;")
+            grid.addWidget(header, 0, column)
+        for row, stage in enumerate(Stage, start=1):
+            grid.addWidget(QLabel(STAGE_LABELS[stage]), row, 0)
+            values = []
+            for column in range(1, 5):
+                value = QLabel("--")
+                value.setAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                value.setStyleSheet("font-family: monospace;")
+                grid.addWidget(value, row, column)
+                values.append(value)
+            self.stage_value_labels[stage] = values
+        perf_layout.addWidget(latency_group)
+
+        controls = QHBoxLayout()
+        controls.setSpacing(10)
+        export_btn = QPushButton("💾 Exportar JSON")
+        export_btn.clicked.connect(self._export_metrics)
+        reset_btn = QPushButton("♻️ Zerar medições")
+        reset_btn.clicked.connect(self._reset_metrics)
+        controls.addWidget(export_btn)
+        controls.addWidget(reset_btn)
+        perf_layout.addLayout(controls)
+        perf_layout.addStretch(1)
+
+        self.tab_widget.addTab(performance_widget, "Desempenho")
+
     def _build_gesture_rows(self, parent_layout: QVBoxLayout) -> None:
         for key, info in self.gestures.items():
             row = QHBoxLayout()
@@ -293,23 +415,87 @@ class DesktopWindow(QMainWindow):
     def _setup_timers(self) -> None:
         self.auto_timer = QTimer(self)
         self.auto_timer.timeout.connect(self._auto_step)
+        self.metrics_timer = QTimer(self)
+        self.metrics_timer.timeout.connect(self._refresh_metrics_panel)
+        self.metrics_timer.start(1000)
 
     def _init_gesture_recognizer(self) -> None:
         try:
+            # Parâmetros de inferência vêm do perfil, aplicado pela thread de inferência.
             self.gesture_recognizer = GestureRecognizer()
+            self.gesture_recognizer.metrics = self.metrics
             self._log("Reconhecimento de gestos ativado (MediaPipe).")
         except Exception as exc:  # pragma: no cover - fallback
             self.gesture_recognizer = None
             self._log(f"Reconhecimento de gestos indisponível: {exc}")
 
+    def _init_gamepad(self) -> None:
+        self.gamepad = GamepadController.create_virtual()
+        self.gamepad.metrics = self.metrics
+        if self.gamepad.backend is not None:
+            self._log(f"Gamepad virtual ativo (perfil: {self.gamepad.mapping.profile.name}).")
+        else:
+            self._log("Gamepad virtual indisponível; gestos apenas exibidos na interface.")
+
+    def _init_inference_pipeline(self) -> None:
+        if not self.gesture_recognizer:
+            return
+        # A partir daqui recognizer, smoother e gamepad pertencem à thread de inferência.
+        # Com a cena parada o MediaPipe só roda de tempos em tempos (kiosks ociosos).
+        self.inference_pipeline = InferencePipeline(
+            GatedRecognizer(self.gesture_recognizer),
+            self.gesture_smoother,
+            self.gamepad,
+            metrics=self.metrics,
+            parent=self,
+        )
+        self.inference_pipeline.resultReady.connect(self._on_inference_result, Qt.QueuedConnection)
+        self.inference_pipeline.set_profile(self.performance_profile)
+        self.inference_pipeline.start()
+
     def _init_camera(self) -> None:
-        self.available_cameras = scan_available_cameras()
+        self.camerasScanned.connect(self._on_cameras_scanned, Qt.QueuedConnection)
+        self.camera_placeholder.setText("Procurando webcams...")
+        self._scan_cameras()
+
+    def _scan_cameras(self, refresh: bool = False) -> None:
+        """Varre as câmeras numa thread; o resultado volta pela fila de eventos da UI."""
+
+        if self._camera_scan_running:
+            return
+        self._camera_scan_running = True
+        if hasattr(self, "refresh_cameras_btn"):
+            self.refresh_cameras_btn.setEnabled(False)
+
+        def scan() -> None:
+            try:
+                cameras = scan_available_cameras()
+            except Exception as exc:  # pragma: no cover - falha de driver
+                print(f"Falha ao procurar câmeras: {exc}", file=sys.stderr)
+                cameras = []
+            self.camerasScanned.emit(cameras, refresh)
+
+        threading.Thread(target=scan, name="CameraScan", daemon=True).start()
+
+    def _on_cameras_scanned(self, cameras: List[Tuple[int, bool]], refresh: bool) -> None:
+        self._camera_scan_running = False
+        if refresh and cameras == self.available_cameras and self.camera_detector and self.camera_detector.is_active:
+            # Nada mudou: mantém a câmera atual aberta e a seleção do combo.
+            self.refresh_cameras_btn.setEnabled(True)
+            return
+
+        self.available_cameras = cameras
         self._populate_camera_selector()
 
         if not self.available_cameras:
             self.camera_placeholder.setText(
-                "Nenhuma webcam detectada. Verifique conexões ou permissões e clique em Atualizar."
+                "Nenhuma webcam detectada. Reconecte o dispositivo e tente novamente."
+                if refresh
+                else "Nenhuma webcam detectada. Verifique conexões ou permissões e clique em Atualizar."
             )
+            if self.camera_detector:
+                self.camera_detector.release_camera()
+            self.camera_timer.stop()
             return
 
         preferred = self._pick_preferred_camera()
@@ -329,60 +515,117 @@ class DesktopWindow(QMainWindow):
         if not self.camera_detector:
             return
 
-        frame = self.camera_detector.capture_frame()
-        if frame is None:
+        if not self.camera_detector.is_active:
             if self.preview_has_video:
                 self.camera_placeholder.setText("Câmera pausada. Tentando reconectar...")
                 self.preview_has_video = False
             return
 
-        height, width, _ = frame.shape
-        image = QImage(frame.data, width, height, 3 * width, QImage.Format_RGB888)
-        pixmap = QPixmap.fromImage(image).scaled(
-            self.camera_placeholder.width(),
-            self.camera_placeholder.height(),
-            Qt.KeepAspectRatio,
-            Qt.SmoothTransformation,
-        )
-        self.camera_placeholder.setPixmap(pixmap)
-        self.preview_has_video = True
-        self._process_gesture_frame(frame)
+        # Leitura não bloqueante do frame mais recente, mapeado direto do barramento.
+        self.preview_reader = self.camera_detector.bus_reader(self.preview_reader)
+        if self.preview_reader is not None:
+            frame = self.preview_reader.latest()
+            if frame is None:
+                return
+            paint_started = time.perf_counter()
+            pixmap = self._frame_pixmap(frame.image)
+            # O pixmap já é uma cópia; se o slot foi sobrescrito no meio, espera o próximo.
+            if frame.is_valid():
+                self._show_preview(pixmap, frame.timestamp, paint_started)
+            return
 
-    def _process_gesture_frame(self, frame) -> None:
-        if not self.gesture_recognizer or not self.is_running:
+        # Sem barramento: o frame é emprestado do anel de buffers e devolvido em seguida.
+        lease = self.camera_detector.lease_latest_frame()
+        if lease is None:
             return
 
-        hands = self.gesture_recognizer.detect_hands(frame)
-        if not hands:
-            self._handle_no_gesture()
+        with lease:
+            if lease.frame.sequence == self.last_preview_sequence:
+                return
+            self.last_preview_sequence = lease.frame.sequence
+            paint_started = time.perf_counter()
+            pixmap = self._frame_pixmap(lease.image)
+            self._show_preview(pixmap, lease.frame.timestamp, paint_started)
+
+    def _frame_pixmap(self, image) -> "QPixmap":
+        return frame_to_pixmap(image, self.camera_placeholder.width(), self.camera_placeholder.height())
+
+    def _show_preview(self, pixmap: "QPixmap", captured_at: float, paint_started: float) -> None:
+        self.camera_placeholder.setPixmap(pixmap)
+        self.preview_has_video = True
+        painted = self.metrics.record_since(Stage.UI_PAINT, paint_started)
+        self.metrics.record(Stage.DISPLAY, painted - captured_at)
+        self.metrics.tick(Rate.UI, painted)
+
+    def _refresh_metrics_panel(self) -> None:
+        snapshot = self.metrics.snapshot()
+        fps = snapshot["fps"]
+        self.fps_label.setText(
+            "FPS: " + "  |  ".join(f"{RATE_LABELS[rate]} {fps[rate.value]:.1f}" for rate in Rate)
+        )
+        stages = snapshot["stages"]
+        for stage, labels in self.stage_value_labels.items():
+            summary = stages[stage.value]
+            if not summary["count"]:
+                texts = ["--"] * len(labels)
+            else:
+                texts = [f"{summary[key]:.2f}" for key in ("p50_ms", "p95_ms", "p99_ms")]
+                texts.append(str(summary["count"]))
+            for label, text in zip(labels, texts):
+                label.setText(text)
+
+    def _export_metrics(self) -> None:
+        default_name = f"notouchpad_metrics_{time.strftime('%Y%m%d_%H%M%S')}.json"
+        path, _ = QFileDialog.getSaveFileName(self, "Exportar medições", default_name, "JSON (*.json)")
+        if not path:
+            return
+        try:
+            self.metrics.dump_json(path, include_buckets=True)
+            self._log(f"Medições exportadas para {path}")
+        except OSError as exc:
+            self._log(f"Falha ao exportar medições: {exc}")
+
+    def _reset_metrics(self) -> None:
+        self.metrics.reset()
+        self._refresh_metrics_panel()
+        self._log("Medições de desempenho zeradas.")
+
+    def _on_inference_result(self) -> None:
+        if not self.inference_pipeline:
+            return
+        result = self.inference_pipeline.take_result()
+        if result is None or not self.is_running:
             return
 
-        detected_any = False
-        for hand in hands:
-            if hand.gesture == GestureType.UNKNOWN:
-                continue
-            detected_any = True
-            self._handle_detected_gesture(hand.gesture)
+        # O filtro temporal só devolve mudanças estáveis: a UI trabalha por transição,
+        # não por frame.
+        for event in result.events:
+            self._handle_gesture_event(event, result)
 
-        if not detected_any:
-            self._handle_no_gesture()
+    def _handle_gesture_event(self, event: GestureEvent, result: InferenceResult) -> None:
+        previous_key = GESTURE_KEYS.get(event.previous)
+        if previous_key:
+            self._set_indicator_state(previous_key, False)
+
+        if event.current == GestureType.UNKNOWN:
+            if not result.has_active_gesture:
+                self._handle_no_gesture()
+            return
+
+        self._handle_detected_gesture(event.current)
 
     def _handle_detected_gesture(self, gesture_type: GestureType) -> None:
-        mapping = {
-            GestureType.FIST: "punch",
-            GestureType.OPEN_HAND: "open",
-            GestureType.POINTING: "point",
-            GestureType.THUMBS_UP: "thumbs",
-            GestureType.PEACE: "stop",
-        }
-
-        key = mapping.get(gesture_type)
+        key = GESTURE_KEYS.get(gesture_type)
         if not key or key not in self.gestures:
             self.gesture_label.setText("Gesto atual: Desconhecido")
             self.command_label.setText("Comando enviado: --")
             return
 
-        self._activate_indicator(key)
+        # Mantém o indicador aceso enquanto o gesto estiver estável.
+        pending = self.gesture_indicator_timers.pop(key, None)
+        if pending:
+            pending.stop()
+        self._set_indicator_state(key, True)
 
         info = self.gestures[key]
         if gesture_type != self.last_detected_gesture:
@@ -431,17 +674,30 @@ class DesktopWindow(QMainWindow):
 
     def _start_camera(self, camera_index: int) -> None:
         if self.camera_detector is None:
-            self.camera_detector = CameraDetector(camera_index=camera_index)
+            self.camera_detector = CameraDetector(
+                camera_index=camera_index,
+                frame_size=self.performance_profile.camera_size,
+                fps=self.performance_profile.camera_fps,
+            )
+            self.camera_detector.metrics = self.metrics
+            # O preview lê os frames do barramento compartilhado, sem empréstimo do anel.
+            self.camera_detector.share_frames()
             initialized = self.camera_detector.initialize_camera()
         else:
             initialized = self.camera_detector.reinitialize(camera_index)
 
         self.preview_has_video = False
+        self.last_preview_sequence = 0
+        self.preview_reader = None
+
+        if self.inference_pipeline:
+            self.inference_pipeline.set_camera(self.camera_detector)
 
         if initialized:
+            self.camera_detector.start_background_capture()
             self.camera_placeholder.setText("Câmera inicializada. Carregando preview...")
             if not self.camera_timer.isActive():
-                self.camera_timer.start(33)
+                self.camera_timer.start(self.performance_profile.ui_refresh_ms)
         else:
             self.camera_placeholder.setText(
                 "Não foi possível inicializar esta webcam. Escolha outra ou verifique permissões."
@@ -458,24 +714,42 @@ class DesktopWindow(QMainWindow):
         self._start_camera(int(camera_index))
 
     def _refresh_camera_devices(self) -> None:
-        self.available_cameras = scan_available_cameras()
-        self._populate_camera_selector()
-        if self.available_cameras:
-            preferred = self._pick_preferred_camera()
-            if preferred is None:
-                preferred = self.available_cameras[0][0]
-            self._select_camera_in_combo(preferred)
-            self._start_camera(preferred)
-        else:
-            self.camera_placeholder.setText(
-                "Nenhuma webcam detectada. Reconecte o dispositivo e tente novamente."
-            )
-            if self.camera_detector:
-                self.camera_detector.release_camera()
-            self.camera_timer.stop()
+        # A varredura é cacheada: sem hotplug desde a última, a resposta é imediata.
+        self._scan_cameras(refresh=True)
+
+    def _on_profile_selected(self, combo_index: int) -> None:
+        name = self.profile_selector.itemData(combo_index)
+        if name is None or name == self.performance_profile.name:
+            return
+        self._apply_profile(get_profile(name))
+
+    def _apply_profile(self, profile: PerformanceProfile) -> None:
+        """Troca o perfil ao vivo: câmera, inferência, suavização e taxa da UI."""
+
+        self.performance_profile = profile
+        if self.camera_timer.isActive():
+            self.camera_timer.setInterval(profile.ui_refresh_ms)
+        # `configure` pausa a thread leitora da câmera (até 1 s): nunca na thread da GUI.
+        if self.inference_pipeline:
+            self.inference_pipeline.set_profile(profile)
+        elif self.camera_detector:
+            threading.Thread(
+                target=self.camera_detector.configure,
+                args=(profile.camera_size, profile.camera_fps),
+                name="CameraConfigure",
+                daemon=True,
+            ).start()
+        # O smoother recomeça do zero com o novo perfil.
+        for key in self.gesture_indicator_labels:
+            self._set_indicator_state(key, False)
+        self._handle_no_gesture()
+        self._log(f"Perfil de desempenho: {profile.label}")
 
     def _update_status(self, running: bool) -> None:
         self.is_running = running
+        if self.inference_pipeline:
+            # Ao pausar, a própria thread de inferência zera o smoother e solta o gamepad.
+            self.inference_pipeline.set_active(running)
         self.status_label.setText(f"Status: {'🟢 Detectando' if running else '🔴 Pausado'}")
         self.progress_indicator.setText("●●● Detectando" if running else "○○○ Pausado")
 
@@ -500,6 +774,8 @@ class DesktopWindow(QMainWindow):
 
     def _stop_detection(self) -> None:
         self._update_status(False)
+        for key in self.gesture_indicator_labels:
+            self._set_indicator_state(key, False)
         self.gesture_label.setText("Gesto atual: Detecção pausada")
         self.command_label.setText("Comando enviado: --")
         self._log("Detecção pausada pelo usuário.")
@@ -532,8 +808,13 @@ class DesktopWindow(QMainWindow):
     def closeEvent(self, event) -> None:  # type: ignore[override]
         if self.camera_timer.isActive():
             self.camera_timer.stop()
+        self.metrics_timer.stop()
+        if self.inference_pipeline:
+            self.inference_pipeline.stop()
         if self.camera_detector:
             self.camera_detector.release_camera()
+        if self.gamepad:
+            self.gamepad.close()
         super().closeEvent(event)
 
 
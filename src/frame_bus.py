@@ -0,0 +1,287 @@
+"""
+Frame Bus Module
+Barramento de frames em memória compartilhada: um produtor (a câmera) e qualquer número
+de consumidores (preview, processo de inferência, streaming web, gravador), em qualquer
+processo, lendo o mesmo frame sem cópia
+
+O anel tem `slots` posições; cada slot é protegido por um seqlock (contador ímpar durante
+a escrita). O produtor nunca espera pelos leitores: quem ficar para trás perde frames e
+percebe isso pelo seu cursor, sem atrasar os demais.
+
+Author: Renato Castellani
+Version: 1.0.0
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import time
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Optional, Tuple
+
+import numpy as np
+
+from frame_types import ColorFormat
+
+_MAGIC = 0x4E545042  # "NTPB"
+_VERSION = 1
+_ALIGN = 64
+
+# Cabeçalho (int64): identificação, geometria e contador global de escrita.
+_H_MAGIC, _H_VERSION, _H_SLOTS, _H_HEIGHT, _H_WIDTH, _H_CHANNELS, _H_FORMAT, _H_WRITE_SEQ = range(8)
+_HEADER_FIELDS = 8
+_COLOR_FORMATS = tuple(ColorFormat)
+
+
+def _aligned(size: int) -> int:
+    return (size + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+def _open_shared_memory(name: str) -> shared_memory.SharedMemory:
+    """Abre um bloco existente sem registrá-lo no resource_tracker deste processo.
+
+    Sem isso, um consumidor independente que termina apagaria o bloco do produtor
+    (Python < 3.13). Filhos do multiprocessing compartilham o tracker do pai e não
+    devem desregistrar o bloco.
+    """
+
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)  # type: ignore[call-arg]
+    except TypeError:
+        shm = shared_memory.SharedMemory(name=name)
+        if multiprocessing.parent_process() is None:
+            from multiprocessing import resource_tracker
+
+            resource_tracker.unregister(shm._name, "shared_memory")  # type: ignore[attr-defined]
+        return shm
+
+
+@dataclass
+class BusFrame:
+    """Frame mapeado direto do barramento (view somente leitura, sem cópia).
+
+    O slot pode ser sobrescrito pelo produtor a qualquer momento; confira `is_valid()`
+    depois de usar a imagem (ou use `copy_to`) antes de confiar no resultado.
+    """
+
+    image: np.ndarray
+    sequence: int
+    timestamp: float
+    slot: int
+    color_format: ColorFormat
+    _bus: "FrameBus"
+    _generation: int
+
+    def is_valid(self) -> bool:
+        return self._bus._locks[self.slot] == self._generation
+
+    def copy_to(self, dst: Optional[np.ndarray] = None) -> Optional[np.ndarray]:
+        """Copia a imagem; retorna None se o frame foi sobrescrito durante a cópia."""
+
+        if dst is None:
+            dst = np.empty_like(self.image)
+        np.copyto(dst, self.image)
+        return dst if self.is_valid() else None
+
+
+class FrameBus:
+    """Anel de frames de formato fixo sobre `multiprocessing.shared_memory`.
+
+    Crie com `FrameBus.create(...)` no produtor e abra com `FrameBus.attach(nome)` nos
+    consumidores (inclusive em outros processos). O CameraDetector escreve nele via
+    `share_frames` (barramento próprio, lido pelo preview e pelo stream MJPEG com
+    `bus_reader`) ou `attach_frame_bus`; os workers do InferencePool leem via `submit_bus`.
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool) -> None:
+        self._shm = shm
+        self.owner = owner
+        buf = shm.buf
+        self._header = np.ndarray((_HEADER_FIELDS,), dtype=np.int64, buffer=buf)
+        if self._header[_H_MAGIC] != _MAGIC or self._header[_H_VERSION] != _VERSION:
+            raise ValueError(f"Bloco {shm.name} não é um FrameBus compatível")
+
+        self.slots = int(self._header[_H_SLOTS])
+        height, width, channels = (int(v) for v in self._header[_H_HEIGHT:_H_CHANNELS + 1])
+        self.frame_shape: Tuple[int, ...] = (height, width) if channels == 1 else (height, width, channels)
+        self.color_format = _COLOR_FORMATS[int(self._header[_H_FORMAT])]
+
+        offset = _aligned(self._header.nbytes)
+        self._locks = np.ndarray((self.slots,), dtype=np.int64, buffer=buf, offset=offset)
+        offset += _aligned(self._locks.nbytes)
+        self._sequences = np.ndarray((self.slots,), dtype=np.int64, buffer=buf, offset=offset)
+        offset += _aligned(self._sequences.nbytes)
+        self._timestamps = np.ndarray((self.slots,), dtype=np.float64, buffer=buf, offset=offset)
+        offset += _aligned(self._timestamps.nbytes)
+        frame_bytes = _aligned(int(np.prod(self.frame_shape)))
+        self._frames = [
+            np.ndarray(self.frame_shape, dtype=np.uint8, buffer=buf, offset=offset + slot * frame_bytes)
+            for slot in range(self.slots)
+        ]
+        self._views = []
+        for frame in self._frames:
+            view = frame.view()
+            view.flags.writeable = False
+            self._views.append(view)
+
+    @staticmethod
+    def required_size(frame_shape: Tuple[int, ...], slots: int) -> int:
+        meta = _aligned(_HEADER_FIELDS * 8) + 3 * _aligned(slots * 8)
+        return meta + slots * _aligned(int(np.prod(frame_shape)))
+
+    @classmethod
+    def create(
+        cls,
+        frame_shape: Tuple[int, ...],
+        slots: int = 8,
+        color_format: ColorFormat = ColorFormat.RGB,
+        name: Optional[str] = None,
+    ) -> "FrameBus":
+        if slots < 2:
+            raise ValueError("O barramento precisa de pelo menos 2 slots")
+        height, width = frame_shape[:2]
+        channels = frame_shape[2] if len(frame_shape) == 3 else 1
+
+        shm = shared_memory.SharedMemory(name=name, create=True, size=cls.required_size(frame_shape, slots))
+        header = np.ndarray((_HEADER_FIELDS,), dtype=np.int64, buffer=shm.buf)
+        header[:] = (_MAGIC, _VERSION, slots, height, width, channels, _COLOR_FORMATS.index(color_format), 0)
+        del header
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> "FrameBus":
+        return cls(_open_shared_memory(name), owner=False)
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    @property
+    def write_sequence(self) -> int:
+        """Número de frames publicados até agora (sequência do mais recente)."""
+
+        return int(self._header[_H_WRITE_SEQ])
+
+    def accepts(self, image: np.ndarray) -> bool:
+        return image.shape == self.frame_shape and image.dtype == np.uint8
+
+    def begin_write(self) -> Tuple[int, np.ndarray]:
+        """Reserva o próximo slot para escrita direta (ex.: `cvtColor(..., dst=buffer)`).
+
+        Termine com `commit_write`; até lá os leitores veem o slot como inválido.
+        """
+
+        sequence = self.write_sequence + 1
+        slot = sequence % self.slots
+        self._locks[slot] += 1  # ímpar: escrita em andamento
+        return sequence, self._frames[slot]
+
+    def commit_write(self, sequence: int, timestamp: Optional[float] = None) -> int:
+        slot = sequence % self.slots
+        self._sequences[slot] = sequence
+        self._timestamps[slot] = time.perf_counter() if timestamp is None else timestamp
+        self._locks[slot] += 1  # par: slot consistente
+        self._header[_H_WRITE_SEQ] = sequence
+        return sequence
+
+    def publish(self, image: np.ndarray, timestamp: Optional[float] = None) -> int:
+        """Copia `image` para o próximo slot e o publica; retorna a sequência no barramento."""
+
+        if not self.accepts(image):
+            raise ValueError(f"Frame {image.shape} {image.dtype} incompatível com o barramento {self.frame_shape}")
+        sequence, buffer = self.begin_write()
+        np.copyto(buffer, image)
+        return self.commit_write(sequence, timestamp)
+
+    def read(self, sequence: int) -> Optional[BusFrame]:
+        """Mapeia o frame `sequence`, ou None se ainda não existe / já foi sobrescrito."""
+
+        if sequence <= 0:
+            return None
+        slot = sequence % self.slots
+        generation = int(self._locks[slot])
+        if generation & 1 or self._sequences[slot] != sequence:
+            return None
+        frame = BusFrame(
+            image=self._views[slot],
+            sequence=sequence,
+            timestamp=float(self._timestamps[slot]),
+            slot=slot,
+            color_format=self.color_format,
+            _bus=self,
+            _generation=generation,
+        )
+        # Confere de novo: o produtor pode ter começado a sobrescrever entre as leituras.
+        return frame if frame.is_valid() else None
+
+    def reader(self, start_at_latest: bool = True) -> "FrameBusReader":
+        return FrameBusReader(self, self.write_sequence if start_at_latest else 0)
+
+    def close(self) -> None:
+        self._views = []
+        self._frames = []
+        self._locks = self._sequences = self._timestamps = self._header = None  # type: ignore[assignment]
+        self._shm.close()
+        if self.owner:
+            self._shm.unlink()
+
+    def __enter__(self) -> "FrameBus":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class FrameBusReader:
+    """Cursor de um consumidor; cada consumidor tem o seu e descarta frames por conta própria."""
+
+    def __init__(self, bus: FrameBus, cursor: int = 0) -> None:
+        self.bus = bus
+        self.cursor = cursor
+        self.dropped_frames = 0
+
+    @property
+    def pending(self) -> int:
+        return max(0, self.bus.write_sequence - self.cursor)
+
+    def _take(self, sequence: int) -> Optional[BusFrame]:
+        frame = self.bus.read(sequence)
+        if frame is not None:
+            self.dropped_frames += sequence - self.cursor - 1
+            self.cursor = sequence
+        return frame
+
+    def latest(self) -> Optional[BusFrame]:
+        """Frame mais recente ainda não lido (pula os intermediários), ou None."""
+
+        head = self.bus.write_sequence
+        if head <= self.cursor:
+            return None
+        return self._take(head)
+
+    def next(self) -> Optional[BusFrame]:
+        """Próximo frame em ordem; se o cursor ficou para trás do anel, salta para o mais antigo válido."""
+
+        head = self.bus.write_sequence
+        if head <= self.cursor:
+            return None
+        # O slot seguinte ao mais recente pode estar sendo sobrescrito agora.
+        oldest = max(1, head - self.bus.slots + 2)
+        for sequence in range(max(self.cursor + 1, oldest), head + 1):
+            frame = self._take(sequence)
+            if frame is not None:
+                return frame
+        return None
+
+    def wait(self, timeout: Optional[float] = None, latest: bool = True, poll_interval: float = 0.001) -> Optional[BusFrame]:
+        """Espera (por polling) um frame novo; `latest=False` mantém a ordem com `next()`."""
+
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        while True:
+            frame = self.latest() if latest else self.next()
+            if frame is not None:
+                return frame
+            if deadline is not None and time.perf_counter() >= deadline:
+                return None
+            time.sleep(poll_interval)
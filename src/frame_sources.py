@@ -0,0 +1,480 @@
+"""
+Frame Sources Module
+Fontes de frames que substituem a webcam: vídeo, sequência de imagens ou dump `.npy`,
+com ritmo em tempo real ou o mais rápido possível, e o gravador de sessões
+
+As fontes imitam a parte do `cv2.VideoCapture` que o CameraDetector usa (`isOpened`,
+`read(image=...)`, `grab`, `set`, `get`, `release`) e entram no lugar da câmera via
+`CameraDetector(capture_factory=...)`. Os frames gravados ficam em BGR, como saem da
+câmera, para que o replay passe pela mesma conversão de cor do caminho ao vivo.
+
+Author: Renato Castellani
+Version: 1.0.0
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from abc import ABC, abstractmethod
+from enum import Enum
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import cv2
+import numpy as np
+
+from frame_types import ColorFormat, convert_color, npy_header
+
+PathLike = Union[str, Path]
+
+IMAGE_SUFFIXES = (".png", ".jpg", ".jpeg", ".bmp", ".tif", ".tiff")
+SESSION_METADATA = "session.json"
+
+
+class Pacing(Enum):
+    REALTIME = "realtime"  # entrega cada frame no seu instante original, como uma câmera
+    FAST = "fast"  # o mais rápido possível, sem descartar nada
+
+
+def metadata_path(path: PathLike) -> Path:
+    """Arquivo lateral com fps, instantes e rótulos da sessão (`x.npy` → `x.json`)."""
+
+    path = Path(path)
+    if path.is_dir() or not path.suffix:
+        return path / SESSION_METADATA
+    return path.with_suffix(".json")
+
+
+def load_metadata(path: PathLike) -> Dict[str, object]:
+    sidecar = metadata_path(path)
+    if not sidecar.exists():
+        return {}
+    return json.loads(sidecar.read_text(encoding="utf-8"))
+
+
+def expand_labels(segments: Sequence[Sequence[object]], frame_count: int) -> List[Optional[str]]:
+    """Converte segmentos `[[frame_inicial, rótulo], ...]` num rótulo por frame."""
+
+    labels: List[Optional[str]] = [None] * frame_count
+    ordered = sorted((int(start), label) for start, label in segments)
+    for idx, (start, label) in enumerate(ordered):
+        stop = ordered[idx + 1][0] if idx + 1 < len(ordered) else frame_count
+        labels[start:stop] = [label] * max(0, min(stop, frame_count) - start)  # type: ignore[list-item]
+    return labels
+
+
+class FrameSource(ABC):
+    """Base das fontes gravadas; subclasses implementam `_load` (e `_skip`/`_rewind` se sequenciais).
+
+    Em `Pacing.REALTIME` cada frame só é entregue no seu instante (fps ou instantes
+    gravados, divididos por `speed`) e, como numa câmera, frames que o consumidor não
+    leu a tempo são descartados (`dropped_frames`). `Pacing.FAST` entrega todos, sem espera.
+    """
+
+    def __init__(
+        self,
+        fps: float = 30.0,
+        timestamps: Optional[Sequence[float]] = None,
+        pacing: Pacing = Pacing.REALTIME,
+        loop: bool = False,
+        speed: float = 1.0,
+    ) -> None:
+        if fps <= 0 or speed <= 0:
+            raise ValueError("fps e speed precisam ser positivos")
+        self.fps = fps
+        self.pacing = pacing
+        self.loop = loop
+        self.speed = speed
+        self.position = 0
+        self.dropped_frames = 0
+        self._opened = True
+        self._clock_start: Optional[float] = None
+        self._timestamps: Optional[np.ndarray] = None
+        if timestamps is not None and len(timestamps):
+            stamps = np.asarray(timestamps, dtype=np.float64)
+            self._timestamps = stamps - stamps[0]
+
+    # --- Interface que as subclasses implementam -------------------------------------
+
+    @property
+    @abstractmethod
+    def frame_count(self) -> int:
+        """Total de frames da gravação."""
+
+    @property
+    @abstractmethod
+    def frame_shape(self) -> Tuple[int, ...]:
+        """Formato de um frame, `(H, W[, C])`."""
+
+    @abstractmethod
+    def _load(self, index: int, image: Optional[np.ndarray]) -> Optional[np.ndarray]:
+        """Decodifica o frame `index`, em `image` se o formato bater; None se falhar."""
+
+    def _skip(self, index: int) -> None:
+        """Avança sem decodificar (fontes de acesso aleatório não precisam fazer nada)."""
+
+    def _rewind(self) -> None:
+        """Volta ao primeiro frame (fontes sequenciais reabrem o arquivo)."""
+
+    def _close(self) -> None:
+        pass
+
+    # --- Ritmo ------------------------------------------------------------------------
+
+    def frame_time(self, index: int) -> float:
+        """Instante do frame relativo ao início da sessão, em segundos de gravação."""
+
+        stamps = self._timestamps
+        if stamps is not None and index < len(stamps):
+            return float(stamps[index])
+        return index / self.fps
+
+    @property
+    def duration(self) -> float:
+        return self.frame_time(self.frame_count - 1) + 1.0 / self.fps if self.frame_count else 0.0
+
+    def _due(self, index: int) -> float:
+        return self._clock_start + self.frame_time(index) / self.speed  # type: ignore[operator]
+
+    def _next_index(self) -> Optional[int]:
+        if self.position >= self.frame_count:
+            if not self.loop or self.frame_count == 0:
+                return None
+            if self._clock_start is not None:
+                self._clock_start += self.duration / self.speed
+            self.position = 0
+            self._rewind()
+
+        if self.pacing is Pacing.FAST:
+            return self.position
+
+        now = time.perf_counter()
+        if self._clock_start is None:
+            self._clock_start = now - self.frame_time(self.position) / self.speed
+        due = self._due(self.position)
+        if now < due:
+            time.sleep(due - now)
+            return self.position
+
+        # Atrasado: como uma câmera, pula direto para o frame mais novo já disponível.
+        while self.position + 1 < self.frame_count and self._due(self.position + 1) <= now:
+            self._skip(self.position)
+            self.position += 1
+            self.dropped_frames += 1
+        return self.position
+
+    # --- Interface compatível com cv2.VideoCapture -------------------------------------
+
+    def isOpened(self) -> bool:  # noqa: N802 - mesmo nome do cv2.VideoCapture
+        return self._opened
+
+    def read(self, image: Optional[np.ndarray] = None) -> Tuple[bool, Optional[np.ndarray]]:
+        if not self._opened:
+            return False, None
+        index = self._next_index()
+        if index is None:
+            return False, None
+        frame = self._load(index, image)
+        if frame is None:
+            return False, None
+        self.position = index + 1
+        return True, frame
+
+    def grab(self) -> bool:
+        index = self._next_index()
+        if index is None:
+            return False
+        self._skip(index)
+        self.position = index + 1
+        return True
+
+    def set(self, prop: int, value: float) -> bool:
+        if prop == cv2.CAP_PROP_POS_FRAMES:
+            self.seek(int(value))
+            return True
+        # Resolução e FPS vêm da gravação; o anel do CameraDetector se ajusta ao formato real.
+        return False
+
+    def get(self, prop: int) -> float:
+        if prop == cv2.CAP_PROP_FPS:
+            return float(self.fps)
+        if prop == cv2.CAP_PROP_FRAME_COUNT:
+            return float(self.frame_count)
+        if prop == cv2.CAP_PROP_POS_FRAMES:
+            return float(self.position)
+        if prop == cv2.CAP_PROP_FRAME_WIDTH:
+            return float(self.frame_shape[1])
+        if prop == cv2.CAP_PROP_FRAME_HEIGHT:
+            return float(self.frame_shape[0])
+        return 0.0
+
+    def seek(self, index: int) -> None:
+        self._rewind()
+        self.position = 0
+        for skipped in range(max(0, min(index, self.frame_count))):
+            self._skip(skipped)
+            self.position += 1
+        self._clock_start = None
+
+    def release(self) -> None:
+        if self._opened:
+            self._opened = False
+            self._close()
+
+
+class NpyFrameSource(FrameSource):
+    """Dump `(T, H, W[, C])` uint8 lido por memmap: acesso aleatório, sem decodificação."""
+
+    def __init__(self, path: PathLike, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.path = Path(path)
+        self._frames = np.load(self.path, mmap_mode="r")
+        if self._frames.ndim not in (3, 4) or self._frames.dtype != np.uint8:
+            raise ValueError(f"{self.path}: esperado array uint8 (T, H, W[, C]), obtido {self._frames.shape}")
+
+    @property
+    def frame_count(self) -> int:
+        return len(self._frames)
+
+    @property
+    def frame_shape(self) -> Tuple[int, ...]:
+        return self._frames.shape[1:]
+
+    def _load(self, index: int, image: Optional[np.ndarray]) -> Optional[np.ndarray]:
+        frame = self._frames[index]
+        if image is not None and image.shape == frame.shape:
+            np.copyto(image, frame)
+            return image
+        return np.array(frame)
+
+    def _close(self) -> None:
+        self._frames = self._frames[:0]
+
+
+class ImageSequenceSource(FrameSource):
+    """Diretório (ou lista) de imagens em ordem alfabética."""
+
+    def __init__(self, paths: Union[PathLike, Sequence[PathLike]], **kwargs) -> None:
+        super().__init__(**kwargs)
+        if isinstance(paths, (str, Path)):
+            directory = Path(paths)
+            paths = sorted(p for p in directory.iterdir() if p.suffix.lower() in IMAGE_SUFFIXES)
+        self.paths = [Path(p) for p in paths]
+        if not self.paths:
+            raise ValueError("Sequência de imagens vazia")
+        first = cv2.imread(str(self.paths[0]), cv2.IMREAD_COLOR)
+        if first is None:
+            raise ValueError(f"Não foi possível ler {self.paths[0]}")
+        self._shape = first.shape
+
+    @property
+    def frame_count(self) -> int:
+        return len(self.paths)
+
+    @property
+    def frame_shape(self) -> Tuple[int, ...]:
+        return self._shape
+
+    def _load(self, index: int, image: Optional[np.ndarray]) -> Optional[np.ndarray]:
+        frame = cv2.imread(str(self.paths[index]), cv2.IMREAD_COLOR)
+        if frame is None:
+            return None
+        if image is not None and image.shape == frame.shape:
+            np.copyto(image, frame)
+            return image
+        return frame
+
+
+class VideoFileSource(FrameSource):
+    """Arquivo de vídeo decodificado em sequência pelo OpenCV; descartes usam `grab()`."""
+
+    def __init__(self, path: PathLike, fps: Optional[float] = None, **kwargs) -> None:
+        self.path = Path(path)
+        self._capture = cv2.VideoCapture(str(self.path))
+        if not self._capture.isOpened():
+            raise ValueError(f"Não foi possível abrir o vídeo {self.path}")
+        file_fps = self._capture.get(cv2.CAP_PROP_FPS)
+        super().__init__(fps=fps or file_fps or 30.0, **kwargs)
+        self._count = int(self._capture.get(cv2.CAP_PROP_FRAME_COUNT))
+        self._shape = (
+            int(self._capture.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+            int(self._capture.get(cv2.CAP_PROP_FRAME_WIDTH)),
+            3,
+        )
+        self._decoded = 0  # próximo frame que o decodificador entregará
+
+    @property
+    def frame_count(self) -> int:
+        return self._count
+
+    @property
+    def frame_shape(self) -> Tuple[int, ...]:
+        return self._shape
+
+    def _load(self, index: int, image: Optional[np.ndarray]) -> Optional[np.ndarray]:
+        ret, frame = self._capture.read(image=image) if image is not None else self._capture.read()
+        if not ret:
+            # O FRAME_COUNT do container pode ser otimista: o fim real é onde a leitura falha.
+            self._count = index
+            return None
+        self._decoded = index + 1
+        return frame
+
+    def _skip(self, index: int) -> None:
+        if self._capture.grab():
+            self._decoded = index + 1
+
+    def _rewind(self) -> None:
+        if self._decoded:
+            self._capture.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            self._decoded = 0
+
+    def _close(self) -> None:
+        self._capture.release()
+
+
+def open_frame_source(
+    path: PathLike,
+    pacing: Pacing = Pacing.REALTIME,
+    loop: bool = False,
+    speed: float = 1.0,
+    fps: Optional[float] = None,
+) -> FrameSource:
+    """Abre a fonte conforme o caminho: diretório → imagens, `.npy` → dump, senão vídeo.
+
+    Fps e instantes gravados vêm do arquivo lateral da sessão, se existir.
+    """
+
+    path = Path(path)
+    if not path.exists():
+        raise FileNotFoundError(path)
+    metadata = load_metadata(path)
+    options = {
+        "pacing": pacing,
+        "loop": loop,
+        "speed": speed,
+        "timestamps": metadata.get("timestamps"),
+    }
+    fps = fps or metadata.get("fps")  # type: ignore[assignment]
+
+    if path.is_dir():
+        return ImageSequenceSource(path, fps=fps or 30.0, **options)
+    if path.suffix.lower() == ".npy":
+        return NpyFrameSource(path, fps=fps or 30.0, **options)
+    return VideoFileSource(path, fps=fps, **options)
+
+
+class SessionRecorder:
+    """Grava uma sessão para replay: `.npy` (sem perdas), vídeo (`.mp4`/`.avi`) ou diretório de PNGs.
+
+    Junto vai um arquivo lateral JSON com fps, instante de cada frame e os rótulos de
+    gesto marcados com `mark()` (usados para medir a acurácia no replay).
+    """
+
+    VIDEO_CODECS = {".mp4": "mp4v", ".avi": "MJPG", ".mkv": "MJPG"}
+
+    def __init__(
+        self,
+        path: PathLike,
+        fps: float = 30.0,
+        color_format: ColorFormat = ColorFormat.RGB,
+        label: Optional[str] = None,
+    ) -> None:
+        self.path = Path(path)
+        self.fps = fps
+        self.color_format = color_format
+        self.frames_written = 0
+        self._timestamps: List[float] = []
+        self._labels: List[List[object]] = []
+        self._bgr: Optional[np.ndarray] = None
+        self._shape: Optional[Tuple[int, ...]] = None
+        self._raw = None
+        self._writer: Optional[cv2.VideoWriter] = None
+        self._closed = False
+
+        suffix = self.path.suffix.lower()
+        if suffix == ".npy":
+            self._kind = "npy"
+            # Os frames vão direto para o arquivo final; o formato só entra no cabeçalho no fim.
+            self._raw = open(self.path, "wb")
+            self._raw.write(npy_header("|u1", (0,)))
+        elif suffix in self.VIDEO_CODECS:
+            self._kind = "video"
+        elif not suffix:
+            self._kind = "images"
+            self.path.mkdir(parents=True, exist_ok=True)
+        else:
+            raise ValueError(f"Formato de gravação não suportado: {self.path.suffix}")
+        if label is not None:
+            self.mark(label)
+
+    def mark(self, label: Optional[str]) -> None:
+        """Rotula os frames seguintes (ex.: "fist"); None marca trechos sem gesto esperado."""
+
+        self._labels.append([self.frames_written, label])
+
+    def write(self, frame: np.ndarray, timestamp: Optional[float] = None) -> None:
+        if self._closed:
+            raise RuntimeError("Gravação já encerrada")
+        if self._shape is None:
+            self._shape = frame.shape
+        elif frame.shape != self._shape:
+            raise ValueError(f"Frame {frame.shape} difere do formato da sessão {self._shape}")
+
+        bgr = frame
+        if self.color_format is not ColorFormat.BGR:
+            if self._bgr is None:
+                self._bgr = np.empty(frame.shape[:2] + (3,), dtype=np.uint8)
+            bgr = convert_color(frame, self.color_format, ColorFormat.BGR, dst=self._bgr)
+
+        if self._kind == "npy":
+            self._raw.write(np.ascontiguousarray(bgr).data)  # type: ignore[union-attr]
+        elif self._kind == "video":
+            if self._writer is None:
+                height, width = bgr.shape[:2]
+                fourcc = cv2.VideoWriter_fourcc(*self.VIDEO_CODECS[self.path.suffix.lower()])
+                self._writer = cv2.VideoWriter(str(self.path), fourcc, self.fps, (width, height))
+            self._writer.write(bgr)
+        else:
+            cv2.imwrite(str(self.path / f"{self.frames_written:06d}.png"), bgr)
+
+        self._timestamps.append(time.perf_counter() if timestamp is None else timestamp)
+        self.frames_written += 1
+
+    def close(self) -> Path:
+        if self._closed:
+            return self.path
+        self._closed = True
+        if self._kind == "npy":
+            self._finish_npy()
+        elif self._writer is not None:
+            self._writer.release()
+
+        start = self._timestamps[0] if self._timestamps else 0.0
+        metadata = {
+            "fps": self.fps,
+            "frames": self.frames_written,
+            "color_format": ColorFormat.BGR.value,
+            "frame_shape": list(self._bgr.shape if self._bgr is not None else self._shape or ()),
+            "recorded_at": time.time(),
+            "timestamps": [round(stamp - start, 6) for stamp in self._timestamps],
+            "labels": self._labels,
+        }
+        metadata_path(self.path).write_text(json.dumps(metadata), encoding="utf-8")
+        return self.path
+
+    def _finish_npy(self) -> None:
+        """Reescreve no lugar o cabeçalho reservado na abertura, agora com o formato final."""
+
+        raw = self._raw
+        shape = (self.frames_written,) + tuple(self._bgr.shape if self._bgr is not None else self._shape or (0, 0, 3))
+        raw.seek(0)  # type: ignore[union-attr]
+        raw.write(npy_header("|u1", shape))  # type: ignore[union-attr]
+        raw.close()  # type: ignore[union-attr]
+
+    def __enter__(self) -> "SessionRecorder":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,114 @@
+"""
+Frame Types Module
+Descritores de frame compartilhados entre captura, reconhecimento e interfaces
+
+Author: Renato Castellani
+Version: 1.0.0
+"""
+
+from __future__ import annotations
+
+import struct
+from dataclasses import dataclass
+from enum import Enum
+from typing import Dict, Optional, Tuple
+
+import cv2
+import numpy as np
+
+
+class ColorFormat(Enum):
+    BGR = "bgr"
+    RGB = "rgb"
+    YUV = "yuv"
+    GRAY = "gray"
+
+    @property
+    def channels(self) -> int:
+        return 1 if self is ColorFormat.GRAY else 3
+
+
+_CONVERSION_CODES: Dict[Tuple[ColorFormat, ColorFormat], int] = {
+    (ColorFormat.BGR, ColorFormat.RGB): cv2.COLOR_BGR2RGB,
+    (ColorFormat.BGR, ColorFormat.YUV): cv2.COLOR_BGR2YUV,
+    (ColorFormat.BGR, ColorFormat.GRAY): cv2.COLOR_BGR2GRAY,
+    (ColorFormat.RGB, ColorFormat.BGR): cv2.COLOR_RGB2BGR,
+    (ColorFormat.RGB, ColorFormat.YUV): cv2.COLOR_RGB2YUV,
+    (ColorFormat.RGB, ColorFormat.GRAY): cv2.COLOR_RGB2GRAY,
+    (ColorFormat.YUV, ColorFormat.BGR): cv2.COLOR_YUV2BGR,
+    (ColorFormat.YUV, ColorFormat.RGB): cv2.COLOR_YUV2RGB,
+    (ColorFormat.GRAY, ColorFormat.BGR): cv2.COLOR_GRAY2BGR,
+    (ColorFormat.GRAY, ColorFormat.RGB): cv2.COLOR_GRAY2RGB,
+}
+
+
+def converted_shape(shape: Tuple[int, ...], target: ColorFormat) -> Tuple[int, ...]:
+    """Formato do array resultante ao converter uma imagem de `shape` para `target`."""
+
+    height, width = shape[:2]
+    if target is ColorFormat.GRAY:
+        return (height, width)
+    return (height, width, 3)
+
+
+def convert_color(
+    image: np.ndarray,
+    source: ColorFormat,
+    target: ColorFormat,
+    dst: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """Converte `image` para `target`; devolve a própria imagem quando já está no formato.
+
+    Se `dst` for informado (com o formato correto) a conversão é feita nele, sem alocação.
+    """
+
+    if source is target:
+        return image
+
+    if source is ColorFormat.YUV and target is ColorFormat.GRAY:
+        # O canal Y já é a luminância: basta uma view, sem conversão.
+        return image[:, :, 0]
+
+    code = _CONVERSION_CODES.get((source, target))
+    if code is None:
+        raise ValueError(f"Conversão de cor não suportada: {source.name} → {target.name}")
+
+    if dst is not None:
+        return cv2.cvtColor(image, code, dst=dst)
+    return cv2.cvtColor(image, code)
+
+
+_NPY_MAGIC = b"\x93NUMPY\x01\x00"
+_NPY_PREFIX = len(_NPY_MAGIC) + 2  # magic + versão + comprimento do cabeçalho (uint16)
+
+
+def npy_header(descr: object, shape: Tuple[int, ...], max_dims: int = 4) -> bytes:
+    """Cabeçalho `.npy` v1.0 de tamanho fixo para `descr` e até `max_dims` dimensões.
+
+    O tamanho não depende de `shape`: gravadores reservam o cabeçalho ao abrir o arquivo,
+    escrevem os dados crus em seguida e reescrevem só o cabeçalho no lugar.
+    """
+
+    def text(dims: Tuple[int, ...]) -> str:
+        return f"{{'descr': {descr!r}, 'fortran_order': False, 'shape': {dims!r}, }}"
+
+    widest = text((2 ** 63,) * max_dims)
+    size = -(-(_NPY_PREFIX + len(widest) + 1) // 64) * 64
+    body = text(tuple(shape)).ljust(size - _NPY_PREFIX - 1) + "\n"
+    return _NPY_MAGIC + struct.pack("<H", size - _NPY_PREFIX) + body.encode("latin1")
+
+
+@dataclass
+class CapturedFrame:
+    """Frame capturado junto com o instante de captura, a sequência e o formato de cor."""
+
+    image: np.ndarray
+    timestamp: float  # time.perf_counter() no momento da leitura
+    sequence: int
+    slot: int = -1  # posição no FrameRing que contém os buffers do frame
+    color_format: ColorFormat = ColorFormat.RGB
+
+    def as_format(self, target: ColorFormat, dst: Optional[np.ndarray] = None) -> np.ndarray:
+        """Retorna a imagem em `target`, convertendo apenas se necessário."""
+
+        return convert_color(self.image, self.color_format, target, dst=dst)
@@ -6,84 +6,168 @@ Author: Renato Castellani
 Version: 1.0.0
 """
 
-import pygame
-from typing import Dict, List
-from enum import Enum
-from .gesture_recognizer import GestureType, HandPosition
+import time
+from typing import Dict, List, Optional, Set, Tuple
 
-# TODO: Implementar simulação de gamepad
+from gesture_mapping import GestureMappingEngine, MappingProfile, default_profile
+from hand_filters import HandMotionTracker
+from hand_landmarks import HandPosition
+from instrumentation import PipelineMetrics, Stage
+from virtual_gamepad import GamepadButton, create_virtual_gamepad
 
-class GamepadButton(Enum):
-    """
-    Botões do gamepad
-    """
-    A = "A"
-    B = "B"
-    X = "X"
-    Y = "Y"
-    LB = "LB"
-    RB = "RB"
-    LT = "LT"
-    RT = "RT"
-    START = "START"
-    SELECT = "SELECT"
-    DPAD_UP = "DPAD_UP"
-    DPAD_DOWN = "DPAD_DOWN"
-    DPAD_LEFT = "DPAD_LEFT"
-    DPAD_RIGHT = "DPAD_RIGHT"
-    LEFT_STICK = "LEFT_STICK"
-    RIGHT_STICK = "RIGHT_STICK"
 
 class GamepadController:
     """
     Classe responsável por simular comandos de gamepad
     """
     
-    def __init__(self):
-        # TODO: Inicializar pygame e mapeamento de gestos
-        self.gesture_mapping = self._create_default_mapping()
+    def __init__(self, backend=None, profile: Optional[MappingProfile] = None):
+        """
+        Args:
+            backend: Gamepad virtual (ex.: virtual_gamepad.UInputGamepad). Se None,
+                os comandos são apenas registrados no estado e não chegam ao sistema.
+            profile: Perfil de mapeamento; None usa o perfil padrão
+        """
+        self.backend = backend
+        self.mapping = GestureMappingEngine(profile or self._create_default_mapping())
+        # Filtra a posição das mãos usadas como analógico (menos tremor, latência compensada).
+        self.motion_tracker = HandMotionTracker()
+        self._held_buttons: Set[GamepadButton] = set()
+        self._stick_values: Dict[str, Tuple[float, float]] = {}
+        self.metrics: Optional[PipelineMetrics] = None
+
+    @classmethod
+    def create_virtual(cls, profile: Optional[MappingProfile] = None) -> "GamepadController":
+        """
+        Cria um controlador ligado ao gamepad virtual do sistema (uinput no Linux),
+        ou sem backend quando ele não estiver disponível
+        """
+        return cls(create_virtual_gamepad(), profile)
     
-    def _create_default_mapping(self) -> Dict[GestureType, GamepadButton]:
+    def _create_default_mapping(self) -> MappingProfile:
         """
         Cria mapeamento padrão de gestos para botões do gamepad
         
         Returns:
-            Dict[GestureType, GamepadButton]: Mapeamento de gestos
+            MappingProfile: Perfil de mapeamento padrão
+        """
+        return default_profile()
+
+    def set_profile(self, profile: MappingProfile):
         """
-        # TODO: Implementar mapeamento padrão
-        return {}
+        Troca o perfil de mapeamento (a tabela de despacho é recompilada uma vez)
+        
+        Args:
+            profile: Novo perfil
+        """
+        if profile is self.mapping.profile:
+            return
+        self.release_all()
+        self.mapping.set_profile(profile)
     
-    def process_gestures(self, hands: List[HandPosition]):
+    def process_gestures(self, hands: List[HandPosition], timestamp: Optional[float] = None):
         """
         Processa lista de mãos detectadas e executa comandos correspondentes
         
         Args:
             hands: Lista de posições de mãos detectadas
+            timestamp: Instante do frame (time.perf_counter); None usa o instante atual
+        """
+        started = time.perf_counter()
+        if timestamp is None:
+            timestamp = started
+
+        mapping = self.mapping
+        positions = None
+        if mapping.compiled.sticks:
+            self.motion_tracker.update(hands, timestamp)
+            positions = self._predicted_position
+        mapping.update(hands, timestamp, positions)
+        metrics = self.metrics
+        if metrics is not None:
+            started = metrics.record_since(Stage.MAPPING, started)
+
+        for button in mapping.compiled.buttons:
+            pressed = mapping.is_pressed(button)
+            if pressed == (button in self._held_buttons):
+                continue
+            if pressed:
+                self._held_buttons.add(button)
+                self.send_button_press(button, flush=False)
+            else:
+                self._held_buttons.discard(button)
+                self.send_button_release(button, flush=False)
+        for stick, value in mapping.stick_values.items():
+            if self._stick_values.get(stick) != value:
+                self._stick_values[stick] = value
+                self.send_analog_stick(stick, value[0], value[1], flush=False)
+        # Todas as mudanças do frame saem juntas, num único SYN_REPORT.
+        self.flush()
+        if metrics is not None:
+            metrics.record_since(Stage.GAMEPAD_EMIT, started)
+
+    def _predicted_position(self, hand: HandPosition):
+        return self.motion_tracker.predicted_centroid(hand.handedness)
+
+    def flush(self) -> int:
+        """
+        Envia ao sistema as mudanças pendentes
+
+        Returns:
+            int: Número de eventos escritos
+        """
+        if self.backend is None:
+            return 0
+        return self.backend.flush()
+
+    def release_all(self):
+        """
+        Solta todos os botões e centraliza os analógicos
+        """
+        self._held_buttons.clear()
+        self._stick_values.clear()
+        self.mapping.reset()
+        if self.backend is not None:
+            self.backend.reset()
+
+    def close(self):
+        """
+        Solta tudo e fecha o dispositivo virtual
         """
-        # TODO: Implementar processamento de gestos
-        pass
+        self.release_all()
+        if self.backend is not None:
+            self.backend.close()
+            self.backend = None
     
-    def send_button_press(self, button: GamepadButton):
+    def send_button_press(self, button: GamepadButton, flush: bool = True):
         """
         Simula pressionar um botão do gamepad
         
         Args:
             button: Botão a ser pressionado
+            flush: Se False, a mudança fica pendente até o próximo flush()
         """
-        # TODO: Implementar simulação de botão
-        pass
+        if self.backend is None:
+            return
+        self.backend.set_button(button, True)
+        if flush:
+            self.backend.flush()
     
-    def send_button_release(self, button: GamepadButton):
+    def send_button_release(self, button: GamepadButton, flush: bool = True):
         """
         Simula soltar um botão do gamepad
         
         Args:
             button: Botão a ser solto
+            flush: Se False, a mudança fica pendente até o próximo flush()
         """
-        # TODO: Implementar liberação de botão
-        pass
+        if self.backend is None:
+            return
+        self.backend.set_button(button, False)
+        if flush:
+            self.backend.flush()
     
-    def send_analog_stick(self, stick: str, x: float, y: float):
+    def send_analog_stick(self, stick: str, x: float, y: float, flush: bool = True):
         """
         Simula movimento do analógico
         
@@ -91,6 +175,10 @@ class GamepadController:
             stick: "left" ou "right"
             x: Posição X (-1.0 a 1.0)
             y: Posição Y (-1.0 a 1.0)
+            flush: Se False, a mudança fica pendente até o próximo flush()
         """
-        # TODO: Implementar movimento do analógico
-        pass
+        if self.backend is None:
+            return
+        self.backend.set_stick(stick, x, y)
+        if flush:
+            self.backend.flush()
@@ -0,0 +1,259 @@
+"""
+Gesture Mapping Module
+Perfis de mapeamento gesto → gamepad, compilados numa tabela de despacho indexada
+por (mão, código do gesto)
+
+Author: Renato Castellani
+Version: 1.0.0
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from hand_landmarks import GESTURE_CODES, GESTURES_BY_CODE, GestureType
+from virtual_gamepad import GamepadButton
+
+# Linhas da tabela: mesma ordem de handedness_code + 1 (esquerda, desconhecida, direita).
+HAND_SLOTS = ("left", "unknown", "right")
+_SLOT_BY_LABEL = {"Left": 0, "left": 0, "Right": 2, "right": 2}
+_UNKNOWN_SLOT = 1
+_BUTTONS = tuple(GamepadButton)
+_BUTTON_INDEX = {button: idx for idx, button in enumerate(_BUTTONS)}
+
+
+class ActionMode(Enum):
+    PRESS = "press"    # toque de um frame na entrada do gesto
+    HOLD = "hold"      # pressionado enquanto o gesto durar
+    TOGGLE = "toggle"  # cada entrada do gesto alterna o botão
+    TURBO = "turbo"    # pressiona/solta em `turbo_hz` enquanto o gesto durar
+
+
+@dataclass
+class StickRegion:
+    """Região da imagem (coordenadas normalizadas) que vira deflexão do analógico."""
+
+    stick: str = "left"
+    center: Tuple[float, float] = (0.5, 0.5)
+    radius: float = 0.2
+    deadzone: float = 0.1
+    invert_x: bool = False
+
+    def deflection(self, x: float, y: float) -> Tuple[float, float]:
+        dx = (x - self.center[0]) / self.radius
+        dy = (self.center[1] - y) / self.radius  # imagem cresce para baixo, analógico para cima
+        if self.invert_x:
+            dx = -dx
+        magnitude = math.hypot(dx, dy)
+        if magnitude <= self.deadzone:
+            return 0.0, 0.0
+        # Zona morta radial com reescala, para a deflexão começar em 0 na borda dela.
+        scale = min(magnitude, 1.0)
+        scale = (scale - self.deadzone) / (1.0 - self.deadzone) / magnitude
+        return dx * scale, dy * scale
+
+
+@dataclass
+class GestureBinding:
+    gesture: GestureType
+    button: Optional[GamepadButton] = None
+    mode: ActionMode = ActionMode.HOLD
+    hand: str = "any"  # "any", "left", "right"
+    turbo_hz: float = 10.0
+    stick: Optional[StickRegion] = None
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "GestureBinding":
+        stick = data.get("stick")
+        return cls(
+            gesture=GestureType(data["gesture"]),
+            button=GamepadButton(data["button"]) if data.get("button") else None,
+            mode=ActionMode(data.get("mode", ActionMode.HOLD.value)),
+            hand=data.get("hand", "any"),
+            turbo_hz=float(data.get("turbo_hz", 10.0)),
+            stick=StickRegion(**{**stick, "center": tuple(stick.get("center", (0.5, 0.5)))}) if stick else None,
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        data: Dict[str, Any] = {"gesture": self.gesture.value, "mode": self.mode.value, "hand": self.hand}
+        if self.button is not None:
+            data["button"] = self.button.value
+        if self.mode is ActionMode.TURBO:
+            data["turbo_hz"] = self.turbo_hz
+        if self.stick is not None:
+            data["stick"] = {
+                "stick": self.stick.stick,
+                "center": list(self.stick.center),
+                "radius": self.stick.radius,
+                "deadzone": self.stick.deadzone,
+                "invert_x": self.stick.invert_x,
+            }
+        return data
+
+
+@dataclass
+class MappingProfile:
+    name: str
+    bindings: List[GestureBinding] = field(default_factory=list)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "MappingProfile":
+        return cls(
+            name=data.get("name", "custom"),
+            bindings=[GestureBinding.from_dict(item) for item in data.get("bindings", [])],
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"name": self.name, "bindings": [binding.to_dict() for binding in self.bindings]}
+
+
+def default_profile() -> MappingProfile:
+    """Mesmos comandos anunciados na interface: A, B, analógico e Start."""
+
+    return MappingProfile(
+        name="padrão",
+        bindings=[
+            GestureBinding(GestureType.FIST, GamepadButton.A),
+            GestureBinding(GestureType.OPEN_HAND, GamepadButton.B),
+            GestureBinding(GestureType.POINTING, stick=StickRegion("left")),
+            GestureBinding(GestureType.THUMBS_UP, GamepadButton.START, ActionMode.PRESS),
+        ],
+    )
+
+
+class CompiledMapping:
+    """Perfil pré-processado: tabela [mão][código do gesto] → índice do binding (ou -1).
+
+    Bindings de mão específica têm prioridade sobre os de "any".
+    """
+
+    def __init__(self, profile: MappingProfile) -> None:
+        self.profile = profile
+        self.bindings: Tuple[GestureBinding, ...] = tuple(profile.bindings)
+        table = [[-1] * len(GESTURES_BY_CODE) for _ in HAND_SLOTS]
+
+        for idx, binding in enumerate(self.bindings):
+            if binding.hand != "any":
+                continue
+            for row in table:
+                row[GESTURE_CODES[binding.gesture]] = idx
+        for idx, binding in enumerate(self.bindings):
+            if binding.hand == "any":
+                continue
+            if binding.hand not in HAND_SLOTS:
+                raise ValueError(f"Mão desconhecida no binding: {binding.hand}")
+            table[HAND_SLOTS.index(binding.hand)][GESTURE_CODES[binding.gesture]] = idx
+
+        self.table: Tuple[Tuple[int, ...], ...] = tuple(tuple(row) for row in table)
+        self.button_index: Tuple[int, ...] = tuple(
+            _BUTTON_INDEX[binding.button] if binding.button is not None else -1 for binding in self.bindings
+        )
+        self.buttons: Tuple[GamepadButton, ...] = tuple(
+            sorted({binding.button for binding in self.bindings if binding.button is not None}, key=_BUTTON_INDEX.get)
+        )
+        self.sticks: Tuple[str, ...] = tuple(
+            sorted({binding.stick.stick for binding in self.bindings if binding.stick is not None})
+        )
+
+    def lookup(self, handedness: str, gesture: GestureType) -> int:
+        return self.table[_SLOT_BY_LABEL.get(handedness, _UNKNOWN_SLOT)][GESTURE_CODES[gesture]]
+
+
+class GestureMappingEngine:
+    """Estado de execução de um perfil compilado.
+
+    `update` faz uma consulta na tabela por mão e devolve o estado desejado dos botões e
+    analógicos; os buffers são reutilizados entre frames.
+    """
+
+    def __init__(self, profile: Optional[MappingProfile] = None) -> None:
+        self.compiled = CompiledMapping(profile or default_profile())
+        self._allocate()
+
+    @property
+    def profile(self) -> MappingProfile:
+        return self.compiled.profile
+
+    def set_profile(self, profile: MappingProfile) -> None:
+        """Recompila a tabela; só é necessário quando o perfil muda."""
+
+        if profile is self.compiled.profile:
+            return
+        self.compiled = CompiledMapping(profile)
+        self._allocate()
+
+    def _allocate(self) -> None:
+        count = len(self.compiled.bindings)
+        self._active = [False] * count
+        self._was_active = [False] * count
+        self._since = [0.0] * count
+        self._toggled = [False] * count
+        self._positions: List[Optional[Tuple[float, float]]] = [None] * count
+        self._demand = [False] * len(_BUTTONS)
+        self.stick_values: Dict[str, Tuple[float, float]] = {stick: (0.0, 0.0) for stick in self.compiled.sticks}
+
+    def reset(self) -> None:
+        self._allocate()
+
+    def is_pressed(self, button: GamepadButton) -> bool:
+        return self._demand[_BUTTON_INDEX[button]]
+
+    def update(self, hands: Sequence, timestamp: float, positions=None) -> None:
+        """Processa as mãos do frame.
+
+        Args:
+            hands: Objetos com `handedness`, `gesture`, `x` e `y`
+            timestamp: Instante do frame (segundos, relógio monotônico)
+            positions: Função opcional mão → (x, y) filtrado; None usa hand.x/hand.y
+        """
+
+        compiled = self.compiled
+        active, was_active = self._was_active, self._active
+        # Troca os buffers: o frame anterior vira `was_active`.
+        self._active, self._was_active = active, was_active
+        for idx in range(len(active)):
+            active[idx] = False
+
+        table = compiled.table
+        for hand in hands:
+            idx = table[_SLOT_BY_LABEL.get(hand.handedness, _UNKNOWN_SLOT)][GESTURE_CODES[hand.gesture]]
+            if idx < 0 or active[idx]:
+                continue
+            active[idx] = True
+            if compiled.bindings[idx].stick is not None:
+                position = positions(hand) if positions is not None else None
+                self._positions[idx] = position if position is not None else (hand.x, hand.y)
+
+        demand = self._demand
+        for button in compiled.buttons:
+            demand[_BUTTON_INDEX[button]] = False
+        for stick in compiled.sticks:
+            self.stick_values[stick] = (0.0, 0.0)
+
+        for idx, binding in enumerate(compiled.bindings):
+            is_active = active[idx]
+            entered = is_active and not was_active[idx]
+            if entered:
+                self._since[idx] = timestamp
+
+            if binding.button is not None:
+                mode = binding.mode
+                if mode is ActionMode.HOLD:
+                    pressed = is_active
+                elif mode is ActionMode.PRESS:
+                    pressed = entered
+                elif mode is ActionMode.TOGGLE:
+                    if entered:
+                        self._toggled[idx] = not self._toggled[idx]
+                    pressed = self._toggled[idx]
+                else:  # TURBO: metade do período pressionado, metade solto
+                    pressed = is_active and int((timestamp - self._since[idx]) * binding.turbo_hz * 2.0) % 2 == 0
+                if pressed:
+                    demand[compiled.button_index[idx]] = True
+
+            if is_active and binding.stick is not None:
+                x, y = self._positions[idx]  # type: ignore[misc]
+                self.stick_values[binding.stick.stick] = binding.stick.deflection(x, y)
@@ -2,31 +2,157 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from enum import Enum
-from typing import List
+import time
+from typing import List, Optional, Sequence, Tuple, Union
 
 import cv2
 import mediapipe as mp
 import numpy as np
 
+from frame_types import CapturedFrame, ColorFormat, convert_color
+from hand_landmarks import (
+    GESTURES_BY_CODE,
+    GestureType,
+    HandPosition,
+    classify_gestures,
+    hand_centroids,
+    handedness_code,
+    stack_landmarks,
+)
+from instrumentation import PipelineMetrics, Stage
+from landmark_recording import LandmarkRecorder
 
-class GestureType(Enum):
-    UNKNOWN = "unknown"
-    FIST = "fist"
-    OPEN_HAND = "open_hand"
-    POINTING = "pointing"
-    THUMBS_UP = "thumbs_up"
-    PEACE = "peace"
 
+CropBox = Tuple[int, int, int, int]  # x0, y0, x1, y1 em pixels
 
-@dataclass
-class HandPosition:
-    x: float
-    y: float
-    gesture: GestureType
-    score: float = 0.0
-    handedness: str = "Unknown"
+_UNCHANGED = object()
+
+
+class HandRoiTracker:
+    """Acompanha a caixa das mãos entre frames e prevê a próxima posição.
+
+    A previsão usa velocidade constante (deslocamento do centro entre os dois últimos
+    frames). A caixa prevista recebe uma margem e vira um recorte quadrado em pixels.
+    """
+
+    def __init__(
+        self,
+        padding: float = 0.35,
+        min_size: float = 0.2,
+        full_frame_interval: int = 30,
+        max_area_ratio: float = 0.6,
+    ) -> None:
+        self.padding = padding
+        self.min_size = min_size
+        self.full_frame_interval = full_frame_interval
+        self.max_area_ratio = max_area_ratio
+        self._center: Optional[Tuple[float, float]] = None
+        self._size = (0.0, 0.0)
+        self._velocity = (0.0, 0.0)
+        self._frames_since_full = 0
+
+    @property
+    def is_tracking(self) -> bool:
+        return self._center is not None
+
+    def reset(self) -> None:
+        self._center = None
+        self._velocity = (0.0, 0.0)
+
+    def mark_full_frame(self) -> None:
+        self._frames_since_full = 0
+
+    def update(self, x_min: float, y_min: float, x_max: float, y_max: float) -> None:
+        """Atualiza com a caixa (normalizada, frame completo) das mãos detectadas."""
+
+        center = ((x_min + x_max) / 2.0, (y_min + y_max) / 2.0)
+        if self._center is not None:
+            self._velocity = (center[0] - self._center[0], center[1] - self._center[1])
+        self._center = center
+        self._size = (x_max - x_min, y_max - y_min)
+
+    def next_crop(self, width: int, height: int) -> Optional[CropBox]:
+        """Recorte previsto para o próximo frame, ou None para buscar no frame completo."""
+
+        if self._center is None or self._frames_since_full >= self.full_frame_interval:
+            return None
+        self._frames_since_full += 1
+
+        cx = (self._center[0] + self._velocity[0]) * width
+        cy = (self._center[1] + self._velocity[1]) * height
+        side = max(self._size[0] * width, self._size[1] * height) * (1.0 + 2.0 * self.padding)
+        side = max(side, self.min_size * min(width, height))
+
+        half = side / 2.0
+        x0 = max(0, int(cx - half))
+        y0 = max(0, int(cy - half))
+        x1 = min(width, int(cx + half))
+        y1 = min(height, int(cy + half))
+        if x1 - x0 < 16 or y1 - y0 < 16:
+            return None
+        if (x1 - x0) * (y1 - y0) > self.max_area_ratio * width * height:
+            # Recorte quase do tamanho do frame: não compensa.
+            return None
+        return x0, y0, x1, y1
+
+
+class AdaptiveResolutionPolicy:
+    """Ajusta a altura de inferência conforme a latência medida por frame.
+
+    Desce um nível quando a média móvel passa do orçamento e sobe quando fica abaixo de
+    `headroom * budget_ms` por `patience` frames seguidos.
+    """
+
+    def __init__(
+        self,
+        levels: Sequence[int] = (720, 540, 480, 360, 270),
+        budget_ms: float = 25.0,
+        headroom: float = 0.6,
+        patience: int = 30,
+        smoothing: float = 0.2,
+        initial_height: Optional[int] = None,
+    ) -> None:
+        self.levels = sorted(levels, reverse=True)
+        self.budget_ms = budget_ms
+        self.headroom = headroom
+        self.patience = patience
+        self.smoothing = smoothing
+        start = initial_height if initial_height in self.levels else self.levels[len(self.levels) // 2]
+        self._level = self.levels.index(start)
+        self._average_ms: Optional[float] = None
+        self._fast_frames = 0
+
+    @property
+    def current_height(self) -> int:
+        return self.levels[self._level]
+
+    @property
+    def average_ms(self) -> float:
+        return self._average_ms or 0.0
+
+    def record(self, latency_ms: float) -> int:
+        """Registra a latência de um frame e retorna a altura para o próximo."""
+
+        if self._average_ms is None:
+            self._average_ms = latency_ms
+        else:
+            self._average_ms += self.smoothing * (latency_ms - self._average_ms)
+
+        if self._average_ms > self.budget_ms and self._level < len(self.levels) - 1:
+            self._change_level(+1)
+        elif self._average_ms < self.budget_ms * self.headroom and self._level > 0:
+            self._fast_frames += 1
+            if self._fast_frames >= self.patience:
+                self._change_level(-1)
+        else:
+            self._fast_frames = 0
+        return self.current_height
+
+    def _change_level(self, step: int) -> None:
+        self._level += step
+        self._fast_frames = 0
+        # Recomeça a média: a latência do novo nível ainda não é conhecida.
+        self._average_ms = None
 
 
 class GestureRecognizer:
@@ -37,111 +163,246 @@ class GestureRecognizer:
         max_num_hands: int = 1,
         min_detection_confidence: float = 0.5,
         min_tracking_confidence: float = 0.5,
+        roi_tracking: bool = False,
+        roi_padding: float = 0.35,
+        roi_full_frame_interval: int = 30,
+        inference_height: Optional[int] = 480,
+        adaptive_resolution: Optional[AdaptiveResolutionPolicy] = None,
+        model_complexity: int = 0,
     ) -> None:
         self._mp_hands = mp.solutions.hands
-        self._hands = self._mp_hands.Hands(
-            static_image_mode=False,
-            max_num_hands=max_num_hands,
-            model_complexity=0,
-            min_detection_confidence=min_detection_confidence,
-            min_tracking_confidence=min_tracking_confidence,
-        )
-
-    def detect_hands(self, frame: np.ndarray) -> List[HandPosition]:
+        self._hands_settings = {
+            "max_num_hands": max_num_hands,
+            "model_complexity": model_complexity,
+            "min_detection_confidence": min_detection_confidence,
+            "min_tracking_confidence": min_tracking_confidence,
+        }
+        self._hands = self._create_hands()
+        self._rgb_buffer: Optional[np.ndarray] = None
+        self._resize_buffer: Optional[np.ndarray] = None
+        self.roi_padding = roi_padding
+        self.roi_full_frame_interval = roi_full_frame_interval
+        self.inference_height = inference_height
+        self.adaptive_resolution = adaptive_resolution
+        if adaptive_resolution is not None:
+            self.inference_height = adaptive_resolution.current_height
+        self._roi_tracker: Optional[HandRoiTracker] = None
+        if roi_tracking:
+            self._roi_tracker = self._create_roi_tracker()
+        self.metrics: Optional[PipelineMetrics] = None
+        # Com um gravador ligado, os landmarks crus de cada frame vão para disco (ver landmark_recording).
+        self.landmark_recorder: Optional[LandmarkRecorder] = None
+        self._frames_seen = 0
+
+    def _create_hands(self):
+        return self._mp_hands.Hands(static_image_mode=False, **self._hands_settings)
+
+    def _create_roi_tracker(self) -> HandRoiTracker:
+        return HandRoiTracker(padding=self.roi_padding, full_frame_interval=self.roi_full_frame_interval)
+
+    def reconfigure(
+        self,
+        model_complexity: Optional[int] = None,
+        min_detection_confidence: Optional[float] = None,
+        min_tracking_confidence: Optional[float] = None,
+        max_num_hands: Optional[int] = None,
+        roi_tracking: Optional[bool] = None,
+        inference_height: Union[Optional[int], object] = _UNCHANGED,
+        adaptive_resolution: Union[Optional[AdaptiveResolutionPolicy], object] = _UNCHANGED,
+    ) -> None:
+        """Altera parâmetros em tempo de execução (argumentos omitidos ficam como estão).
+
+        O grafo do MediaPipe só é recriado quando modelo, confianças ou número de mãos
+        mudam. Chame da mesma thread que usa `detect_hands`.
+        """
+
+        requested = {
+            "max_num_hands": max_num_hands,
+            "model_complexity": model_complexity,
+            "min_detection_confidence": min_detection_confidence,
+            "min_tracking_confidence": min_tracking_confidence,
+        }
+        settings = {key: value if value is not None else self._hands_settings[key] for key, value in requested.items()}
+        if settings != self._hands_settings:
+            self._hands_settings = settings
+            self._hands.close()
+            self._hands = self._create_hands()
+            if self._roi_tracker:
+                self._roi_tracker.reset()
+
+        if roi_tracking is not None and roi_tracking != (self._roi_tracker is not None):
+            self._roi_tracker = self._create_roi_tracker() if roi_tracking else None
+        if adaptive_resolution is not _UNCHANGED:
+            self.adaptive_resolution = adaptive_resolution  # type: ignore[assignment]
+        if inference_height is not _UNCHANGED:
+            self.inference_height = inference_height  # type: ignore[assignment]
+        if self.adaptive_resolution is not None:
+            self.inference_height = self.adaptive_resolution.current_height
+
+    def detect_hands(
+        self,
+        frame: Union[np.ndarray, CapturedFrame],
+        color_format: ColorFormat = ColorFormat.RGB,
+    ) -> List[HandPosition]:
+        """Detecta mãos em um frame; arrays soltos são tratados como `color_format`."""
+
+        self._frames_seen += 1
+        frame_timestamp: Optional[float] = None
+        frame_sequence = self._frames_seen
+        if isinstance(frame, CapturedFrame):
+            color_format = frame.color_format
+            frame_timestamp = frame.timestamp
+            frame_sequence = frame.sequence
+            frame = frame.image
+
         if frame is None or frame.size == 0:
             return []
 
-        # MediaPipe espera RGB.
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        rgb_frame.flags.writeable = False
-        results = self._hands.process(rgb_frame)
-        rgb_frame.flags.writeable = True
+        metrics = self.metrics
+        # MediaPipe espera RGB: converte apenas se o frame ainda não estiver nesse formato.
+        if metrics is not None and color_format is not ColorFormat.RGB:
+            convert_started = time.perf_counter()
+            rgb_frame = self._to_rgb(frame, color_format)
+            metrics.record_since(Stage.INFERENCE_CONVERSION, convert_started)
+        else:
+            rgb_frame = self._to_rgb(frame, color_format)
+        # Somente leitura evita uma cópia dentro do MediaPipe. A flag vai numa view: o array
+        # do chamador (e o nosso buffer de conversão) não têm as flags alteradas.
+        rgb_view = rgb_frame.view()
+        rgb_view.flags.writeable = False
+        started = time.perf_counter()
+        results, crop_box = self._run_inference(rgb_view)
+        inferred = time.perf_counter()
+        if metrics is not None:
+            metrics.record(Stage.INFERENCE, inferred - started)
+        if self.adaptive_resolution is not None:
+            elapsed_ms = (inferred - started) * 1000.0
+            self.inference_height = self.adaptive_resolution.record(elapsed_ms)
 
         if not results.multi_hand_landmarks:
+            if self._roi_tracker:
+                self._roi_tracker.reset()
             return []
 
-        detected: List[HandPosition] = []
-        for idx, hand_landmarks in enumerate(results.multi_hand_landmarks):
-            handed_label = "Unknown"
-            score = 0.0
-            if results.multi_handedness and idx < len(results.multi_handedness):
-                handed = results.multi_handedness[idx].classification[0]
-                handed_label = handed.label
-                score = handed.score
-
-            gesture = self._recognize_gesture(hand_landmarks, handed_label)
-            xs = [lm.x for lm in hand_landmarks.landmark]
-            ys = [lm.y for lm in hand_landmarks.landmark]
-            detected.append(
-                HandPosition(
-                    x=float(np.mean(xs)),
-                    y=float(np.mean(ys)),
-                    gesture=gesture,
-                    score=score,
-                    handedness=handed_label,
-                )
+        # Cada mão é convertida uma única vez para (21, 3); o resto é vetorizado.
+        landmarks = stack_landmarks(results.multi_hand_landmarks)
+        if crop_box is not None:
+            height, width = rgb_frame.shape[:2]
+            self._map_crop_to_frame(landmarks, crop_box, width, height)
+        if self._roi_tracker:
+            self._update_roi(landmarks)
+
+        labels, scores = self._read_handedness(results, len(landmarks))
+        handedness = np.fromiter((handedness_code(label) for label in labels), dtype=np.int8, count=len(labels))
+        codes = classify_gestures(landmarks, handedness)
+        centroids = hand_centroids(landmarks)
+        if metrics is not None:
+            metrics.record_since(Stage.CLASSIFICATION, inferred)
+        recorder = self.landmark_recorder
+        if recorder is not None:
+            recorder.write(
+                frame_timestamp if frame_timestamp is not None else inferred,
+                frame_sequence,
+                landmarks,
+                handedness,
+                scores,
+                codes,
             )
 
-        return detected
+        return [
+            HandPosition(
+                x=float(centroids[idx, 0]),
+                y=float(centroids[idx, 1]),
+                gesture=GESTURES_BY_CODE[codes[idx]],
+                score=scores[idx],
+                handedness=labels[idx],
+                landmarks=landmarks[idx],
+            )
+            for idx in range(len(landmarks))
+        ]
 
-    def _recognize_gesture(self, landmarks, handed_label: str) -> GestureType:
-        finger_states = self._extract_finger_states(landmarks, handed_label)
-        extended_count = sum(finger_states.values())
+    @staticmethod
+    def _read_handedness(results, count: int) -> Tuple[List[str], List[float]]:
+        labels = ["Unknown"] * count
+        scores = [0.0] * count
+        for idx, handed in enumerate((results.multi_handedness or [])[:count]):
+            classification = handed.classification[0]
+            labels[idx] = classification.label
+            scores[idx] = classification.score
+        return labels, scores
 
-        if extended_count == 0:
-            return GestureType.FIST
+    def _run_inference(self, rgb_frame: np.ndarray) -> Tuple[object, Optional[CropBox]]:
+        """Roda o MediaPipe e informa o recorte usado (None quando foi o frame completo)."""
 
-        if extended_count == 5:
-            return GestureType.OPEN_HAND
+        tracker = self._roi_tracker
+        if tracker is not None:
+            height, width = rgb_frame.shape[:2]
+            crop_box = tracker.next_crop(width, height)
+            if crop_box is not None:
+                x0, y0, x1, y1 = crop_box
+                results = self._process_scaled(rgb_frame[y0:y1, x0:x1])
+                if results.multi_hand_landmarks:
+                    return results, crop_box
+                # Rastreamento perdido no recorte: busca novamente no frame completo.
+            tracker.mark_full_frame()
 
-        index_up = finger_states.get("index", False)
-        middle_up = finger_states.get("middle", False)
-        thumb_up = finger_states.get("thumb", False)
+        return self._process_scaled(rgb_frame), None
 
-        if extended_count == 1 and index_up:
-            return GestureType.POINTING
+    def _process_scaled(self, image: np.ndarray):
+        """Roda o MediaPipe numa cópia reduzida para `inference_height`, se necessário.
 
-        if extended_count == 1 and thumb_up:
-            return GestureType.THUMBS_UP
+        Os landmarks são normalizados, então continuam válidos no espaço da imagem original.
+        """
 
-        if extended_count == 2 and index_up and middle_up:
-            return GestureType.PEACE
+        height, width = image.shape[:2]
+        target_height = self.inference_height
+        if not target_height or height <= target_height:
+            return self._hands.process(np.ascontiguousarray(image))
 
-        return GestureType.UNKNOWN
-
-    def _extract_finger_states(self, landmarks, handed_label: str) -> dict:
-        mp_hl = self._mp_hands.HandLandmark
-        fingers = {
-            "index": self._is_finger_extended(landmarks, mp_hl.INDEX_FINGER_TIP, mp_hl.INDEX_FINGER_PIP),
-            "middle": self._is_finger_extended(landmarks, mp_hl.MIDDLE_FINGER_TIP, mp_hl.MIDDLE_FINGER_PIP),
-            "ring": self._is_finger_extended(landmarks, mp_hl.RING_FINGER_TIP, mp_hl.RING_FINGER_PIP),
-            "pinky": self._is_finger_extended(landmarks, mp_hl.PINKY_TIP, mp_hl.PINKY_PIP),
-        }
-        fingers["thumb"] = self._is_thumb_extended(landmarks, handed_label)
-        return fingers
+        target_width = max(1, round(width * target_height / height))
+        shape = (target_height, target_width, 3)
+        if self._resize_buffer is None or self._resize_buffer.shape != shape:
+            self._resize_buffer = np.empty(shape, dtype=np.uint8)
+        cv2.resize(image, (target_width, target_height), dst=self._resize_buffer, interpolation=cv2.INTER_LINEAR)
+        return self._hands.process(self._resize_buffer)
 
     @staticmethod
-    def _is_finger_extended(landmarks, tip_idx, pip_idx, threshold: float = 0.02) -> bool:
-        tip = landmarks.landmark[tip_idx]
-        pip = landmarks.landmark[pip_idx]
-        return (pip.y - tip.y) > threshold
+    def _map_crop_to_frame(landmarks: np.ndarray, crop_box: CropBox, width: int, height: int) -> None:
+        """Converte (in place) landmarks normalizados do recorte para o frame completo."""
+
+        x0, y0, x1, y1 = crop_box
+        scale_x = (x1 - x0) / width
+        landmarks[..., 0] *= scale_x
+        landmarks[..., 0] += x0 / width
+        landmarks[..., 1] *= (y1 - y0) / height
+        landmarks[..., 1] += y0 / height
+        landmarks[..., 2] *= scale_x
+
+    def _update_roi(self, landmarks: np.ndarray) -> None:
+        x_min, y_min = landmarks[..., :2].reshape(-1, 2).min(axis=0)
+        x_max, y_max = landmarks[..., :2].reshape(-1, 2).max(axis=0)
+        self._roi_tracker.update(float(x_min), float(y_min), float(x_max), float(y_max))  # type: ignore[union-attr]
+
+    def _to_rgb(self, frame: np.ndarray, color_format: ColorFormat) -> np.ndarray:
+        if color_format is ColorFormat.RGB:
+            return frame
+
+        shape = frame.shape[:2] + (3,)
+        if self._rgb_buffer is None or self._rgb_buffer.shape != shape:
+            self._rgb_buffer = np.empty(shape, dtype=np.uint8)
+        return convert_color(frame, color_format, ColorFormat.RGB, dst=self._rgb_buffer)
 
     @staticmethod
-    def _is_thumb_extended(landmarks, handed_label: str, threshold: float = 0.02) -> bool:
-        mp_hl = mp.solutions.hands.HandLandmark
-        tip = landmarks.landmark[mp_hl.THUMB_TIP]
-        mcp = landmarks.landmark[mp_hl.THUMB_MCP]
-
-        if handed_label.lower() == "right":
-            return (mcp.x - tip.x) > threshold
-        if handed_label.lower() == "left":
-            return (tip.x - mcp.x) > threshold
-        # fallback: compara distância ao punho
-        wrist = landmarks.landmark[mp_hl.WRIST]
-        return abs(tip.x - wrist.x) > abs(mcp.x - wrist.x) + threshold
+    def _recognize_gesture(landmarks: np.ndarray, handed_label: str) -> GestureType:
+        """Classifica uma única mão a partir do array (21, 3) de landmarks."""
+
+        codes = classify_gestures(landmarks, np.int8(handedness_code(handed_label)))
+        return GESTURES_BY_CODE[codes[0]]
 
     def close(self) -> None:
         self._hands.close()
+        if self.landmark_recorder is not None:
+            self.landmark_recorder.close()
 
     def __del__(self) -> None:  # pragma: no cover - segurança extra
         try:
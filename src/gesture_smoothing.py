@@ -0,0 +1,183 @@
+"""
+Gesture Smoothing Module
+Filtro temporal de gestos: votação N-de-M, tempo mínimo e histerese por mão
+
+Author: Renato Castellani
+Version: 1.0.0
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from hand_landmarks import GESTURE_CODES, GESTURES_BY_CODE, GestureType
+
+_UNKNOWN_CODE = GESTURE_CODES[GestureType.UNKNOWN]
+
+
+@dataclass
+class GestureEvent:
+    """Transição estável de gesto de uma mão."""
+
+    hand: str
+    previous: GestureType
+    current: GestureType
+    timestamp: float
+    votes: int = 0
+
+
+class HandGestureFilter:
+    """Filtro temporal de uma mão sobre um anel fixo com os últimos `window` rótulos.
+
+    Um gesto só entra quando tem pelo menos `enter_votes` votos na janela e só sai quando
+    cai abaixo de `exit_votes` (histerese). Nenhuma troca acontece antes de o gesto atual
+    ficar `min_hold` segundos estável.
+    """
+
+    def __init__(
+        self,
+        hand: str,
+        window: int = 8,
+        enter_votes: int = 5,
+        exit_votes: int = 3,
+        min_hold: float = 0.15,
+    ) -> None:
+        if not 0 < exit_votes <= enter_votes <= window:
+            raise ValueError("Esperado 0 < exit_votes <= enter_votes <= window")
+
+        self.hand = hand
+        self.window = window
+        self.enter_votes = enter_votes
+        self.exit_votes = exit_votes
+        self.min_hold = min_hold
+        self._history = np.full(window, _UNKNOWN_CODE, dtype=np.int8)
+        self._counts = np.zeros(len(GESTURES_BY_CODE), dtype=np.int32)
+        self._counts[_UNKNOWN_CODE] = window
+        self._position = 0
+        self.stable = GestureType.UNKNOWN
+        self._stable_code = _UNKNOWN_CODE
+        self._stable_since = float("-inf")
+
+    def reset(self) -> None:
+        self._history.fill(_UNKNOWN_CODE)
+        self._counts.fill(0)
+        self._counts[_UNKNOWN_CODE] = self.window
+        self._position = 0
+        self.stable = GestureType.UNKNOWN
+        self._stable_code = _UNKNOWN_CODE
+        self._stable_since = float("-inf")
+
+    def update(self, gesture: GestureType, timestamp: float) -> Optional[GestureEvent]:
+        """Registra o rótulo do frame e retorna um evento se o gesto estável mudou."""
+
+        code = GESTURE_CODES[gesture]
+        # Atualização O(1) das contagens: sai o rótulo mais antigo, entra o novo.
+        self._counts[self._history[self._position]] -= 1
+        self._history[self._position] = code
+        self._counts[code] += 1
+        self._position = (self._position + 1) % self.window
+
+        if timestamp - self._stable_since < self.min_hold:
+            return None
+
+        stable_votes = self._counts[self._stable_code]
+        candidate = int(self._counts.argmax())
+        candidate_votes = int(self._counts[candidate])
+
+        if candidate != self._stable_code and candidate_votes >= self.enter_votes:
+            new_code = candidate
+        elif self._stable_code != _UNKNOWN_CODE and stable_votes < self.exit_votes:
+            new_code = _UNKNOWN_CODE
+        else:
+            return None
+
+        previous = self.stable
+        self._stable_code = new_code
+        self.stable = GESTURES_BY_CODE[new_code]
+        self._stable_since = timestamp
+        return GestureEvent(
+            hand=self.hand,
+            previous=previous,
+            current=self.stable,
+            timestamp=timestamp,
+            votes=int(self._counts[new_code]),
+        )
+
+
+class GestureSmoother:
+    """Aplica um HandGestureFilter por mão (chave: lateralidade) e emite só as transições."""
+
+    def __init__(
+        self,
+        window: int = 8,
+        enter_votes: int = 5,
+        exit_votes: int = 3,
+        min_hold: float = 0.15,
+    ) -> None:
+        self.window = window
+        self.enter_votes = enter_votes
+        self.exit_votes = exit_votes
+        self.min_hold = min_hold
+        self._filters: Dict[str, HandGestureFilter] = {}
+
+    def configure(
+        self,
+        window: Optional[int] = None,
+        enter_votes: Optional[int] = None,
+        exit_votes: Optional[int] = None,
+        min_hold: Optional[float] = None,
+    ) -> None:
+        """Troca os parâmetros; os filtros por mão recomeçam com os novos valores."""
+
+        window = self.window if window is None else window
+        enter_votes = self.enter_votes if enter_votes is None else enter_votes
+        exit_votes = self.exit_votes if exit_votes is None else exit_votes
+        if not 0 < exit_votes <= enter_votes <= window:
+            raise ValueError("Esperado 0 < exit_votes <= enter_votes <= window")
+        self.window = window
+        self.enter_votes = enter_votes
+        self.exit_votes = exit_votes
+        if min_hold is not None:
+            self.min_hold = min_hold
+        self._filters.clear()
+
+    @property
+    def has_active_gesture(self) -> bool:
+        return any(f.stable is not GestureType.UNKNOWN for f in self._filters.values())
+
+    def stable_gesture(self, hand: str) -> GestureType:
+        hand_filter = self._filters.get(hand)
+        return hand_filter.stable if hand_filter else GestureType.UNKNOWN
+
+    def reset(self) -> None:
+        for hand_filter in self._filters.values():
+            hand_filter.reset()
+
+    def update(self, hands: Iterable, timestamp: float) -> List[GestureEvent]:
+        """Alimenta os filtros com as mãos do frame (objetos com `handedness`/`gesture`).
+
+        Mãos ausentes no frame recebem UNKNOWN, então decaem para "sem gesto".
+        """
+
+        seen: Dict[str, GestureType] = {}
+        for hand in hands:
+            seen.setdefault(hand.handedness, hand.gesture)
+
+        events: List[GestureEvent] = []
+        for label in seen.keys() - self._filters.keys():
+            self._filters[label] = HandGestureFilter(
+                label,
+                window=self.window,
+                enter_votes=self.enter_votes,
+                exit_votes=self.exit_votes,
+                min_hold=self.min_hold,
+            )
+
+        for label, hand_filter in self._filters.items():
+            event = hand_filter.update(seen.get(label, GestureType.UNKNOWN), timestamp)
+            if event is not None:
+                events.append(event)
+        return events
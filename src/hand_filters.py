@@ -0,0 +1,265 @@
+"""
+Hand Filters Module
+Filtros One Euro e Kalman (velocidade constante) para as posições das mãos,
+com estimativa de velocidade e previsão alguns milissegundos à frente
+
+Author: Renato Castellani
+Version: 1.0.0
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+
+from hand_landmarks import FINGERTIPS, NUM_LANDMARKS
+
+# Pontos acompanhados por mão: centróide seguido das cinco pontas dos dedos.
+CENTROID = 0
+TRACKED_POINTS = 1 + len(FINGERTIPS)
+
+
+class OneEuroFilter:
+    """Filtro One Euro vetorizado (Casiez et al.) sobre um array de formato fixo.
+
+    Todos os buffers são alocados na criação; `filter` não aloca arrays.
+    """
+
+    def __init__(
+        self,
+        shape: Tuple[int, ...],
+        min_cutoff: float = 1.0,
+        beta: float = 5.0,
+        d_cutoff: float = 1.0,
+    ) -> None:
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self.value = np.zeros(shape, dtype=np.float64)
+        self.derivative = np.zeros(shape, dtype=np.float64)
+        self._scratch = np.zeros(shape, dtype=np.float64)
+        self._alpha = np.zeros(shape, dtype=np.float64)
+        self._last_time: Optional[float] = None
+
+    def reset(self) -> None:
+        self._last_time = None
+
+    @staticmethod
+    def _alpha_for(cutoff: float, dt: float) -> float:
+        tau = 1.0 / (2.0 * math.pi * cutoff)
+        return 1.0 / (1.0 + tau / dt)
+
+    def filter(self, measurement: np.ndarray, timestamp: float) -> np.ndarray:
+        """Filtra `measurement` e devolve `value` (buffer interno, atualizado in place)."""
+
+        if self._last_time is None or timestamp <= self._last_time:
+            if self._last_time is None:
+                np.copyto(self.value, measurement)
+                self.derivative.fill(0.0)
+            self._last_time = timestamp
+            return self.value
+
+        dt = timestamp - self._last_time
+        self._last_time = timestamp
+        scratch, alpha = self._scratch, self._alpha
+
+        # Derivada bruta filtrada com corte fixo.
+        np.subtract(measurement, self.value, out=scratch)
+        scratch /= dt
+        scratch -= self.derivative
+        scratch *= self._alpha_for(self.d_cutoff, dt)
+        self.derivative += scratch
+
+        # Corte adaptativo: cresce com a velocidade (menos atraso em movimento rápido).
+        np.abs(self.derivative, out=alpha)
+        alpha *= self.beta
+        alpha += self.min_cutoff
+        alpha *= 2.0 * math.pi * dt  # dt / tau
+        np.add(alpha, 1.0, out=scratch)
+        np.divide(alpha, scratch, out=alpha)
+
+        np.subtract(measurement, self.value, out=scratch)
+        scratch *= alpha
+        self.value += scratch
+        return self.value
+
+
+class ConstantVelocityKalman:
+    """Kalman de velocidade constante, independente por coordenada e vetorizado.
+
+    Estado por elemento: posição e velocidade, com covariância 2x2 (p00, p01, p11).
+    """
+
+    def __init__(
+        self,
+        shape: Tuple[int, ...],
+        process_noise: float = 2.0,
+        measurement_noise: float = 2e-5,
+    ) -> None:
+        self.process_noise = process_noise
+        self.measurement_noise = measurement_noise
+        self.value = np.zeros(shape, dtype=np.float64)
+        self.derivative = np.zeros(shape, dtype=np.float64)
+        self._p00 = np.zeros(shape, dtype=np.float64)
+        self._p01 = np.zeros(shape, dtype=np.float64)
+        self._p11 = np.zeros(shape, dtype=np.float64)
+        self._innovation = np.zeros(shape, dtype=np.float64)
+        self._scratch = np.zeros(shape, dtype=np.float64)
+        self._gain0 = np.zeros(shape, dtype=np.float64)
+        self._gain1 = np.zeros(shape, dtype=np.float64)
+        self._last_time: Optional[float] = None
+
+    def reset(self) -> None:
+        self._last_time = None
+
+    def filter(self, measurement: np.ndarray, timestamp: float) -> np.ndarray:
+        if self._last_time is None or timestamp <= self._last_time:
+            if self._last_time is None:
+                np.copyto(self.value, measurement)
+                self.derivative.fill(0.0)
+                self._p00.fill(self.measurement_noise)
+                self._p01.fill(0.0)
+                self._p11.fill(1.0)
+            self._last_time = timestamp
+            return self.value
+
+        dt = timestamp - self._last_time
+        self._last_time = timestamp
+        p00, p01, p11 = self._p00, self._p01, self._p11
+        scratch = self._scratch
+        q = self.process_noise
+
+        # Predição: x += v*dt; P = F P F' + Q (aceleração como ruído branco).
+        np.multiply(self.derivative, dt, out=scratch)
+        self.value += scratch
+        np.multiply(p11, dt, out=scratch)  # p00 += dt * (2*p01 + dt*p11) + q*dt^4/4
+        scratch += p01
+        scratch += p01
+        scratch *= dt
+        scratch += q * dt ** 4 / 4.0
+        p00 += scratch
+        np.multiply(p11, dt, out=scratch)  # p01 += dt*p11 + q*dt^3/2
+        scratch += q * dt ** 3 / 2.0
+        p01 += scratch
+        p11 += q * dt ** 2
+
+        # Correção com a medida de posição (H = [1, 0]).
+        innovation, gain0, gain1 = self._innovation, self._gain0, self._gain1
+        np.add(p00, self.measurement_noise, out=gain1)  # S
+        np.divide(p00, gain1, out=gain0)
+        np.divide(p01, gain1, out=gain1)
+        np.subtract(measurement, self.value, out=innovation)
+
+        np.multiply(gain0, innovation, out=scratch)
+        self.value += scratch
+        np.multiply(gain1, innovation, out=scratch)
+        self.derivative += scratch
+
+        # P = (I - K H) P, atualizando p11 antes de p01 mudar.
+        np.multiply(gain1, p01, out=scratch)
+        p11 -= scratch
+        np.subtract(1.0, gain0, out=scratch)
+        p01 *= scratch
+        p00 *= scratch
+        return self.value
+
+
+class HandMotionFilter:
+    """Filtra centróide e pontas dos dedos de uma mão e prevê a posição `lead_time` à frente."""
+
+    def __init__(self, method: str = "one_euro", lead_time: float = 0.03, **filter_args) -> None:
+        shape = (TRACKED_POINTS, 2)
+        if method == "one_euro":
+            self._filter = OneEuroFilter(shape, **filter_args)
+        elif method == "kalman":
+            self._filter = ConstantVelocityKalman(shape, **filter_args)
+        else:
+            raise ValueError(f"Filtro desconhecido: {method}")
+
+        self.method = method
+        self.lead_time = lead_time
+        self.last_timestamp: Optional[float] = None
+        self._measurement = np.zeros(shape, dtype=np.float32)
+        self.predicted = np.zeros(shape, dtype=np.float64)
+
+    @property
+    def position(self) -> np.ndarray:
+        """Posições filtradas (TRACKED_POINTS, 2); a linha CENTROID é o centro da mão."""
+
+        return self._filter.value
+
+    @property
+    def velocity(self) -> np.ndarray:
+        """Velocidades estimadas em unidades normalizadas por segundo."""
+
+        return self._filter.derivative
+
+    def reset(self) -> None:
+        self._filter.reset()
+        self.last_timestamp = None
+
+    def update(self, landmarks: np.ndarray, timestamp: float) -> np.ndarray:
+        """Atualiza com os landmarks (21, 3) do frame e devolve a posição prevista."""
+
+        points = self._measurement
+        np.sum(landmarks[:, :2], axis=0, out=points[CENTROID])
+        points[CENTROID] *= 1.0 / NUM_LANDMARKS
+        np.take(landmarks[:, :2], FINGERTIPS, axis=0, out=points[1:])
+        return self.update_points(points, timestamp)
+
+    def update_points(self, points: np.ndarray, timestamp: float) -> np.ndarray:
+        self._filter.filter(points, timestamp)
+        self.last_timestamp = timestamp
+        # Compensa a latência de câmera + inferência extrapolando pela velocidade.
+        np.multiply(self._filter.derivative, self.lead_time, out=self.predicted)
+        self.predicted += self._filter.value
+        return self.predicted
+
+
+class HandMotionTracker:
+    """Mantém um HandMotionFilter por mão (chave: lateralidade)."""
+
+    def __init__(
+        self,
+        method: str = "one_euro",
+        lead_time: float = 0.03,
+        timeout: float = 0.3,
+        **filter_args,
+    ) -> None:
+        self.method = method
+        self.lead_time = lead_time
+        self.timeout = timeout
+        self.filter_args = filter_args
+        self._filters: Dict[str, HandMotionFilter] = {}
+
+    def set_lead_time(self, lead_time: float) -> None:
+        self.lead_time = lead_time
+        for hand_filter in self._filters.values():
+            hand_filter.lead_time = lead_time
+
+    def filter_for(self, hand: str) -> Optional[HandMotionFilter]:
+        return self._filters.get(hand)
+
+    def predicted_centroid(self, hand: str) -> Optional[Tuple[float, float]]:
+        hand_filter = self._filters.get(hand)
+        if hand_filter is None or hand_filter.last_timestamp is None:
+            return None
+        x, y = hand_filter.predicted[CENTROID]
+        return float(x), float(y)
+
+    def update(self, hands: Iterable, timestamp: float) -> None:
+        """Alimenta os filtros com as mãos do frame (objetos com `handedness`/`landmarks`)."""
+
+        for hand in hands:
+            if hand.landmarks is None:
+                continue
+            hand_filter = self._filters.get(hand.handedness)
+            if hand_filter is None:
+                hand_filter = HandMotionFilter(self.method, self.lead_time, **self.filter_args)
+                self._filters[hand.handedness] = hand_filter
+            elif hand_filter.last_timestamp is not None and timestamp - hand_filter.last_timestamp > self.timeout:
+                # Mão sumiu por tempo demais: recomeça sem arrastar velocidade antiga.
+                hand_filter.reset()
+            hand_filter.update(hand.landmarks, timestamp)
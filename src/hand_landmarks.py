@@ -0,0 +1,193 @@
+"""
+Hand Landmarks Module
+Representação vetorizada dos 21 landmarks da mão e classificador de gestos em NumPy
+
+Author: Renato Castellani
+Version: 1.0.0
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from enum import Enum
+from typing import Iterable, Optional
+
+import numpy as np
+
+
+class GestureType(Enum):
+    UNKNOWN = "unknown"
+    FIST = "fist"
+    OPEN_HAND = "open_hand"
+    POINTING = "pointing"
+    THUMBS_UP = "thumbs_up"
+    PEACE = "peace"
+
+
+@dataclass
+class HandPosition:
+    x: float
+    y: float
+    gesture: GestureType
+    score: float = 0.0
+    handedness: str = "Unknown"
+    landmarks: Optional[np.ndarray] = None  # (21, 3) float32, coordenadas do frame completo
+
+
+# Códigos inteiros dos gestos (posição no enum), usados nos arrays do classificador.
+GESTURES_BY_CODE = tuple(GestureType)
+GESTURE_CODES = {gesture: code for code, gesture in enumerate(GESTURES_BY_CODE)}
+
+NUM_LANDMARKS = 21
+
+# Índices dos landmarks (mesma numeração de mediapipe.solutions.hands.HandLandmark).
+WRIST = 0
+THUMB_MCP = 2
+THUMB_TIP = 4
+INDEX_FINGER_PIP = 6
+INDEX_FINGER_TIP = 8
+MIDDLE_FINGER_PIP = 10
+MIDDLE_FINGER_TIP = 12
+RING_FINGER_PIP = 14
+RING_FINGER_TIP = 16
+PINKY_PIP = 18
+PINKY_TIP = 20
+
+FINGERTIPS = np.array([THUMB_TIP, INDEX_FINGER_TIP, MIDDLE_FINGER_TIP, RING_FINGER_TIP, PINKY_TIP])
+# Pontas e PIPs dos quatro dedos estão espaçados de 4 em 4: slices simples geram views.
+_FINGER_TIPS = slice(INDEX_FINGER_TIP, PINKY_TIP + 1, 4)
+_FINGER_PIPS = slice(INDEX_FINGER_PIP, PINKY_PIP + 1, 4)
+
+# Colunas de `finger_states`.
+THUMB, INDEX, MIDDLE, RING, PINKY = range(5)
+_STATE_BITS = np.array([1, 2, 4, 8, 16], dtype=np.uint8)
+
+# Lateralidade codificada: 1 = direita, -1 = esquerda, 0 = desconhecida.
+HANDEDNESS_CODES = {"right": 1, "left": -1}
+
+
+def handedness_code(label: str) -> int:
+    return HANDEDNESS_CODES.get(label.lower(), 0)
+
+
+def stack_landmarks(hands_landmarks: Iterable) -> np.ndarray:
+    """Converte as mãos (protobuf do MediaPipe) num único array (N, 21, 3) float32.
+
+    Os atributos são lidos uma única vez por landmark, direto para um buffer plano.
+    """
+
+    hands_landmarks = list(hands_landmarks)
+    if len(hands_landmarks) == 1:
+        # Caso mais comum (uma mão): preenche o buffer final sem lista intermediária.
+        stack = np.empty((1, NUM_LANDMARKS, 3), dtype=np.float32)
+        flat = stack.reshape(-1)
+        idx = 0
+        for lm in hands_landmarks[0].landmark:
+            flat[idx] = lm.x
+            flat[idx + 1] = lm.y
+            flat[idx + 2] = lm.z
+            idx += 3
+        return stack
+    values = [value for hand in hands_landmarks for lm in hand.landmark for value in (lm.x, lm.y, lm.z)]
+    flat = np.fromiter(values, dtype=np.float32, count=len(values))
+    return flat.reshape(len(hands_landmarks), NUM_LANDMARKS, 3)
+
+
+def landmarks_to_array(hand_landmarks) -> np.ndarray:
+    """Converte os landmarks de uma mão num array (21, 3) float32."""
+
+    return stack_landmarks([hand_landmarks])[0]
+
+
+def _as_stack(landmarks: np.ndarray) -> np.ndarray:
+    return landmarks[np.newaxis] if landmarks.ndim == 2 else landmarks
+
+
+def finger_states(landmarks: np.ndarray, handedness: np.ndarray, threshold: float = 0.02) -> np.ndarray:
+    """Retorna um array booleano (N, 5) com o estado [polegar, indicador, médio, anelar, mínimo].
+
+    `landmarks` pode ser (21, 3) ou (N, 21, 3); `handedness` traz os códigos de lateralidade
+    (um por mão, ou um escalar para todas).
+    """
+
+    stack = _as_stack(landmarks)
+    handedness = np.asarray(handedness)
+
+    # Coluna 0: avanço do polegar no sentido da mão (direita: x menor; esquerda: x maior).
+    # Colunas 1-4: quanto a ponta está acima (y menor) da articulação PIP.
+    margins = np.empty((stack.shape[0], 5), dtype=np.float32)
+    np.subtract(stack[:, THUMB_MCP, 0], stack[:, THUMB_TIP, 0], out=margins[:, THUMB])
+    np.subtract(stack[:, _FINGER_PIPS, 1], stack[:, _FINGER_TIPS, 1], out=margins[:, INDEX:])
+    margins[:, THUMB] *= handedness
+    states = margins > threshold
+
+    if not handedness.all():
+        # Lateralidade desconhecida: compara a distância do polegar ao punho.
+        unknown = np.broadcast_to(handedness == 0, stack.shape[:1])
+        tip_x = stack[unknown, THUMB_TIP, 0]
+        mcp_x = stack[unknown, THUMB_MCP, 0]
+        wrist_x = stack[unknown, WRIST, 0]
+        states[unknown, THUMB] = np.abs(tip_x - wrist_x) > np.abs(mcp_x - wrist_x) + threshold
+    return states
+
+
+def classify_gestures(landmarks: np.ndarray, handedness: np.ndarray, threshold: float = 0.02) -> np.ndarray:
+    """Classifica cada mão e devolve os códigos de gesto (índices em GESTURES_BY_CODE)."""
+
+    stack = _as_stack(landmarks)
+    if stack.shape[0] == 1:
+        # Uma mão: o custo fixo das operações NumPy passaria do próprio cálculo.
+        handed = int(np.asarray(handedness).reshape(-1)[0])
+        return np.array([_classify_one(stack[0].tolist(), handed, threshold)], dtype=np.int8)
+    states = finger_states(stack, handedness, threshold)
+    return classify_finger_states(states)
+
+
+def _classify_one(points, handed: int, threshold: float) -> int:
+    """Mesmas regras de `finger_states` + GESTURE_TABLE, em floats Python para uma mão."""
+
+    tip_x = points[THUMB_TIP][0]
+    mcp_x = points[THUMB_MCP][0]
+    if handed:
+        thumb = (mcp_x - tip_x) * handed > threshold
+    else:
+        wrist_x = points[WRIST][0]
+        thumb = abs(tip_x - wrist_x) > abs(mcp_x - wrist_x) + threshold
+    mask = int(thumb)
+    for finger, (tip, pip) in enumerate(_FINGER_JOINTS, INDEX):
+        if points[pip][1] - points[tip][1] > threshold:
+            mask |= 1 << finger
+    return _GESTURE_CODES_BY_MASK[mask]
+
+
+def _build_gesture_table() -> np.ndarray:
+    """Tabela de 32 entradas: máscara de dedos estendidos → código do gesto."""
+
+    table = np.full(32, GESTURE_CODES[GestureType.UNKNOWN], dtype=np.int8)
+
+    def mask(*fingers: int) -> int:
+        return sum(1 << finger for finger in fingers)
+
+    table[0] = GESTURE_CODES[GestureType.FIST]
+    table[mask(THUMB, INDEX, MIDDLE, RING, PINKY)] = GESTURE_CODES[GestureType.OPEN_HAND]
+    table[mask(INDEX)] = GESTURE_CODES[GestureType.POINTING]
+    table[mask(THUMB)] = GESTURE_CODES[GestureType.THUMBS_UP]
+    table[mask(INDEX, MIDDLE)] = GESTURE_CODES[GestureType.PEACE]
+    return table
+
+
+GESTURE_TABLE = _build_gesture_table()
+_GESTURE_CODES_BY_MASK = GESTURE_TABLE.tolist()
+_FINGER_JOINTS = tuple(zip(range(INDEX_FINGER_TIP, PINKY_TIP + 1, 4), range(INDEX_FINGER_PIP, PINKY_PIP + 1, 4)))
+
+
+def classify_finger_states(states: np.ndarray) -> np.ndarray:
+    """Aplica as regras de gesto sobre estados de dedos (N, 5) via tabela de consulta."""
+
+    return GESTURE_TABLE[states.view(np.uint8) @ _STATE_BITS]
+
+
+def hand_centroids(landmarks: np.ndarray) -> np.ndarray:
+    """Centro (x, y) de cada mão: média dos 21 landmarks, formato (N, 2)."""
+
+    return _as_stack(landmarks)[:, :, :2].sum(axis=1) * (1.0 / NUM_LANDMARKS)
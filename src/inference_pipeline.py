@@ -0,0 +1,222 @@
+"""
+Inference Pipeline Module
+Pipeline captura → inferência → mapeamento → UI com a inferência numa QThread própria
+
+A thread de captura da câmera mantém só o frame mais recente; o worker sempre pega o
+último frame disponível (frames antigos são descartados, nunca enfileirados) e entrega
+os resultados à interface por sinal enfileirado, agrupando-os se a UI estiver atrasada.
+
+Author: Renato Castellani
+Version: 1.0.0
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass, field, replace
+from typing import List, Optional, Union
+
+from PySide6.QtCore import QThread, Signal
+
+from camera_detector import CameraDetector
+from gamepad_controller import GamepadController
+from gesture_recognizer import GestureRecognizer, HandPosition
+from gesture_smoothing import GestureEvent, GestureSmoother
+from instrumentation import PipelineMetrics, Rate, Stage
+from motion_gate import GatedRecognizer
+from performance_profiles import PerformanceProfile, apply_to_recognizer
+
+
+@dataclass
+class InferenceResult:
+    sequence: int
+    timestamp: float  # instante de captura (time.perf_counter)
+    hands: List[HandPosition] = field(default_factory=list)
+    events: List[GestureEvent] = field(default_factory=list)
+    has_active_gesture: bool = False
+    latency_ms: float = 0.0  # captura → fim do mapeamento
+    skipped_frames: int = 0  # frames da câmera não processados desde o resultado anterior
+
+    def merge(self, newer: "InferenceResult") -> None:
+        """Incorpora um resultado mais novo sem perder as transições deste."""
+
+        self.events.extend(newer.events)
+        self.skipped_frames += newer.skipped_frames
+        self.sequence = newer.sequence
+        self.timestamp = newer.timestamp
+        self.hands = newer.hands
+        self.has_active_gesture = newer.has_active_gesture
+        self.latency_ms = newer.latency_ms
+
+
+class InferencePipeline(QThread):
+    """Worker de inferência e mapeamento de gestos.
+
+    O recognizer, o smoother e o gamepad passam a ser usados apenas por esta thread;
+    a UI conversa com eles só através de `set_active`, `request_reset` e `take_result`.
+    """
+
+    resultReady = Signal()
+
+    def __init__(
+        self,
+        recognizer: Union[GestureRecognizer, GatedRecognizer],
+        smoother: GestureSmoother,
+        gamepad: Optional[GamepadController] = None,
+        metrics: Optional[PipelineMetrics] = None,
+        parent=None,
+    ) -> None:
+        super().__init__(parent)
+        self.recognizer = recognizer
+        self.smoother = smoother
+        self.gamepad = gamepad
+        self.metrics = metrics
+        self._camera: Optional[CameraDetector] = None
+        self._active = False
+        self._stop = threading.Event()
+        self._reset_requested = threading.Event()
+        self._lock = threading.Lock()
+        self._pending: Optional[InferenceResult] = None
+        self._pending_profile: Optional[PerformanceProfile] = None
+        self._signal_in_flight = False
+        self.processed_frames = 0
+        self.skipped_frames = 0
+
+    def set_camera(self, camera: Optional[CameraDetector]) -> None:
+        self._camera = camera
+
+    def set_active(self, active: bool) -> None:
+        """Liga/desliga a inferência; ao desligar, solta gestos e botões pendentes."""
+
+        self._active = active
+        if not active:
+            self.request_reset()
+
+    def set_profile(self, profile: PerformanceProfile) -> None:
+        """Agenda a troca de perfil; é aplicada pela própria thread antes do próximo frame.
+
+        Inclui resolução/FPS da câmera: a reconfiguração pausa a thread leitora e não pode
+        rodar na thread da GUI.
+        """
+
+        self._pending_profile = profile
+
+    def request_reset(self) -> None:
+        self._reset_requested.set()
+
+    def stop(self, timeout_ms: int = 2000) -> None:
+        self._stop.set()
+        self.wait(timeout_ms)
+
+    def take_result(self) -> Optional[InferenceResult]:
+        """Chamado pela UI ao receber `resultReady`: devolve o resultado acumulado."""
+
+        with self._lock:
+            result = self._pending
+            self._pending = None
+            self._signal_in_flight = False
+        return result
+
+    def run(self) -> None:
+        sequence = 0
+        while not self._stop.is_set():
+            if self._reset_requested.is_set():
+                self._reset_state()
+            profile = self._pending_profile
+            if profile is not None:
+                self._pending_profile = None
+                self._apply_profile(profile)
+
+            camera = self._camera
+            if camera is None or not self._active or not camera.is_active:
+                self._stop.wait(0.05)
+                continue
+
+            lease = camera.lease_newer_frame(sequence, timeout=0.1)
+            if lease is None:
+                continue
+
+            metrics = self.metrics
+            with lease:
+                frame = lease.frame
+                if metrics is not None:
+                    metrics.record_since(Stage.QUEUE, frame.timestamp)
+                skipped = max(0, frame.sequence - sequence - 1) if sequence else 0
+                sequence = frame.sequence
+                hands = self.recognizer.detect_hands(frame)
+            # Landmarks já são arrays próprios: o buffer volta ao anel antes do mapeamento.
+
+            smoothing_started = time.perf_counter()
+            events = self.smoother.update(hands, frame.timestamp)
+            if metrics is not None:
+                metrics.record_since(Stage.SMOOTHING, smoothing_started)
+            if self.gamepad is not None:
+                # O gamepad segue o gesto estável de cada mão, não o rótulo cru do frame.
+                # Cópias: `hands` vai no InferenceResult para a GUI e não pode mudar aqui.
+                stable_hands = [
+                    replace(hand, gesture=self.smoother.stable_gesture(hand.handedness)) for hand in hands
+                ]
+                self.gamepad.process_gestures(stable_hands, frame.timestamp)
+
+            finished = time.perf_counter()
+            if metrics is not None:
+                metrics.record(Stage.END_TO_END, finished - frame.timestamp)
+                metrics.tick(Rate.INFERENCE, finished)
+            self.processed_frames += 1
+            self.skipped_frames += skipped
+            self._publish(
+                InferenceResult(
+                    sequence=frame.sequence,
+                    timestamp=frame.timestamp,
+                    hands=hands,
+                    events=events,
+                    has_active_gesture=self.smoother.has_active_gesture,
+                    latency_ms=(finished - frame.timestamp) * 1000.0,
+                    skipped_frames=skipped,
+                )
+            )
+
+        self._reset_state()
+
+    def _apply_profile(self, profile: PerformanceProfile) -> None:
+        camera = self._camera
+        if camera is not None:
+            camera.configure(profile.camera_size, profile.camera_fps)
+        recognizer = self.recognizer
+        if isinstance(recognizer, GatedRecognizer):
+            recognizer.enabled = profile.motion_gating
+            recognizer.reset()
+            recognizer = recognizer.recognizer
+        apply_to_recognizer(profile, recognizer)
+        self.smoother.configure(
+            window=profile.smoothing_window,
+            enter_votes=profile.enter_votes,
+            exit_votes=profile.exit_votes,
+            min_hold=profile.min_hold,
+        )
+        if self.gamepad is not None:
+            self.gamepad.motion_tracker.set_lead_time(profile.stick_lead_time)
+
+    def _reset_state(self) -> None:
+        self._reset_requested.clear()
+        self.smoother.reset()
+        reset_recognizer = getattr(self.recognizer, "reset", None)
+        if reset_recognizer is not None:
+            reset_recognizer()
+        if self.gamepad is not None:
+            self.gamepad.release_all()
+        with self._lock:
+            self._pending = None
+
+    def _publish(self, result: InferenceResult) -> None:
+        with self._lock:
+            if self._pending is None:
+                self._pending = result
+            else:
+                self._pending.merge(result)
+            if self._signal_in_flight:
+                # A UI ainda não consumiu o sinal anterior: só acumula.
+                return
+            self._signal_in_flight = True
+        self.resultReady.emit()
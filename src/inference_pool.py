@@ -0,0 +1,422 @@
+"""
+Inference Pool Module
+Pool de processos para inferência com várias câmeras/jogadores
+
+Cada worker tem sua própria instância do MediaPipe Hands (via GestureRecognizer). Os
+frames chegam por slots de `multiprocessing.shared_memory` (sem pickle da imagem) e os
+resultados voltam como arrays compactos de landmarks, por um pipe exclusivo de cada
+worker (um worker que morre no meio de um envio não trava os resultados dos outros).
+
+Com a câmera publicando num FrameBus, `submit_bus` envia só a sequência: o worker mapeia
+o slot do barramento e roda a inferência direto nele, sem nenhuma cópia do frame.
+
+Author: Renato Castellani
+Version: 1.0.0
+"""
+
+from __future__ import annotations
+
+import multiprocessing as mp
+import sys
+import time
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from multiprocessing.connection import wait
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from frame_bus import FrameBus
+from frame_types import CapturedFrame, ColorFormat
+from hand_landmarks import (
+    GESTURE_CODES,
+    GESTURES_BY_CODE,
+    NUM_LANDMARKS,
+    HandPosition,
+    handedness_code,
+)
+
+_HANDEDNESS_LABELS = {1: "Right", -1: "Left", 0: "Unknown"}
+
+
+@dataclass
+class PoolResult:
+    """Resultado compacto de um frame: arrays com uma linha por mão."""
+
+    camera_id: int
+    sequence: int
+    timestamp: float
+    worker_id: int
+    landmarks: np.ndarray  # (N, 21, 3) float32
+    handedness: np.ndarray  # (N,) int8: 1 direita, -1 esquerda, 0 desconhecida
+    scores: np.ndarray  # (N,) float32
+    gestures: np.ndarray  # (N,) int8, índices em GESTURES_BY_CODE
+    inference_ms: float
+    error: Optional[str] = None  # exceção do reconhecedor neste frame (resultado vazio)
+
+    def hands(self) -> List[HandPosition]:
+        """Reconstrói as HandPosition (centro = média dos landmarks)."""
+
+        centroids = self.landmarks[:, :, :2].mean(axis=1)
+        return [
+            HandPosition(
+                x=float(centroids[idx, 0]),
+                y=float(centroids[idx, 1]),
+                gesture=GESTURES_BY_CODE[self.gestures[idx]],
+                score=float(self.scores[idx]),
+                handedness=_HANDEDNESS_LABELS[int(self.handedness[idx])],
+                landmarks=self.landmarks[idx],
+            )
+            for idx in range(len(self.landmarks))
+        ]
+
+
+def _default_recognizer(**kwargs):
+    from gesture_recognizer import GestureRecognizer
+
+    return GestureRecognizer(**kwargs)
+
+
+def _pack_hands(hands: List[HandPosition]) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    count = len(hands)
+    landmarks = np.zeros((count, NUM_LANDMARKS, 3), dtype=np.float32)
+    handedness = np.zeros(count, dtype=np.int8)
+    scores = np.zeros(count, dtype=np.float32)
+    gestures = np.zeros(count, dtype=np.int8)
+    for idx, hand in enumerate(hands):
+        if hand.landmarks is not None:
+            landmarks[idx] = hand.landmarks
+        handedness[idx] = handedness_code(hand.handedness)
+        scores[idx] = hand.score
+        gestures[idx] = GESTURE_CODES[hand.gesture]
+    return landmarks, handedness, scores, gestures
+
+
+def _empty_hands() -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    return _pack_hands([])
+
+
+def _worker_main(
+    worker_id: int,
+    shm_name: str,
+    slot_bytes: int,
+    first_slot: int,
+    requests,
+    results,
+    recognizer_factory: Callable[..., Any],
+    recognizer_kwargs: Dict[str, Any],
+) -> None:
+    shm = shared_memory.SharedMemory(name=shm_name)
+    buses: Dict[str, FrameBus] = {}
+    recognizer = recognizer_factory(**recognizer_kwargs)
+    try:
+        while True:
+            request = requests.get()
+            if request is None:
+                break
+            slot, camera_id, sequence, timestamp, shape, color_value, bus_name = request
+            bus_frame = None
+            if bus_name is None:
+                offset = (first_slot + slot) * slot_bytes
+                image = np.ndarray(shape, dtype=np.uint8, buffer=shm.buf, offset=offset)
+            else:
+                bus = buses.get(bus_name)
+                if bus is None:
+                    bus = buses[bus_name] = FrameBus.attach(bus_name)
+                bus_frame = bus.read(sequence)
+                image = bus_frame.image if bus_frame is not None else None
+            started = time.perf_counter()
+            error = None
+            try:
+                if image is None:
+                    raise LookupError("frame já sobrescrito no barramento")
+                hands = recognizer.detect_hands(image, ColorFormat(color_value))
+                if bus_frame is not None and not bus_frame.is_valid():
+                    raise LookupError("frame sobrescrito no barramento durante a inferência")
+                packed = _pack_hands(hands)
+            except Exception as exc:
+                # Um frame problemático não pode matar o worker nem prender o slot.
+                error = f"{type(exc).__name__}: {exc}"
+                packed = _empty_hands()
+            elapsed_ms = (time.perf_counter() - started) * 1000.0
+            del image, bus_frame  # solta as views antes de devolver o slot
+            results.send((slot, camera_id, sequence, timestamp, elapsed_ms, error) + packed)
+    finally:
+        close = getattr(recognizer, "close", None)
+        if close is not None:
+            close()
+        results.close()
+        for bus in buses.values():
+            bus.close()
+        shm.close()
+
+
+class InferencePool:
+    """Distribui frames entre processos de inferência.
+
+    Modos:
+        "per_camera": a câmera `camera_id` vai sempre para o worker `camera_id % workers`
+            (o rastreamento/ROI de cada worker continua coerente);
+        "round_robin": cada frame vai para o próximo worker com slot livre.
+
+    Quando não há slot livre o frame é descartado (`submit` retorna False): a fila nunca
+    cresce além de `slots_per_worker` frames por worker.
+
+    Erros do reconhecedor voltam como PoolResult vazio com `error`. Um worker que morre
+    é detectado em `submit`/`poll_results` e reiniciado (até `max_restarts` vezes; depois
+    disso os frames dele são descartados).
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        frame_shape: Tuple[int, int, int] = (720, 1280, 3),
+        mode: str = "per_camera",
+        slots_per_worker: int = 2,
+        recognizer_factory: Optional[Callable[..., Any]] = None,
+        recognizer_kwargs: Optional[Dict[str, Any]] = None,
+        start_method: str = "spawn",
+        max_restarts: int = 3,
+    ) -> None:
+        if mode not in ("per_camera", "round_robin"):
+            raise ValueError(f"Modo desconhecido: {mode}")
+        if workers < 1:
+            raise ValueError("É preciso ao menos um worker")
+
+        self.workers = workers
+        self.mode = mode
+        self.slots_per_worker = slots_per_worker
+        self.slot_bytes = int(np.prod(frame_shape))
+        self.submitted = 0
+        self.dropped = 0
+        self.stale_results = 0
+        self.failed_frames = 0
+        self.max_restarts = max_restarts
+        self.worker_restarts = [0] * workers
+
+        self._context = mp.get_context(start_method)
+        self._recognizer_factory = recognizer_factory or _default_recognizer
+        self._recognizer_kwargs = recognizer_kwargs or {}
+        self._shm = shared_memory.SharedMemory(create=True, size=self.slot_bytes * workers * slots_per_worker)
+        self._requests: List[Any] = [None] * workers
+        self._results: List[Optional[Any]] = [None] * workers
+        self._free_slots: List[List[int]] = [[] for _ in range(workers)]
+        self._latest_sequence: Dict[int, int] = {}
+        self._next_worker = 0
+        self._processes: List[Optional[Any]] = [None] * workers
+        for worker_id in range(workers):
+            self._start_worker(worker_id)
+
+    def _start_worker(self, worker_id: int) -> None:
+        """(Re)cria o processo do worker com fila, pipe de resultados e slots novos.
+
+        Resultados ainda não lidos de um processo anterior se perdem junto com o pipe
+        antigo; os slots deles voltam a ficar livres aqui.
+        """
+
+        self._close_results(worker_id)
+        reader, writer = self._context.Pipe(duplex=False)
+        self._requests[worker_id] = self._context.Queue()
+        self._results[worker_id] = reader
+        self._free_slots[worker_id] = list(range(self.slots_per_worker))
+        process = self._context.Process(
+            target=_worker_main,
+            args=(
+                worker_id,
+                self._shm.name,
+                self.slot_bytes,
+                worker_id * self.slots_per_worker,
+                self._requests[worker_id],
+                writer,
+                self._recognizer_factory,
+                self._recognizer_kwargs,
+            ),
+            name=f"InferenceWorker-{worker_id}",
+            daemon=True,
+        )
+        process.start()
+        writer.close()  # Só o worker escreve: com ele morto, o pipe chega ao fim (EOF)
+        self._processes[worker_id] = process
+
+    def _close_results(self, worker_id: int) -> None:
+        reader = self._results[worker_id]
+        if reader is not None:
+            reader.close()
+            self._results[worker_id] = None
+
+    def _check_workers(self) -> None:
+        for worker_id, process in enumerate(self._processes):
+            if process is None or process.is_alive():
+                continue
+            restarts = self.worker_restarts[worker_id]
+            if restarts >= self.max_restarts:
+                print(f"⚠️  Worker de inferência {worker_id} morreu de novo (código {process.exitcode}); "
+                      f"desativado após {restarts} reinícios", file=sys.stderr)
+                self._processes[worker_id] = None
+                self._free_slots[worker_id] = []
+                self._close_results(worker_id)
+                continue
+            print(f"⚠️  Worker de inferência {worker_id} morreu (código {process.exitcode}); reiniciando",
+                  file=sys.stderr)
+            self.worker_restarts[worker_id] = restarts + 1
+            self._start_worker(worker_id)
+
+    @property
+    def alive_workers(self) -> int:
+        return sum(process is not None and process.is_alive() for process in self._processes)
+
+    @property
+    def in_flight(self) -> int:
+        return sum(self.slots_per_worker - len(free) for free in self._free_slots)
+
+    def _pick_worker(self, camera_id: int) -> Optional[int]:
+        if self.mode == "per_camera":
+            worker_id = camera_id % self.workers
+            return worker_id if self._free_slots[worker_id] else None
+
+        for step in range(self.workers):
+            worker_id = (self._next_worker + step) % self.workers
+            if self._free_slots[worker_id]:
+                self._next_worker = (worker_id + 1) % self.workers
+                return worker_id
+        return None
+
+    def submit(
+        self,
+        camera_id: int,
+        frame: Union[np.ndarray, CapturedFrame],
+        color_format: ColorFormat = ColorFormat.RGB,
+        sequence: int = 0,
+        timestamp: Optional[float] = None,
+    ) -> bool:
+        """Copia o frame para um slot compartilhado e o envia a um worker.
+
+        Retorna False (frame descartado) se o worker escolhido estiver sem slots livres.
+        """
+
+        if isinstance(frame, CapturedFrame):
+            color_format = frame.color_format
+            sequence = frame.sequence
+            timestamp = frame.timestamp
+            frame = frame.image
+        if frame.dtype != np.uint8 or frame.nbytes > self.slot_bytes:
+            raise ValueError(f"Frame {frame.shape} {frame.dtype} não cabe no slot de {self.slot_bytes} bytes")
+
+        reserved = self._reserve_slot(camera_id)
+        if reserved is None:
+            return False
+        worker_id, slot = reserved
+        offset = (worker_id * self.slots_per_worker + slot) * self.slot_bytes
+        target = np.ndarray(frame.shape, dtype=np.uint8, buffer=self._shm.buf, offset=offset)
+        np.copyto(target, frame)
+        del target
+        timestamp = time.perf_counter() if timestamp is None else timestamp
+        self._requests[worker_id].put((slot, camera_id, sequence, timestamp, frame.shape, color_format.value, None))
+        self.submitted += 1
+        return True
+
+    def submit_bus(self, camera_id: int, bus: FrameBus, sequence: Optional[int] = None) -> bool:
+        """Envia o frame `sequence` (padrão: o mais recente) de um FrameBus, sem copiá-lo.
+
+        O worker lê o slot do barramento; se o produtor o sobrescrever antes do fim da
+        inferência, o resultado volta vazio com `error`. Retorna False se o frame já não
+        existe ou se o worker está sem slots livres.
+        """
+
+        if sequence is None:
+            sequence = bus.write_sequence
+        frame = bus.read(sequence)
+        if frame is None:
+            self.dropped += 1
+            return False
+        reserved = self._reserve_slot(camera_id)
+        if reserved is None:
+            return False
+        worker_id, slot = reserved
+        self._requests[worker_id].put(
+            (slot, camera_id, sequence, frame.timestamp, bus.frame_shape, bus.color_format.value, bus.name)
+        )
+        self.submitted += 1
+        return True
+
+    def _reserve_slot(self, camera_id: int) -> Optional[Tuple[int, int]]:
+        """Escolhe worker e slot para o próximo frame (None: frame descartado).
+
+        Frames do barramento também ocupam um slot: o limite de frames em voo é o mesmo.
+        """
+
+        self._check_workers()
+        worker_id = self._pick_worker(camera_id)
+        if worker_id is None:
+            self.dropped += 1
+            return None
+        return worker_id, self._free_slots[worker_id].pop()
+
+    def poll_results(self, timeout: Optional[float] = 0.0) -> List[PoolResult]:
+        """Coleta os resultados prontos (espera até `timeout` pelo primeiro).
+
+        Resultados mais antigos que o último já entregue para a mesma câmera (possível no
+        modo round-robin) são descartados.
+        """
+
+        self._check_workers()
+        collected: List[PoolResult] = []
+        readers = {reader: worker_id for worker_id, reader in enumerate(self._results) if reader is not None}
+        if not readers:
+            return collected
+        ready = wait(list(readers), timeout)
+        while ready:
+            for reader in ready:
+                try:
+                    message = reader.recv()
+                except (EOFError, OSError):
+                    readers.pop(reader, None)  # Worker morreu: `_check_workers` o reinicia
+                    continue
+                worker_id = readers[reader]
+                slot, camera_id, sequence, timestamp, elapsed_ms, error, landmarks, handed, scores, gestures = message
+                self._free_slots[worker_id].append(slot)
+                if error is not None:
+                    self.failed_frames += 1
+
+                if sequence and sequence <= self._latest_sequence.get(camera_id, 0):
+                    self.stale_results += 1
+                    continue
+                self._latest_sequence[camera_id] = sequence
+                collected.append(
+                    PoolResult(
+                        camera_id=camera_id,
+                        sequence=sequence,
+                        timestamp=timestamp,
+                        worker_id=worker_id,
+                        landmarks=landmarks,
+                        handedness=handed,
+                        scores=scores,
+                        gestures=gestures,
+                        inference_ms=elapsed_ms,
+                        error=error,
+                    )
+                )
+            ready = wait(list(readers), 0) if readers else []
+        return collected
+
+    def close(self, timeout: float = 5.0) -> None:
+        for worker_id, process in enumerate(self._processes):
+            if process is not None:
+                self._requests[worker_id].put(None)
+        for process in self._processes:
+            if process is None:
+                continue
+            process.join(timeout)
+            if process.is_alive():
+                process.terminate()
+        self._processes = []
+        for worker_id in range(self.workers):
+            self._close_results(worker_id)
+        self._shm.close()
+        self._shm.unlink()
+
+    def __enter__(self) -> "InferencePool":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,198 @@
+"""
+Instrumentation Module
+Medição de latência ponta a ponta: tempo de cada estágio do pipeline em histogramas de
+baldes fixos (p50/p95/p99) e contadores de FPS
+
+Cada histograma e cada contador tem um único escritor (a thread do seu estágio), então o
+caminho quente não usa lock: registrar uma amostra é uma busca binária em bordas fixas e
+um incremento. Leitores (UI, dump JSON) trabalham sobre cópias e toleram estar uma amostra
+atrasados.
+
+Author: Renato Castellani
+Version: 1.0.0
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from bisect import bisect_right
+from enum import Enum
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+
+class Stage(Enum):
+    CAPTURE = "capture"  # capture.read(): inclui a espera pelo próximo frame do driver
+    COLOR_CONVERSION = "color_conversion"  # na thread leitora da câmera (formato de saída)
+    INFERENCE_CONVERSION = "inference_conversion"  # para RGB no recognizer, se o frame chegar em outro formato
+    QUEUE = "queue"  # frame pronto → worker de inferência o pega
+    INFERENCE = "inference"  # MediaPipe (inclui recorte/redimensionamento)
+    CLASSIFICATION = "classification"  # landmarks → gestos
+    SMOOTHING = "smoothing"
+    MAPPING = "mapping"  # gestos → botões/analógicos
+    GAMEPAD_EMIT = "gamepad_emit"
+    END_TO_END = "end_to_end"  # frame capturado → eventos enviados ao gamepad
+    UI_PAINT = "ui_paint"
+    DISPLAY = "display"  # frame capturado → preview pintado
+
+
+class Rate(Enum):
+    CAPTURE = "capture"
+    INFERENCE = "inference"
+    UI = "ui"
+
+
+# Bordas em segundos: 10 µs a ~10 s, 8 baldes por oitava (~9% de resolução).
+_BUCKETS_PER_OCTAVE = 8
+_MIN_EDGE = 10e-6
+_EDGES: List[float] = [_MIN_EDGE * 2.0 ** (k / _BUCKETS_PER_OCTAVE) for k in range(20 * _BUCKETS_PER_OCTAVE + 1)]
+
+
+class LatencyHistogram:
+    """Histograma de latências com baldes logarítmicos fixos (sem alocação por amostra)."""
+
+    edges = _EDGES
+
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        # Troca a lista inteira: um escritor concorrente perde no máximo uma amostra.
+        self._counts = [0] * (len(self.edges) + 1)
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        self._counts[bisect_right(self.edges, seconds)] += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def counts(self) -> List[int]:
+        return list(self._counts)
+
+    @property
+    def count(self) -> int:
+        return sum(self._counts)
+
+    def percentiles(self, quantiles=(0.5, 0.95, 0.99)) -> List[float]:
+        """Percentis em segundos (centro geométrico do balde, limitado ao máximo observado)."""
+
+        counts = self.counts()
+        total = sum(counts)
+        if total == 0:
+            return [0.0] * len(quantiles)
+
+        results = []
+        edges = self.edges
+        for quantile in quantiles:
+            target = max(1, quantile * total)
+            cumulative = 0
+            for idx, bucket in enumerate(counts):
+                cumulative += bucket
+                if cumulative >= target:
+                    break
+            if idx == 0:
+                value = edges[0] / 2
+            elif idx == len(edges):
+                value = self.max
+            else:
+                value = (edges[idx - 1] * edges[idx]) ** 0.5
+            results.append(min(value, self.max))
+        return results
+
+    def summary(self) -> Dict[str, float]:
+        count = self.count
+        p50, p95, p99 = self.percentiles()
+        return {
+            "count": count,
+            "mean_ms": self.total / count * 1000.0 if count else 0.0,
+            "p50_ms": p50 * 1000.0,
+            "p95_ms": p95 * 1000.0,
+            "p99_ms": p99 * 1000.0,
+            "max_ms": self.max * 1000.0,
+        }
+
+
+class RateCounter:
+    """FPS numa janela deslizante; guarda os últimos `capacity` instantes num anel fixo."""
+
+    def __init__(self, window: float = 1.0, capacity: int = 256) -> None:
+        self.window = window
+        self._stamps = [float("-inf")] * capacity
+        self._index = 0
+        self.total = 0
+
+    def tick(self, now: Optional[float] = None) -> None:
+        stamps = self._stamps
+        stamps[self._index] = time.perf_counter() if now is None else now
+        self._index = (self._index + 1) % len(stamps)
+        self.total += 1
+
+    def rate(self, now: Optional[float] = None) -> float:
+        if now is None:
+            now = time.perf_counter()
+        recent = [stamp for stamp in self._stamps if stamp > now - self.window]
+        if len(recent) < 2:
+            return 0.0
+        span = max(recent) - min(recent)
+        return (len(recent) - 1) / span if span > 0 else 0.0
+
+    def reset(self) -> None:
+        self._stamps = [float("-inf")] * len(self._stamps)
+        self._index = 0
+        self.total = 0
+
+
+class PipelineMetrics:
+    """Histogramas por estágio e contadores de FPS do pipeline câmera → gamepad → UI.
+
+    Os componentes recebem esta instância no atributo `metrics` (None desliga a medição).
+    """
+
+    def __init__(self, rate_window: float = 1.0) -> None:
+        self.histograms: Dict[Stage, LatencyHistogram] = {stage: LatencyHistogram() for stage in Stage}
+        self.rates: Dict[Rate, RateCounter] = {rate: RateCounter(rate_window) for rate in Rate}
+        self.started_at = time.time()
+
+    def record(self, stage: Stage, seconds: float) -> None:
+        self.histograms[stage].record(seconds)
+
+    def record_since(self, stage: Stage, started: float) -> float:
+        """Registra `agora - started` e devolve `agora` (para encadear estágios)."""
+
+        now = time.perf_counter()
+        self.histograms[stage].record(now - started)
+        return now
+
+    def tick(self, rate: Rate, now: Optional[float] = None) -> None:
+        self.rates[rate].tick(now)
+
+    def reset(self) -> None:
+        for histogram in self.histograms.values():
+            histogram.reset()
+        for counter in self.rates.values():
+            counter.reset()
+        self.started_at = time.time()
+
+    def snapshot(self) -> Dict[str, object]:
+        now = time.perf_counter()
+        return {
+            "started_at": self.started_at,
+            "uptime_s": time.time() - self.started_at,
+            "stages": {stage.value: histogram.summary() for stage, histogram in self.histograms.items()},
+            "fps": {rate.value: counter.rate(now) for rate, counter in self.rates.items()},
+            "frames": {rate.value: counter.total for rate, counter in self.rates.items()},
+        }
+
+    def dump_json(self, path: Union[str, Path], include_buckets: bool = False) -> Path:
+        """Grava o snapshot em JSON; `include_buckets` acrescenta as contagens brutas."""
+
+        data = self.snapshot()
+        if include_buckets:
+            data["bucket_edges_ms"] = [edge * 1000.0 for edge in LatencyHistogram.edges]
+            data["buckets"] = {stage.value: histogram.counts() for stage, histogram in self.histograms.items()}
+        path = Path(path)
+        path.write_text(json.dumps(data, indent=2), encoding="utf-8")
+        return path
@@ -0,0 +1,154 @@
+"""
+Landmark Recording Module
+Gravação dos landmarks crus do MediaPipe num `.npy` de registros fixos (memory-mappable)
+e reclassificação offline vetorizada, para ajustar regras de gesto sem rodar o vídeo de novo
+
+Cada registro é uma mão: instante, frame, índice da mão no frame, lateralidade, score,
+gesto classificado ao vivo e os 21 landmarks. O cabeçalho `.npy` tem tamanho fixo e é
+reescrito a cada descarga, então o arquivo pode ser aberto com `np.load(mmap_mode="r")`
+enquanto a gravação continua.
+
+Author: Renato Castellani
+Version: 1.0.0
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Callable, Dict, Optional, Union
+
+import numpy as np
+
+from frame_types import npy_header
+from hand_landmarks import GESTURES_BY_CODE, NUM_LANDMARKS, classify_gestures
+
+LANDMARK_RECORD = np.dtype(
+    [
+        ("timestamp", "<f8"),
+        ("frame", "<i8"),
+        ("hand", "u1"),
+        ("handedness", "i1"),  # códigos de hand_landmarks.handedness_code
+        ("gesture", "i1"),  # código do gesto classificado ao vivo
+        ("score", "<f4"),
+        ("landmarks", "<f4", (NUM_LANDMARKS, 3)),
+    ],
+    align=False,
+)
+
+_DESCR = np.lib.format.dtype_to_descr(LANDMARK_RECORD)
+
+
+class LandmarkRecorder:
+    """Acumula mãos num bloco pré-alocado e descarrega em lote no arquivo.
+
+    Ligue num recognizer com `recognizer.landmark_recorder = LandmarkRecorder(caminho)`.
+    """
+
+    def __init__(self, path: Union[str, Path], chunk_size: int = 1024) -> None:
+        self.path = Path(path)
+        self.count = 0
+        self._chunk = np.zeros(chunk_size, dtype=LANDMARK_RECORD)
+        self._buffered = 0
+        self._file = open(self.path, "wb")
+        self._header_size = len(npy_header(_DESCR, (0,), max_dims=1))
+        self._file.write(npy_header(_DESCR, (0,), max_dims=1))
+
+    def write(
+        self,
+        timestamp: float,
+        frame: int,
+        landmarks: np.ndarray,
+        handedness: np.ndarray,
+        scores,
+        gestures: np.ndarray,
+    ) -> None:
+        """Grava as N mãos de um frame (`landmarks` (N, 21, 3), demais colunas com N valores)."""
+
+        hands = len(landmarks)
+        start = 0
+        while start < hands:
+            take = min(hands - start, len(self._chunk) - self._buffered)
+            rows = self._chunk[self._buffered:self._buffered + take]
+            rows["timestamp"] = timestamp
+            rows["frame"] = frame
+            rows["hand"] = np.arange(start, start + take)
+            rows["handedness"] = handedness[start:start + take]
+            rows["gesture"] = gestures[start:start + take]
+            rows["score"] = scores[start:start + take]
+            rows["landmarks"] = landmarks[start:start + take]
+            self._buffered += take
+            start += take
+            if self._buffered == len(self._chunk):
+                self.flush()
+
+    def flush(self) -> None:
+        if self._file is None:
+            return
+        if self._buffered:
+            self._file.write(self._chunk[:self._buffered].tobytes())
+            self.count += self._buffered
+            self._buffered = 0
+        # Atualiza a contagem no cabeçalho: leitores por memmap passam a ver os novos registros.
+        position = self._file.tell()
+        self._file.seek(0)
+        self._file.write(npy_header(_DESCR, (self.count,), max_dims=1))
+        self._file.seek(position)
+        self._file.flush()
+
+    def close(self) -> None:
+        if self._file is None:
+            return
+        self.flush()
+        self._file.close()
+        self._file = None
+
+    def __enter__(self) -> "LandmarkRecorder":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def load_landmark_recording(path: Union[str, Path]) -> np.ndarray:
+    """Abre a gravação por memmap (somente leitura); campos como `records["landmarks"]` são views."""
+
+    records = np.load(path, mmap_mode="r")
+    if records.dtype != LANDMARK_RECORD:
+        raise ValueError(f"{path} não é uma gravação de landmarks (dtype {records.dtype})")
+    return records
+
+
+Classifier = Callable[[np.ndarray, np.ndarray], np.ndarray]
+
+
+def reclassify(
+    records: np.ndarray,
+    classifier: Optional[Classifier] = None,
+    chunk_size: int = 1 << 20,
+) -> np.ndarray:
+    """Roda `classifier(landmarks, handedness)` sobre todos os registros, em blocos.
+
+    O padrão é o classificador atual (`classify_gestures`); passe outro (ex.:
+    `functools.partial(classify_gestures, threshold=0.03)`) para testar regras novas.
+    Os blocos limitam a memória ao ler gravações maiores que a RAM.
+    """
+
+    classifier = classifier or classify_gestures
+    codes = np.empty(len(records), dtype=np.int8)
+    for start in range(0, len(records), chunk_size):
+        block = records[start:start + chunk_size]
+        codes[start:start + chunk_size] = classifier(block["landmarks"], block["handedness"])
+    return codes
+
+
+def confusion_matrix(reference: np.ndarray, candidate: np.ndarray) -> np.ndarray:
+    """Matriz (gestos x gestos): linhas = código de referência, colunas = código candidato."""
+
+    size = len(GESTURES_BY_CODE)
+    flat = reference.astype(np.int64) * size + candidate.astype(np.int64)
+    return np.bincount(flat, minlength=size * size).reshape(size, size)
+
+
+def gesture_counts(codes: np.ndarray) -> Dict[str, int]:
+    counts = np.bincount(codes.astype(np.int64), minlength=len(GESTURES_BY_CODE))
+    return {GESTURES_BY_CODE[code].value: int(count) for code, count in enumerate(counts)}
@@ -1,16 +1,18 @@
 #!/usr/bin/env python3
 """
 NoTouchPad - Web GUI Minimal
-Interface gráfica web usando apenas bibliotecas padrão do Python
-Preparada para exibir webcam no futuro
+Interface gráfica web; o servidor usa apenas bibliotecas padrão do Python
+O preview da câmera (stream MJPEG) usa OpenCV quando disponível; sem ele o painel da
+câmera mostra só o gesto e o comando atuais
 
 Author: Renato Castellani
 Version: 1.0.0
 """
 
+import argparse
 import http.server
-import socketserver
 import threading
+from concurrent.futures import ThreadPoolExecutor
 import webbrowser
 import json
 import time
@@ -19,12 +21,44 @@ import sys
 from pathlib import Path
 from urllib.parse import urlparse, parse_qs
 
+from static_assets import AssetStore
+from web_control import MSG_GESTURE, MSG_STICK, ControlHub, ResetScheduler, websocket_accept
+from web_events import EventBroadcaster, EventFanout, format_sse
+
 class NoTouchPadWebGUI:
     """
     Interface gráfica web para o NoTouchPad
     """
     
-    def __init__(self, port=8080):
+    # Atributo de estado → campo no JSON enviado ao navegador
+    STATE_FIELDS = {
+        'is_running': 'is_running',
+        'is_auto_simulation': 'is_auto',
+        'current_gesture': 'gesture',
+        'current_command': 'command',
+        'left_stick': 'left_stick',
+        'right_stick': 'right_stick',
+    }
+    
+    # Chave do gesto manual (POST) → gesto; a posição é o código no canal WebSocket
+    GESTURE_KEYS = {
+        'punch': "✊ Punho",
+        'open': "✋ Mão Aberta",
+        'point': "👆 Apontando",
+        'thumbs': "👍 Joinha",
+        'stop': "🤚 Pare"
+    }
+    
+    GESTURE_ICONS = {
+        "✊ Punho": "✊",
+        "✋ Mão Aberta": "✋", 
+        "👆 Apontando": "👆",
+        "👍 Joinha": "👍",
+        "🤚 Pare": "🤚"
+    }
+    
+    def __init__(self, port=8080, heartbeat_interval=15.0, camera_index=0,
+                 stream_quality=75, stream_width=640, stream_fps=15.0):
         self.port = port
         self.is_running = False
         self.is_auto_simulation = False
@@ -39,361 +73,164 @@ class NoTouchPadWebGUI:
             "🤚 Pare": "⏹️ Stop"
         }
         self.gesture_index = 0
+        self.left_stick = (0.0, 0.0)
+        self.right_stick = (0.0, 0.0)
         self.messages = []
         self.max_messages = 10
         
+        # Canal SSE: cada mudança de estado vira um evento com só os campos alterados,
+        # escrito por uma única thread em todos os navegadores conectados
+        self._state_lock = threading.RLock()
+        self.events = EventBroadcaster()
+        self.fanout = self.events.subscribe(EventFanout(self.snapshot_event, heartbeat_interval))
+        
+        # Página, CSS e JS lidos e comprimidos uma única vez
+        self.assets = AssetStore()
+        
+        # Controle remoto por WebSocket e um único agendador para os resets temporizados
+        self.scheduler = ResetScheduler()
+        self.control = ControlHub(self.handle_control_message)
+        
+        # Stream MJPEG da câmera: codificado uma vez por frame, só enquanto alguém assiste
+        self.stream = self._create_stream(camera_index, stream_quality, stream_width, stream_fps)
+        
+    def _create_stream(self, camera_index, quality, width, fps):
+        """
+        Cria o MjpegStreamer; None se OpenCV/NumPy não estiverem instalados
+        """
+        try:
+            from camera_detector import CameraDetector
+            from frame_types import ColorFormat
+            from mjpeg_stream import MjpegStreamer, draw_overlay
+        except ImportError as exc:
+            print(f"⚠️  Preview da câmera indisponível: {exc}", file=sys.stderr)
+            return None
+        
+        self._draw_overlay = draw_overlay
+        return MjpegStreamer(
+            CameraDetector(camera_index, output_format=ColorFormat.BGR),
+            quality=quality,
+            width=width,
+            fps=fps,
+            overlay=self.draw_stream_overlay,
+        )
+        
     def add_message(self, message):
         """
         Adiciona mensagem ao log
         """
         timestamp = time.strftime("%H:%M:%S")
-        self.messages.append(f"[{timestamp}] {message}")
+        line = f"[{timestamp}] {message}"
         
-        if len(self.messages) > self.max_messages:
-            self.messages = self.messages[-self.max_messages:]
+        with self._state_lock:
+            self.messages.append(line)
+            
+            if len(self.messages) > self.max_messages:
+                self.messages = self.messages[-self.max_messages:]
+            
+            self.events.publish('log', {'text': line})
         
         print(f"LOG: {message}", file=sys.stderr)
     
-    def get_html_template(self):
+    def update_state(self, **changes):
         """
-        Template HTML da interface
+        Aplica mudanças de estado e publica apenas os campos que mudaram
         """
-        return """<!DOCTYPE html>
-<html lang="pt-BR">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>NoTouchPad v1.0.0</title>
-    <style>
-        * { margin: 0; padding: 0; box-sizing: border-box; }
-        
-        body {
-            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            color: white;
-            min-height: 100vh;
-            padding: 20px;
-        }
-        
-        .container {
-            max-width: 1200px;
-            margin: 0 auto;
-            display: grid;
-            grid-template-columns: 1fr 1fr;
-            grid-gap: 20px;
-            height: calc(100vh - 40px);
-        }
-        
-        .panel {
-            background: rgba(255, 255, 255, 0.1);
-            backdrop-filter: blur(10px);
-            border-radius: 15px;
-            padding: 20px;
-            border: 1px solid rgba(255, 255, 255, 0.2);
-        }
-        
-        .header {
-            grid-column: 1 / -1;
-            text-align: center;
-            padding: 15px;
-            margin-bottom: 20px;
-        }
-        
-        .header h1 {
-            font-size: 2.5em;
-            margin-bottom: 10px;
-            text-shadow: 2px 2px 4px rgba(0,0,0,0.3);
-        }
-        
-        .header p {
-            font-size: 1.2em;
-            opacity: 0.9;
-        }
-        
-        .camera-panel {
-            display: flex;
-            flex-direction: column;
-        }
-        
-        .camera-preview {
-            flex: 1;
-            background: rgba(0, 0, 0, 0.3);
-            border-radius: 10px;
-            display: flex;
-            align-items: center;
-            justify-content: center;
-            margin-bottom: 20px;
-            border: 2px dashed rgba(255, 255, 255, 0.3);
-            position: relative;
-            min-height: 300px;
-        }
-        
-        .preview-content {
-            text-align: center;
-            font-size: 1.5em;
-        }
-        
-        .gesture-display {
-            font-size: 3em;
-            margin: 20px 0;
-        }
-        
-        .status-panel {
-            display: flex;
-            flex-direction: column;
-        }
-        
-        .status-info {
-            background: rgba(0, 0, 0, 0.2);
-            border-radius: 10px;
-            padding: 15px;
-            margin-bottom: 20px;
-        }
-        
-        .status-item {
-            display: flex;
-            justify-content: space-between;
-            margin-bottom: 10px;
-            font-size: 1.1em;
-        }
-        
-        .controls {
-            margin-bottom: 20px;
-        }
-        
-        .btn-group {
-            display: flex;
-            gap: 10px;
-            margin-bottom: 15px;
-            flex-wrap: wrap;
-        }
-        
-        .btn {
-            background: rgba(255, 255, 255, 0.2);
-            border: none;
-            color: white;
-            padding: 12px 20px;
-            border-radius: 25px;
-            cursor: pointer;
-            font-size: 1em;
-            transition: all 0.3s ease;
-            backdrop-filter: blur(5px);
-            border: 1px solid rgba(255, 255, 255, 0.3);
-        }
-        
-        .btn:hover {
-            background: rgba(255, 255, 255, 0.3);
-            transform: translateY(-2px);
-            box-shadow: 0 5px 15px rgba(0,0,0,0.3);
-        }
-        
-        .btn:active {
-            transform: translateY(0);
-        }
-        
-        .btn.primary {
-            background: rgba(76, 175, 80, 0.6);
-        }
-        
-        .btn.danger {
-            background: rgba(244, 67, 54, 0.6);
-        }
-        
-        .btn.warning {
-            background: rgba(255, 152, 0, 0.6);
-        }
-        
-        .gesture-buttons {
-            display: grid;
-            grid-template-columns: 1fr 1fr;
-            gap: 10px;
-            margin-bottom: 20px;
-        }
-        
-        .gesture-btn {
-            padding: 15px;
-            font-size: 1.1em;
-            text-align: center;
-        }
-        
-        .messages {
-            flex: 1;
-            background: rgba(0, 0, 0, 0.3);
-            border-radius: 10px;
-            padding: 15px;
-            overflow-y: auto;
-            max-height: 200px;
-        }
-        
-        .message {
-            margin-bottom: 5px;
-            font-family: monospace;
-            font-size: 0.9em;
-            opacity: 0.9;
-        }
-        
-        .indicator {
-            display: inline-block;
-            width: 12px;
-            height: 12px;
-            border-radius: 50%;
-            margin-right: 8px;
-        }
-        
-        .indicator.active { background: #4CAF50; }
-        .indicator.inactive { background: #F44336; }
-        
-        @media (max-width: 768px) {
-            .container {
-                grid-template-columns: 1fr;
-                gap: 15px;
-            }
+        with self._state_lock:
+            delta = {}
+            for attribute, value in changes.items():
+                if getattr(self, attribute) != value:
+                    setattr(self, attribute, value)
+                    delta[self.STATE_FIELDS[attribute]] = value
             
-            .gesture-buttons {
-                grid-template-columns: 1fr;
-            }
-            
-            .btn-group {
-                flex-direction: column;
-            }
-        }
-        
-        .pulse {
-            animation: pulse 2s infinite;
-        }
-        
-        @keyframes pulse {
-            0% { opacity: 1; }
-            50% { opacity: 0.5; }
-            100% { opacity: 1; }
-        }
-    </style>
-</head>
-<body>
-    <div class="container">
-        <div class="header panel">
-            <h1>🎮 NoTouchPad</h1>
-            <p>Gamepad Controlado por Webcam - Interface Gráfica</p>
-        </div>
-        
-        <div class="camera-panel panel">
-            <h3>📹 Preview da Câmera</h3>
-            <div class="camera-preview" id="cameraPreview">
-                <div class="preview-content">
-                    <div id="cameraStatus">📷 Câmera será exibida aqui</div>
-                    <div class="gesture-display" id="gestureDisplay">🤚</div>
-                    <div id="commandDisplay">Aguardando...</div>
-                </div>
-            </div>
-        </div>
-        
-        <div class="status-panel panel">
-            <h3>📊 Status do Sistema</h3>
-            <div class="status-info">
-                <div class="status-item">
-                    <span>Status:</span>
-                    <span><span class="indicator" id="statusIndicator"></span><span id="statusText">Parado</span></span>
-                </div>
-                <div class="status-item">
-                    <span>Modo:</span>
-                    <span id="modeText">Manual</span>
-                </div>
-                <div class="status-item">
-                    <span>Gesto:</span>
-                    <span id="currentGesture">Nenhum</span>
-                </div>
-                <div class="status-item">
-                    <span>Comando:</span>
-                    <span id="currentCommand">Standby</span>
-                </div>
-            </div>
-            
-            <div class="controls">
-                <h4>🎮 Controles Principais</h4>
-                <div class="btn-group">
-                    <button class="btn primary" onclick="startManual()">▶️ Manual</button>
-                    <button class="btn primary" onclick="startAuto()">🔄 Auto</button>
-                    <button class="btn danger" onclick="stopDetection()">⏹️ Parar</button>
-                </div>
-                
-                <h4>👋 Gestos Manuais</h4>
-                <div class="gesture-buttons">
-                    <button class="btn gesture-btn" onclick="sendGesture('punch')">✊ Punho</button>
-                    <button class="btn gesture-btn" onclick="sendGesture('open')">✋ Aberta</button>
-                    <button class="btn gesture-btn" onclick="sendGesture('point')">👆 Apontar</button>
-                    <button class="btn gesture-btn" onclick="sendGesture('thumbs')">👍 Joinha</button>
-                    <button class="btn gesture-btn warning" onclick="sendGesture('stop')">🤚 Pare</button>
-                </div>
-            </div>
-            
-            <div class="messages">
-                <h4>📝 Log de Mensagens</h4>
-                <div id="messagesList"></div>
-            </div>
-        </div>
-    </div>
-    
-    <script>
-        let isRunning = false;
-        let isAuto = false;
-        
-        // Atualiza status na tela
-        function updateStatus() {
-            fetch('/api/status')
-                .then(response => response.json())
-                .then(data => {
-                    document.getElementById('statusText').textContent = data.is_running ? 'Ativo' : 'Parado';
-                    document.getElementById('statusIndicator').className = 'indicator ' + (data.is_running ? 'active' : 'inactive');
-                    document.getElementById('modeText').textContent = data.is_auto ? 'Automático' : 'Manual';
-                    document.getElementById('currentGesture').textContent = data.gesture;
-                    document.getElementById('currentCommand').textContent = data.command;
-                    
-                    // Atualiza preview
-                    document.getElementById('gestureDisplay').textContent = data.gesture_icon || '🤚';
-                    document.getElementById('commandDisplay').textContent = data.command;
-                    
-                    if (data.is_running) {
-                        document.getElementById('cameraPreview').classList.add('pulse');
-                    } else {
-                        document.getElementById('cameraPreview').classList.remove('pulse');
-                    }
-                    
-                    // Atualiza mensagens
-                    const messagesList = document.getElementById('messagesList');
-                    messagesList.innerHTML = data.messages.map(msg => 
-                        `<div class="message">${msg}</div>`
-                    ).join('');
-                    messagesList.scrollTop = messagesList.scrollHeight;
-                });
-        }
-        
-        // Funções de controle
-        function startManual() {
-            fetch('/api/start_manual', {method: 'POST'});
-        }
-        
-        function startAuto() {
-            fetch('/api/start_auto', {method: 'POST'});
-        }
-        
-        function stopDetection() {
-            fetch('/api/stop', {method: 'POST'});
-        }
-        
-        function sendGesture(gesture) {
-            fetch('/api/gesture', {
-                method: 'POST',
-                headers: {'Content-Type': 'application/json'},
-                body: JSON.stringify({gesture: gesture})
-            });
-        }
-        
-        // Atualiza a cada 500ms
-        setInterval(updateStatus, 500);
-        updateStatus(); // Primeira atualização
-    </script>
-</body>
-</html>"""
+            if 'gesture' in delta:
+                delta['gesture_icon'] = self.GESTURE_ICONS.get(self.current_gesture, '🤚')
+            if delta:
+                self.events.publish('state', delta)
+    
+    def get_status(self):
+        """
+        Estado completo (usado pelo /api/status e pelo snapshot inicial do SSE)
+        """
+        with self._state_lock:
+            status = {field: getattr(self, attribute) for attribute, field in self.STATE_FIELDS.items()}
+            status['gesture_icon'] = self.GESTURE_ICONS.get(self.current_gesture, '🤚')
+            status['messages'] = self.messages[-5:]  # Últimas 5 mensagens
+            return status
+    
+    def open_event_stream(self, sock):
+        """
+        Entrega um socket SSE (cabeçalho já enviado) à fanout; o snapshot é tirado sob o
+        mesmo lock das publicações, então nenhum delta se perde nem é repetido
+        """
+        with self._state_lock:
+            self.fanout.attach(sock, b"retry: 2000\n\n" + self.snapshot_event())
+    
+    def snapshot_event(self):
+        """
+        Evento SSE com o estado completo
+        """
+        with self._state_lock:
+            return format_sse('snapshot', self.get_status(), self.events.last_id)
+    
+    def get_html_template(self):
+        """
+        HTML da interface (src/web/index.html, já apontando para os assets versionados)
+        """
+        return self.assets.index_html
+    
+    def apply_gesture(self, gesture_key):
+        """
+        Aplica um gesto manual (POST ou WebSocket); retorna False se a chave não existe
+        """
+        if gesture_key not in self.GESTURE_KEYS:
+            return False
+        gesture = self.GESTURE_KEYS[gesture_key]
+        command = self.commands[gesture]
+        
+        self.update_state(current_gesture=gesture, current_command=command)
+        self.add_message(f"Manual: {gesture} → {command}")
+        
+        # Simula ativação por 1 segundo (um novo gesto adia o reset)
+        if not self.is_auto_simulation:
+            self.scheduler.schedule('manual_reset', 1.0, self.reset_manual)
+        return True
+    
+    def reset_manual(self):
+        """
+        Reseta estado manual após gesto
+        """
+        if not self.is_auto_simulation and self.is_running:
+            self.update_state(current_gesture="Manual ativo", current_command="Aguardando gesto...")
+    
+    def handle_control_message(self, message):
+        """
+        Mensagem binária do canal WebSocket (roda na thread do ControlHub)
+        """
+        if message.kind == MSG_GESTURE:
+            keys = list(self.GESTURE_KEYS)
+            return message.arg < len(keys) and self.apply_gesture(keys[message.arg])
+        if message.kind == MSG_STICK and message.arg in (0, 1):
+            position = (round(message.x, 3), round(message.y, 3))
+            self.update_state(**{'left_stick' if message.arg == 0 else 'right_stick': position})
+            return True
+        return False
+    
+    def draw_stream_overlay(self, image):
+        """
+        Overlay do stream MJPEG: gesto e comando atuais
+        """
+        self._draw_overlay(image, self.current_gesture, self.current_command)
+    
+    def close(self):
+        """
+        Encerra os streams SSE e MJPEG abertos (e libera a câmera)
+        """
+        self.events.close()
+        if self.stream is not None:
+            self.stream.close()
+        self.control.close()
+        self.scheduler.close()
     
     def simulate_auto_detection(self):
         """
@@ -403,8 +240,7 @@ class NoTouchPadWebGUI:
             gesture = self.gestures[self.gesture_index]
             command = self.commands[gesture]
             
-            self.current_gesture = gesture
-            self.current_command = command
+            self.update_state(current_gesture=gesture, current_command=command)
             self.add_message(f"Auto: {gesture} → {command}")
             
             self.gesture_index = (self.gesture_index + 1) % len(self.gestures)
@@ -419,6 +255,11 @@ class NoTouchPadRequestHandler(http.server.SimpleHTTPRequestHandler):
     Handler para requisições HTTP
     """
     
+    # HTTP/1.1: a conexão é reaproveitada entre requisições (keep-alive)
+    protocol_version = 'HTTP/1.1'
+    # Conexão keep-alive ociosa por mais que isso libera o worker
+    timeout = 5
+    
     def __init__(self, *args, gui_instance=None, **kwargs):
         self.gui = gui_instance
         super().__init__(*args, **kwargs)
@@ -429,139 +270,249 @@ class NoTouchPadRequestHandler(http.server.SimpleHTTPRequestHandler):
         """
         path = urlparse(self.path).path
         
-        if path == '/' or path == '/index.html':
-            self.send_response(200)
-            self.send_header('Content-type', 'text/html; charset=utf-8')
-            self.end_headers()
-            self.wfile.write(self.gui.get_html_template().encode('utf-8'))
+        asset = self.gui.assets.lookup(path)
+        if asset is not None:
+            self._send_asset(asset)
             
         elif path == '/api/status':
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.end_headers()
+            self._send_body(json.dumps(self.gui.get_status()).encode('utf-8'), 'application/json')
             
-            # Ícones dos gestos
-            gesture_icons = {
-                "✊ Punho": "✊",
-                "✋ Mão Aberta": "✋", 
-                "👆 Apontando": "👆",
-                "👍 Joinha": "👍",
-                "🤚 Pare": "🤚"
-            }
+        elif path == '/api/events':
+            self._stream_events()
             
-            status = {
-                'is_running': self.gui.is_running,
-                'is_auto': self.gui.is_auto_simulation,
-                'gesture': self.gui.current_gesture,
-                'command': self.gui.current_command,
-                'gesture_icon': gesture_icons.get(self.gui.current_gesture, '🤚'),
-                'messages': self.gui.messages[-5:]  # Últimas 5 mensagens
-            }
+        elif path == '/stream.mjpg':
+            self._stream_mjpeg()
             
-            self.wfile.write(json.dumps(status).encode('utf-8'))
+        elif path == '/ws/control':
+            self._open_control_socket()
+        else:
+            self.send_error(404)
+    
+    def do_HEAD(self):
+        """
+        Trata requisições HEAD (só para os arquivos estáticos)
+        """
+        asset = self.gui.assets.lookup(urlparse(self.path).path)
+        if asset is not None:
+            self._send_asset(asset, include_body=False)
         else:
             self.send_error(404)
     
+    def _send_asset(self, asset, include_body=True):
+        """
+        Arquivo estático pré-comprimido: 304 se o ETag do navegador ainda vale
+        """
+        if asset.matches(self.headers.get('If-None-Match')):
+            encoding, _ = asset.negotiate(self.headers.get('Accept-Encoding'))
+            self.send_response(304)
+            self.send_header('ETag', asset.etag(encoding))
+            self.send_header('Cache-Control', asset.cache_control)
+            self.send_header('Vary', 'Accept-Encoding')
+            self.end_headers()
+            return
+        
+        encoding, body = asset.negotiate(self.headers.get('Accept-Encoding'))
+        self.send_response(200)
+        self.send_header('Content-type', asset.content_type)
+        if encoding != 'identity':
+            self.send_header('Content-Encoding', encoding)
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', asset.etag(encoding))
+        self.send_header('Cache-Control', asset.cache_control)
+        self.send_header('Vary', 'Accept-Encoding')
+        self.end_headers()
+        if include_body:
+            self.wfile.write(body)
+    
+    def _send_body(self, body=b'', content_type=None, status=200):
+        """
+        Resposta completa com Content-Length (obrigatório para manter a conexão aberta)
+        """
+        self.send_response(status)
+        if content_type:
+            self.send_header('Content-type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+    
+    def _stream_events(self):
+        """
+        Stream SSE: envia o cabeçalho e entrega o socket à fanout da GUI, que manda o
+        snapshot, os deltas conforme acontecem e um heartbeat quando o canal fica ocioso;
+        o worker volta ao pool na hora
+        """
+        self.send_response(200)
+        self.send_header('Content-type', 'text/event-stream; charset=utf-8')
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('X-Accel-Buffering', 'no')
+        self.end_headers()
+        self.wfile.flush()
+        
+        self.server.detach(self.request)
+        self.gui.open_event_stream(self.request)
+        self.close_connection = True
+    
+    def _stream_mjpeg(self):
+        """
+        Stream MJPEG: envia o cabeçalho multipart e entrega o socket ao streamer da GUI,
+        que compartilha o mesmo JPEG entre todos os espectadores
+        """
+        stream = self.gui.stream
+        if stream is None:
+            # Sem OpenCV: o <img> falha e a página fica com o painel de gesto
+            self._send_body(b'Stream indisponivel', 'text/plain; charset=utf-8', status=404)
+            return
+        
+        self.send_response(200)
+        self.send_header('Content-type', stream.content_type)
+        self.send_header('Cache-Control', 'no-cache, no-store')
+        self.send_header('X-Accel-Buffering', 'no')
+        self.end_headers()
+        self.wfile.flush()
+        
+        self.server.detach(self.request)
+        stream.add_viewer(self.request)
+        self.close_connection = True
+    
+    def _open_control_socket(self):
+        """
+        Handshake WebSocket do canal de controle; o socket segue para o ControlHub da GUI
+        """
+        key = self.headers.get('Sec-WebSocket-Key')
+        if self.headers.get('Upgrade', '').lower() != 'websocket' or not key:
+            self._send_body(b'WebSocket esperado', 'text/plain; charset=utf-8', status=400)
+            return
+        
+        self.send_response(101)
+        self.send_header('Upgrade', 'websocket')
+        self.send_header('Connection', 'Upgrade')
+        self.send_header('Sec-WebSocket-Accept', websocket_accept(key))
+        self.end_headers()
+        self.wfile.flush()
+        
+        self.server.detach(self.request)
+        self.gui.control.attach(self.request)
+        self.close_connection = True
+    
     def do_POST(self):
         """
         Trata requisições POST
         """
         path = urlparse(self.path).path
+        # Corpo sempre consumido: sobras quebrariam a próxima requisição da conexão
+        post_data = self.rfile.read(int(self.headers.get('Content-Length') or 0))
         
         if path == '/api/start_manual':
             if not self.gui.is_running:
-                self.gui.is_running = True
-                self.gui.is_auto_simulation = False
-                self.gui.current_gesture = "Manual ativo"
-                self.gui.current_command = "Aguardando gesto..."
+                self.gui.update_state(
+                    is_running=True,
+                    is_auto_simulation=False,
+                    current_gesture="Manual ativo",
+                    current_command="Aguardando gesto...",
+                )
                 self.gui.add_message("👆 Modo manual iniciado")
             
-            self.send_response(200)
-            self.end_headers()
+            self._send_body()
             
         elif path == '/api/start_auto':
             if not self.gui.is_running:
-                self.gui.is_running = True
-                self.gui.is_auto_simulation = True
+                self.gui.update_state(is_running=True, is_auto_simulation=True)
                 self.gui.add_message("🔄 Simulação automática iniciada")
                 
                 thread = threading.Thread(target=self.gui.simulate_auto_detection, daemon=True)
                 thread.start()
             
-            self.send_response(200)
-            self.end_headers()
+            self._send_body()
             
         elif path == '/api/stop':
             if self.gui.is_running:
-                self.gui.is_running = False
-                self.gui.is_auto_simulation = False
-                self.gui.current_gesture = "Parado"
-                self.gui.current_command = "Sistema em standby"
+                self.gui.update_state(
+                    is_running=False,
+                    is_auto_simulation=False,
+                    current_gesture="Parado",
+                    current_command="Sistema em standby",
+                )
                 self.gui.add_message("⏹️ Detecção parada")
             
-            self.send_response(200)
-            self.end_headers()
+            self._send_body()
             
         elif path == '/api/gesture':
-            content_length = int(self.headers['Content-Length'])
-            post_data = self.rfile.read(content_length)
             data = json.loads(post_data.decode('utf-8'))
-            
-            gesture_map = {
-                'punch': "✊ Punho",
-                'open': "✋ Mão Aberta",
-                'point': "👆 Apontando",
-                'thumbs': "👍 Joinha",
-                'stop': "🤚 Pare"
-            }
-            
-            gesture_key = data.get('gesture')
-            if gesture_key in gesture_map:
-                gesture = gesture_map[gesture_key]
-                command = self.gui.commands[gesture]
-                
-                self.gui.current_gesture = gesture
-                self.gui.current_command = command
-                self.gui.add_message(f"Manual: {gesture} → {command}")
-                
-                # Simula ativação por 1 segundo
-                if not self.gui.is_auto_simulation:
-                    threading.Timer(1.0, lambda: self._reset_manual()).start()
-            
-            self.send_response(200)
-            self.end_headers()
+            self.gui.apply_gesture(data.get('gesture'))
+            self._send_body()
         else:
             self.send_error(404)
     
-    def _reset_manual(self):
-        """
-        Reseta estado manual após gesto
-        """
-        if not self.gui.is_auto_simulation and self.gui.is_running:
-            self.gui.current_gesture = "Manual ativo"
-            self.gui.current_command = "Aguardando gesto..."
-    
     def log_message(self, format, *args):
         """
         Suprime logs do servidor HTTP
         """
         pass
 
-def create_server(gui_instance, port):
+class NoTouchPadServer(http.server.ThreadingHTTPServer):
+    """
+    Servidor HTTP com pool limitado de workers; streams SSE saem do pool (ficam com a fanout)
+    """
+    allow_reuse_address = True
+    request_queue_size = 128
+    
+    def __init__(self, server_address, handler_class, max_workers=32):
+        super().__init__(server_address, handler_class)
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='WebGUIWorker')
+        self._detached = set()
+        self._detached_lock = threading.Lock()
+    
+    def process_request(self, request, client_address):
+        self._pool.submit(self.process_request_thread, request, client_address)
+    
+    def detach(self, request):
+        """
+        O socket passa a outro dono: o servidor não o fecha ao fim do handler
+        """
+        with self._detached_lock:
+            self._detached.add(request)
+    
+    def shutdown_request(self, request):
+        with self._detached_lock:
+            if request in self._detached:
+                self._detached.discard(request)
+                return
+        super().shutdown_request(request)
+    
+    def server_close(self):
+        super().server_close()
+        self._pool.shutdown(wait=False)
+
+def create_server(gui_instance, port, max_workers=32):
     """
     Cria servidor HTTP com instância da GUI
     """
     handler = lambda *args, **kwargs: NoTouchPadRequestHandler(*args, gui_instance=gui_instance, **kwargs)
-    return socketserver.TCPServer(("", port), handler)
+    return NoTouchPadServer(("", port), handler, max_workers=max_workers)
 
 def main():
     """
     Função principal
     """
+    parser = argparse.ArgumentParser(description="NoTouchPad Web GUI")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--camera", type=int, default=0, help="índice da câmera do stream")
+    parser.add_argument("--jpeg-quality", type=int, default=75, help="qualidade JPEG do stream (1-100)")
+    parser.add_argument("--stream-width", type=int, default=640, help="largura máxima do stream em pixels")
+    parser.add_argument("--stream-fps", type=float, default=15.0, help="FPS máximo do stream")
+    args = parser.parse_args()
+    
     print("🎮 NoTouchPad Web GUI - Iniciando...")
     
     try:
-        gui = NoTouchPadWebGUI()
+        gui = NoTouchPadWebGUI(
+            port=args.port,
+            camera_index=args.camera,
+            stream_quality=args.jpeg_quality,
+            stream_width=args.stream_width,
+            stream_fps=args.stream_fps,
+        )
         gui.add_message("🌐 Servidor web iniciando...")
         
         # Cria servidor
@@ -590,6 +541,7 @@ def main():
                 time.sleep(1)
         except KeyboardInterrupt:
             print("\n🛑 Encerrando servidor...")
+            gui.close()
             server.shutdown()
             gui.add_message("👋 Servidor encerrado")
     
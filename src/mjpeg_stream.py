@@ -0,0 +1,221 @@
+"""
+MJPEG Stream Module
+Stream MJPEG (multipart/x-mixed-replace) da câmera para a interface web: cada frame é
+reduzido, recebe o overlay e é codificado em JPEG uma única vez, e os mesmos bytes vão
+para todos os espectadores
+
+Um cliente lento pula frames: um frame novo só entra no buffer de quem já terminou de
+receber o anterior. Sem espectadores, a thread de codificação termina e a câmera é
+liberada.
+
+Author: Renato Castellani
+Version: 1.0.0
+"""
+
+from __future__ import annotations
+
+import socket
+import threading
+import time
+import unicodedata
+from typing import Callable, Iterable, Optional
+
+import cv2
+import numpy as np
+
+from camera_detector import CameraDetector
+from frame_types import ColorFormat
+from hand_landmarks import HandPosition
+from web_events import CLOSED, SocketFanout
+
+BOUNDARY = "frame"
+CONTENT_TYPE = f"multipart/x-mixed-replace; boundary={BOUNDARY}"
+
+# Cadeias punho → ponta de cada dedo, para desenhar o esqueleto da mão.
+_FINGER_CHAINS = [[0, 1, 2, 3, 4]] + [[0] + list(range(first, first + 4)) for first in (5, 9, 13, 17)]
+
+
+def ascii_label(text: str) -> str:
+    """Remove acentos e emoji: a fonte Hershey do OpenCV só desenha ASCII."""
+
+    normalized = unicodedata.normalize("NFKD", text)
+    return " ".join(normalized.encode("ascii", "ignore").decode("ascii").split())
+
+
+def draw_overlay(image: np.ndarray, title: str, subtitle: str = "", hands: Iterable[HandPosition] = ()) -> None:
+    """Desenha no lugar o esqueleto das mãos e uma faixa inferior com gesto e comando."""
+
+    height, width = image.shape[:2]
+    scale = np.array([width, height], dtype=np.float32)
+    for hand in hands:
+        if hand.landmarks is None:
+            continue
+        points = (hand.landmarks[:, :2] * scale).astype(np.int32)
+        cv2.polylines(image, [points[chain] for chain in _FINGER_CHAINS], False, (80, 220, 120), 2, cv2.LINE_AA)
+        for x, y in points:
+            cv2.circle(image, (int(x), int(y)), 3, (255, 255, 255), -1, cv2.LINE_AA)
+
+    band = max(28, height // 8)
+    image[height - band:] //= 2  # escurece a faixa sem alocar
+    font_scale = band / 60.0
+    cv2.putText(image, ascii_label(title), (10, height - band // 2), cv2.FONT_HERSHEY_SIMPLEX,
+                font_scale, (255, 255, 255), 2, cv2.LINE_AA)
+    if subtitle:
+        cv2.putText(image, ascii_label(subtitle), (10, height - band // 8), cv2.FONT_HERSHEY_SIMPLEX,
+                    font_scale * 0.6, (200, 200, 200), 1, cv2.LINE_AA)
+
+
+def encode_part(jpeg: bytes) -> bytes:
+    """Uma parte do multipart: cabeçalho, JPEG e o fim da parte."""
+
+    header = f"--{BOUNDARY}\r\nContent-Type: image/jpeg\r\nContent-Length: {len(jpeg)}\r\n\r\n"
+    return header.encode("ascii") + jpeg + b"\r\n"
+
+
+class MjpegFanout(SocketFanout):
+    """Fanout de frames: só o mais novo importa e cliente ocupado pula o frame."""
+
+    def __init__(self) -> None:
+        self.skipped_frames = 0
+        super().__init__(name="MjpegFanout")
+
+    def put(self, message) -> None:
+        with self._lock:
+            # Frames que a thread ainda não distribuiu já estão velhos.
+            while self._messages and self._messages[-1][1] is not CLOSED:
+                self._messages.pop()
+        super().put(message)
+
+    def _queue(self, client, message: bytes) -> None:
+        if client.pending:
+            self.skipped_frames += 1  # Ainda recebendo o frame anterior
+        else:
+            client.pending += message
+
+
+class MjpegStreamer:
+    """Captura, overlay e codificação sob demanda, compartilhados por todos os espectadores.
+
+    `overlay(image)` desenha no frame já reduzido (BGR) antes da codificação.
+    """
+
+    content_type = CONTENT_TYPE
+
+    def __init__(
+        self,
+        camera: CameraDetector,
+        quality: int = 75,
+        width: int = 640,
+        fps: float = 15.0,
+        overlay: Optional[Callable[[np.ndarray], None]] = None,
+    ) -> None:
+        self.camera = camera
+        self.quality = quality
+        self.width = width
+        self.fps = fps
+        self.overlay = overlay
+        self.fanout = MjpegFanout()
+        self.frames_encoded = 0
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    @property
+    def is_streaming(self) -> bool:
+        return self._thread is not None
+
+    @property
+    def viewer_count(self) -> int:
+        return self.fanout.client_count
+
+    def add_viewer(self, sock: socket.socket) -> None:
+        """Assume um socket cujo cabeçalho multipart já foi enviado; liga a codificação se preciso."""
+
+        with self._lock:
+            self.fanout.attach(sock)
+            if self._thread is None:
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._run, name="MjpegEncoder", daemon=True)
+                self._thread.start()
+
+    def close(self) -> None:
+        self._stop.set()
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout=2.0)
+        self.fanout.close()
+
+    def _resize(self, image: np.ndarray) -> np.ndarray:
+        height, width = image.shape[:2]
+        if width <= self.width:
+            return image.copy()  # o overlay não pode desenhar no buffer da câmera
+        size = (self.width, round(height * self.width / width))
+        return cv2.resize(image, size, interpolation=cv2.INTER_AREA)
+
+    def _placeholder(self) -> np.ndarray:
+        image = np.full((self.width * 9 // 16, self.width, 3), 40, dtype=np.uint8)
+        cv2.putText(image, "Camera indisponivel", (20, image.shape[0] // 3), cv2.FONT_HERSHEY_SIMPLEX,
+                    self.width / 640.0, (200, 200, 200), 2, cv2.LINE_AA)
+        return image
+
+    def _publish(self, image: np.ndarray) -> None:
+        if self.overlay is not None:
+            self.overlay(image)
+        ok, jpeg = cv2.imencode(".jpg", image, [cv2.IMWRITE_JPEG_QUALITY, int(self.quality)])
+        if ok:
+            self.fanout.put(encode_part(jpeg.tobytes()))
+            self.frames_encoded += 1
+
+    def _run(self) -> None:
+        camera = self.camera
+        camera.output_format = ColorFormat.BGR
+        camera.share_frames()
+        opened = camera.initialize_camera() and camera.start_background_capture()
+        sequence = 0
+        reader = None
+        next_due = time.perf_counter()
+        try:
+            while not self._stop.is_set():
+                with self._lock:
+                    if self.fanout.client_count == 0:
+                        # Ninguém assistindo: nada de captura nem codificação.
+                        camera.release_camera()
+                        self._thread = None
+                        return
+
+                if opened and camera.is_active:
+                    # O slot do anel só avisa que há frame novo; a imagem vem do barramento.
+                    latest = camera.frame_slot.wait_for_newer(sequence, timeout=0.5)
+                    if latest is None:
+                        continue
+                    sequence = latest.sequence
+                    reader = camera.bus_reader(reader)
+                    frame = reader.latest() if reader is not None else None
+                    if frame is not None:
+                        image = self._resize(frame.image)
+                        if not frame.is_valid():
+                            continue  # Sobrescrito durante o resize: usa o próximo
+                    else:
+                        lease = camera.lease_latest_frame()
+                        if lease is None:
+                            continue
+                        with lease:
+                            image = self._resize(lease.image)
+                    # Lido a cada frame: mudar `fps` vale a partir do próximo.
+                    interval = 1.0 / self.fps if self.fps > 0 else 0.0
+                else:
+                    image = self._placeholder()
+                    interval = 1.0  # Câmera indisponível: o aviso não precisa de mais que 1 FPS
+                self._publish(image)
+
+                next_due += interval
+                delay = next_due - time.perf_counter()
+                if delay > 0:
+                    self._stop.wait(delay)
+                else:
+                    next_due = time.perf_counter()  # Atrasado: não tenta compensar
+        finally:
+            with self._lock:
+                if self._thread is threading.current_thread():
+                    camera.release_camera()
+                    self._thread = None
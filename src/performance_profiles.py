@@ -0,0 +1,172 @@
+"""
+Performance Profiles Module
+Perfis de desempenho que ajustam o pipeline inteiro em tempo de execução: câmera,
+inferência, suavização de gestos, gamepad e taxa de atualização da interface
+
+Author: Renato Castellani
+Version: 1.0.0
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+from gesture_recognizer import AdaptiveResolutionPolicy, GestureRecognizer
+
+
+@dataclass(frozen=True)
+class PerformanceProfile:
+    name: str
+    label: str
+    # Câmera
+    camera_size: Tuple[int, int]
+    camera_fps: int
+    # Inferência
+    inference_height: Optional[int]
+    adaptive_resolution: bool
+    model_complexity: int
+    min_detection_confidence: float
+    min_tracking_confidence: float
+    roi_tracking: bool
+    motion_gating: bool
+    # Suavização de gestos (ver GestureSmoother)
+    smoothing_window: int
+    enter_votes: int
+    exit_votes: int
+    min_hold: float
+    # Previsão da posição da mão para o analógico (segundos)
+    stick_lead_time: float
+    # Interface
+    ui_refresh_ms: int
+
+
+PROFILES: Dict[str, PerformanceProfile] = {
+    profile.name: profile
+    for profile in (
+        PerformanceProfile(
+            name="competitive",
+            label="🏁 Competitivo",
+            camera_size=(640, 480),
+            camera_fps=60,
+            inference_height=None,  # 480p já é a resolução de inferência: nenhum resize
+            adaptive_resolution=False,
+            model_complexity=0,
+            min_detection_confidence=0.5,
+            min_tracking_confidence=0.3,  # menos re-detecções completas entre frames
+            roi_tracking=True,
+            motion_gating=False,
+            smoothing_window=3,
+            enter_votes=2,
+            exit_votes=1,
+            min_hold=0.0,
+            stick_lead_time=0.05,
+            ui_refresh_ms=50,  # a UI fica fora do caminho crítico
+        ),
+        PerformanceProfile(
+            name="low-latency",
+            label="⚡ Baixa latência",
+            camera_size=(960, 540),
+            camera_fps=60,
+            inference_height=360,
+            adaptive_resolution=False,
+            model_complexity=0,
+            min_detection_confidence=0.5,
+            min_tracking_confidence=0.5,
+            roi_tracking=True,
+            motion_gating=False,
+            smoothing_window=5,
+            enter_votes=3,
+            exit_votes=2,
+            min_hold=0.08,
+            stick_lead_time=0.04,
+            ui_refresh_ms=16,
+        ),
+        PerformanceProfile(
+            name="balanced",
+            label="⚖️ Equilibrado",
+            camera_size=(1280, 720),
+            camera_fps=30,
+            inference_height=480,
+            adaptive_resolution=True,
+            model_complexity=0,
+            min_detection_confidence=0.5,
+            min_tracking_confidence=0.5,
+            roi_tracking=True,
+            motion_gating=True,
+            smoothing_window=8,
+            enter_votes=5,
+            exit_votes=3,
+            min_hold=0.15,
+            stick_lead_time=0.03,
+            ui_refresh_ms=33,
+        ),
+        PerformanceProfile(
+            name="quality",
+            label="🎯 Qualidade",
+            camera_size=(1280, 720),
+            camera_fps=30,
+            inference_height=480,
+            adaptive_resolution=True,
+            model_complexity=1,  # modelo completo: landmarks mais estáveis, inferência mais cara
+            min_detection_confidence=0.6,
+            min_tracking_confidence=0.6,
+            roi_tracking=True,
+            motion_gating=True,
+            smoothing_window=8,
+            enter_votes=5,
+            exit_votes=3,
+            min_hold=0.15,
+            stick_lead_time=0.03,
+            ui_refresh_ms=33,
+        ),
+        PerformanceProfile(
+            name="battery",
+            label="🔋 Economia",
+            camera_size=(640, 480),
+            camera_fps=15,
+            inference_height=270,
+            adaptive_resolution=False,
+            model_complexity=0,
+            min_detection_confidence=0.6,
+            min_tracking_confidence=0.6,
+            roi_tracking=True,
+            motion_gating=True,
+            smoothing_window=5,
+            enter_votes=3,
+            exit_votes=2,
+            min_hold=0.2,
+            stick_lead_time=0.06,
+            ui_refresh_ms=66,
+        ),
+    )
+}
+
+DEFAULT_PROFILE = "balanced"
+
+
+def get_profile(name: str) -> PerformanceProfile:
+    try:
+        return PROFILES[name]
+    except KeyError:
+        raise ValueError(f"Perfil desconhecido: {name} (disponíveis: {', '.join(PROFILES)})") from None
+
+
+def apply_to_recognizer(profile: PerformanceProfile, recognizer: GestureRecognizer) -> None:
+    """Reconfigura o recognizer; o MediaPipe só é recriado se modelo/confiança mudarem.
+
+    Deve rodar na mesma thread que chama `detect_hands`.
+    """
+
+    recognizer.reconfigure(
+        model_complexity=profile.model_complexity,
+        min_detection_confidence=profile.min_detection_confidence,
+        min_tracking_confidence=profile.min_tracking_confidence,
+        roi_tracking=profile.roi_tracking,
+        inference_height=profile.inference_height,
+        adaptive_resolution=(
+            AdaptiveResolutionPolicy(initial_height=profile.inference_height)
+            if profile.adaptive_resolution
+            else None
+        ),
+    )
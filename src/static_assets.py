@@ -0,0 +1,146 @@
+"""
+Static Assets Module
+Arquivos estáticos da interface web (src/web): carregados uma vez na inicialização,
+pré-comprimidos em gzip e brotli e servidos com ETag forte
+
+Os arquivos referenciados pelo index.html como `/static/<nome>` ganham uma URL com a
+impressão digital do conteúdo (`/static/style.<hash>.css`), que pode ficar em cache por
+um ano sem revalidação; o próprio index.html é revalidado a cada carga (304 se não
+mudou). O brotli é opcional: sem o pacote `brotli`, só gzip é oferecido.
+
+Author: Renato Castellani
+Version: 1.0.0
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import mimetypes
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli é opcional
+    brotli = None
+
+WEB_DIR = Path(__file__).resolve().parent / "web"
+STATIC_PREFIX = "/static/"
+
+CACHE_IMMUTABLE = "public, max-age=31536000, immutable"
+CACHE_REVALIDATE = "no-cache"
+
+# Sufixo do ETag por codificação: cada representação tem o seu ETag forte.
+_ETAG_SUFFIX = {"identity": "", "gzip": "-gz", "br": "-br"}
+# Ordem de preferência quando o cliente aceita mais de uma.
+_PREFERENCE = ("br", "gzip", "identity")
+
+
+@dataclass
+class StaticAsset:
+    content_type: str
+    digest: str
+    cache_control: str
+    bodies: Dict[str, bytes] = field(default_factory=dict)  # codificação → bytes
+
+    def etag(self, encoding: str) -> str:
+        return f'"{self.digest}{_ETAG_SUFFIX[encoding]}"'
+
+    def matches(self, if_none_match: Optional[str]) -> bool:
+        """If-None-Match bate com alguma representação (ou `*`)?"""
+
+        if not if_none_match:
+            return False
+        tags = {tag.strip() for tag in if_none_match.split(",")}
+        tags = {tag[2:] if tag.startswith("W/") else tag for tag in tags}
+        return "*" in tags or any(self.etag(encoding) in tags for encoding in self.bodies)
+
+    def negotiate(self, accept_encoding: Optional[str]) -> Tuple[str, bytes]:
+        """Escolhe a menor representação aceita pelo cliente."""
+
+        accepted = parse_accept_encoding(accept_encoding)
+        for encoding in _PREFERENCE:
+            if encoding in self.bodies and accepted.get(encoding, accepted.get("*", 0.0)) > 0:
+                return encoding, self.bodies[encoding]
+        return "identity", self.bodies["identity"]
+
+
+def parse_accept_encoding(header: Optional[str]) -> Dict[str, float]:
+    """`gzip, br;q=0.8, *;q=0` → {"gzip": 1.0, "br": 0.8, "*": 0.0}; identity é sempre aceita."""
+
+    accepted = {"identity": 1.0}
+    for item in (header or "").split(","):
+        name, _, params = item.strip().partition(";")
+        if not name:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name.strip().lower()] = quality
+    return accepted
+
+
+def compress_variants(body: bytes) -> Dict[str, bytes]:
+    """Corpo original mais as versões comprimidas que de fato ficam menores."""
+
+    variants = {"identity": body}
+    compressed = {"gzip": gzip.compress(body, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        compressed["br"] = brotli.compress(body, quality=11)
+    for encoding, data in compressed.items():
+        if len(data) < len(body):
+            variants[encoding] = data
+    return variants
+
+
+def fingerprinted(name: str, digest: str) -> str:
+    stem, dot, suffix = name.rpartition(".")
+    return f"{STATIC_PREFIX}{stem}.{digest[:12]}.{suffix}" if dot else f"{STATIC_PREFIX}{name}.{digest[:12]}"
+
+
+class AssetStore:
+    """Tabela URL → StaticAsset montada na inicialização; nada é lido do disco por requisição."""
+
+    def __init__(self, directory: Path = WEB_DIR, index: str = "index.html") -> None:
+        self.directory = Path(directory)
+        self._assets: Dict[str, StaticAsset] = {}
+        self.index_html = ""
+
+        urls = {}
+        for path in sorted(self.directory.iterdir()):
+            if not path.is_file() or path.name == index:
+                continue
+            body = path.read_bytes()
+            digest = hashlib.sha256(body).hexdigest()[:20]
+            content_type = self._content_type(path)
+            bodies = compress_variants(body)
+            urls[path.name] = fingerprinted(path.name, digest)
+            self._assets[f"{STATIC_PREFIX}{path.name}"] = StaticAsset(content_type, digest, CACHE_REVALIDATE, bodies)
+            self._assets[urls[path.name]] = StaticAsset(content_type, digest, CACHE_IMMUTABLE, bodies)
+
+        # O index aponta para as URLs com impressão digital: mudar um asset muda o index.
+        html = (self.directory / index).read_text(encoding="utf-8")
+        for name, url in urls.items():
+            html = html.replace(f'"{STATIC_PREFIX}{name}"', f'"{url}"')
+        self.index_html = html
+        body = html.encode("utf-8")
+        page = StaticAsset(
+            "text/html; charset=utf-8", hashlib.sha256(body).hexdigest()[:20], CACHE_REVALIDATE, compress_variants(body)
+        )
+        self._assets["/"] = self._assets["/index.html"] = page
+
+    @staticmethod
+    def _content_type(path: Path) -> str:
+        content_type = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+        if content_type.startswith("text/") or content_type in ("application/javascript", "image/svg+xml"):
+            content_type += "; charset=utf-8"
+        return content_type
+
+    def lookup(self, url_path: str) -> Optional[StaticAsset]:
+        return self._assets.get(url_path)
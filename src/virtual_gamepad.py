@@ -0,0 +1,296 @@
+"""
+Virtual Gamepad Module
+Gamepad virtual estilo Xbox via /dev/uinput (Linux), com estado por botão/eixo e
+envio apenas das mudanças, agrupadas em um único SYN_REPORT por frame
+
+Author: Renato Castellani
+Version: 1.0.0
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+from enum import Enum
+from typing import Dict, List, Optional, Set, Tuple
+
+try:  # Protocol existe a partir do Python 3.8
+    from typing import Protocol
+except ImportError:  # pragma: no cover
+    Protocol = object  # type: ignore[assignment]
+
+
+class GamepadButton(Enum):
+    """
+    Botões do gamepad
+    """
+    A = "A"
+    B = "B"
+    X = "X"
+    Y = "Y"
+    LB = "LB"
+    RB = "RB"
+    LT = "LT"
+    RT = "RT"
+    START = "START"
+    SELECT = "SELECT"
+    DPAD_UP = "DPAD_UP"
+    DPAD_DOWN = "DPAD_DOWN"
+    DPAD_LEFT = "DPAD_LEFT"
+    DPAD_RIGHT = "DPAD_RIGHT"
+    LEFT_STICK = "LEFT_STICK"
+    RIGHT_STICK = "RIGHT_STICK"
+
+
+# Códigos de linux/input-event-codes.h (evita depender do evdev para montar o estado).
+EV_SYN = 0x00
+EV_KEY = 0x01
+EV_ABS = 0x03
+SYN_REPORT = 0
+
+BTN_A = 0x130
+BTN_B = 0x131
+BTN_X = 0x133
+BTN_Y = 0x134
+BTN_TL = 0x136
+BTN_TR = 0x137
+BTN_SELECT = 0x13A
+BTN_START = 0x13B
+BTN_THUMBL = 0x13D
+BTN_THUMBR = 0x13E
+
+ABS_X = 0x00
+ABS_Y = 0x01
+ABS_Z = 0x02
+ABS_RX = 0x03
+ABS_RY = 0x04
+ABS_RZ = 0x05
+ABS_HAT0X = 0x10
+ABS_HAT0Y = 0x11
+
+STICK_MIN, STICK_MAX = -32768, 32767
+TRIGGER_MAX = 255
+
+BUTTON_CODES: Dict[GamepadButton, int] = {
+    GamepadButton.A: BTN_A,
+    GamepadButton.B: BTN_B,
+    GamepadButton.X: BTN_X,
+    GamepadButton.Y: BTN_Y,
+    GamepadButton.LB: BTN_TL,
+    GamepadButton.RB: BTN_TR,
+    GamepadButton.START: BTN_START,
+    GamepadButton.SELECT: BTN_SELECT,
+    GamepadButton.LEFT_STICK: BTN_THUMBL,
+    GamepadButton.RIGHT_STICK: BTN_THUMBR,
+}
+
+# Gatilhos são eixos analógicos; "apertar" leva ao máximo.
+TRIGGER_AXES: Dict[GamepadButton, int] = {
+    GamepadButton.LT: ABS_Z,
+    GamepadButton.RT: ABS_RZ,
+}
+
+# Direcional: eixo do hat e valor quando pressionado.
+DPAD_AXES: Dict[GamepadButton, Tuple[int, int]] = {
+    GamepadButton.DPAD_UP: (ABS_HAT0Y, -1),
+    GamepadButton.DPAD_DOWN: (ABS_HAT0Y, 1),
+    GamepadButton.DPAD_LEFT: (ABS_HAT0X, -1),
+    GamepadButton.DPAD_RIGHT: (ABS_HAT0X, 1),
+}
+
+STICK_AXES: Dict[str, Tuple[int, int]] = {
+    "left": (ABS_X, ABS_Y),
+    "right": (ABS_RX, ABS_RY),
+}
+
+ABS_RANGES: Dict[int, Tuple[int, int]] = {
+    ABS_X: (STICK_MIN, STICK_MAX),
+    ABS_Y: (STICK_MIN, STICK_MAX),
+    ABS_RX: (STICK_MIN, STICK_MAX),
+    ABS_RY: (STICK_MIN, STICK_MAX),
+    ABS_Z: (0, TRIGGER_MAX),
+    ABS_RZ: (0, TRIGGER_MAX),
+    ABS_HAT0X: (-1, 1),
+    ABS_HAT0Y: (-1, 1),
+}
+
+
+class UInputWriter(Protocol):
+    """Destino dos eventos de entrada (dispositivo uinput real ou falso)."""
+
+    def write(self, event_type: int, code: int, value: int) -> None: ...
+
+    def syn(self) -> None: ...
+
+    def close(self) -> None: ...
+
+
+class EvdevUInputWriter:
+    """Cria o dispositivo virtual em /dev/uinput usando python-evdev."""
+
+    def __init__(self, name: str = "NoTouchPad Virtual Gamepad") -> None:
+        try:
+            from evdev import AbsInfo, UInput
+        except ImportError as exc:
+            raise RuntimeError(
+                "python-evdev não encontrado. Instale com 'pip install evdev' para usar o gamepad virtual."
+            ) from exc
+
+        abs_capabilities = [
+            (code, AbsInfo(value=0, min=low, max=high, fuzz=0, flat=0, resolution=0))
+            for code, (low, high) in ABS_RANGES.items()
+        ]
+        capabilities = {
+            EV_KEY: sorted(BUTTON_CODES.values()),
+            EV_ABS: abs_capabilities,
+        }
+        # Identificação de um controle Xbox 360 para máxima compatibilidade com jogos.
+        self._device = UInput(capabilities, name=name, vendor=0x045E, product=0x028E, version=0x110)
+
+    def write(self, event_type: int, code: int, value: int) -> None:
+        self._device.write(event_type, code, value)
+
+    def syn(self) -> None:
+        self._device.syn()
+
+    def close(self) -> None:
+        self._device.close()
+
+
+class RecordingUInputWriter:
+    """Writer em memória para testes/CI: registra (instante_ns, tipo, código, valor)."""
+
+    def __init__(self) -> None:
+        self.events: List[Tuple[int, int, int, int]] = []
+        self.reports = 0
+        self.closed = False
+
+    def write(self, event_type: int, code: int, value: int) -> None:
+        self.events.append((time.perf_counter_ns(), event_type, code, value))
+
+    def syn(self) -> None:
+        self.events.append((time.perf_counter_ns(), EV_SYN, SYN_REPORT, 0))
+        self.reports += 1
+
+    def close(self) -> None:
+        self.closed = True
+
+    def clear(self) -> None:
+        self.events.clear()
+        self.reports = 0
+
+
+class UInputGamepad:
+    """Estado completo de botões/eixos de um gamepad virtual.
+
+    As alterações ficam pendentes até `flush()`, que escreve só os eventos que mudaram
+    e fecha o lote com um único SYN_REPORT.
+    """
+
+    def __init__(self, writer: Optional[UInputWriter] = None) -> None:
+        self.writer: UInputWriter = writer if writer is not None else EvdevUInputWriter()
+        self._keys: Dict[int, int] = {code: 0 for code in BUTTON_CODES.values()}
+        self._axes: Dict[int, int] = {code: 0 for code in ABS_RANGES}
+        self._sent_keys = dict(self._keys)
+        self._sent_axes = dict(self._axes)
+        self._dirty_keys: Set[int] = set()
+        self._dirty_axes: Set[int] = set()
+        self._pressed_dpad: Set[GamepadButton] = set()
+
+    def set_button(self, button: GamepadButton, pressed: bool) -> None:
+        code = BUTTON_CODES.get(button)
+        if code is not None:
+            self._keys[code] = int(pressed)
+            self._dirty_keys.add(code)
+            return
+
+        axis = TRIGGER_AXES.get(button)
+        if axis is not None:
+            self._set_axis(axis, TRIGGER_MAX if pressed else 0)
+            return
+
+        hat = DPAD_AXES.get(button)
+        if hat is not None:
+            if pressed:
+                self._pressed_dpad.add(button)
+            else:
+                self._pressed_dpad.discard(button)
+            axis, _ = hat
+            value = sum(v for b, (a, v) in DPAD_AXES.items() if a == axis and b in self._pressed_dpad)
+            self._set_axis(axis, value)
+
+    def set_stick(self, stick: str, x: float, y: float) -> None:
+        """Posiciona o analógico; x/y em [-1, 1], com y positivo para cima."""
+
+        axis_x, axis_y = STICK_AXES[stick]
+        self._set_axis(axis_x, _to_stick_value(x))
+        # No evdev o eixo Y cresce para baixo.
+        self._set_axis(axis_y, _to_stick_value(-y))
+
+    def set_trigger(self, button: GamepadButton, value: float) -> None:
+        """Gatilho analógico com `value` em [0, 1]."""
+
+        axis = TRIGGER_AXES[button]
+        self._set_axis(axis, int(round(min(max(value, 0.0), 1.0) * TRIGGER_MAX)))
+
+    def _set_axis(self, axis: int, value: int) -> None:
+        self._axes[axis] = value
+        self._dirty_axes.add(axis)
+
+    def flush(self) -> int:
+        """Escreve os eventos alterados desde o último flush; retorna quantos foram escritos."""
+
+        written = 0
+        for code in self._dirty_keys:
+            value = self._keys[code]
+            if self._sent_keys[code] != value:
+                self.writer.write(EV_KEY, code, value)
+                self._sent_keys[code] = value
+                written += 1
+        for code in self._dirty_axes:
+            value = self._axes[code]
+            if self._sent_axes[code] != value:
+                self.writer.write(EV_ABS, code, value)
+                self._sent_axes[code] = value
+                written += 1
+        self._dirty_keys.clear()
+        self._dirty_axes.clear()
+
+        if written:
+            self.writer.syn()
+        return written
+
+    def reset(self) -> None:
+        """Solta todos os botões e centraliza os eixos."""
+
+        for code in self._keys:
+            self._keys[code] = 0
+        self._dirty_keys.update(self._keys)
+        for code in self._axes:
+            self._axes[code] = 0
+        self._dirty_axes.update(self._axes)
+        self._pressed_dpad.clear()
+        self.flush()
+
+    def close(self) -> None:
+        try:
+            self.reset()
+        finally:
+            self.writer.close()
+
+
+def _to_stick_value(value: float) -> int:
+    value = min(max(value, -1.0), 1.0)
+    return int(round(value * STICK_MAX)) if value >= 0 else int(round(-value * STICK_MIN))
+
+
+def create_virtual_gamepad() -> Optional[UInputGamepad]:
+    """Cria o gamepad virtual do sistema, ou None se a plataforma/permissões não permitirem."""
+
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        return UInputGamepad()
+    except (RuntimeError, OSError) as exc:
+        print(f"⚠️  Gamepad virtual indisponível: {exc}", file=sys.stderr)
+        return None
@@ -0,0 +1,121 @@
+const MAX_MESSAGES = 5;
+const sticks = [[0, 0], [0, 0]];
+
+// Aplica um estado (completo ou delta): só os campos presentes são atualizados
+function applyState(data) {
+    if ('is_running' in data) {
+        document.getElementById('statusText').textContent = data.is_running ? 'Ativo' : 'Parado';
+        document.getElementById('statusIndicator').className = 'indicator ' + (data.is_running ? 'active' : 'inactive');
+        document.getElementById('cameraPreview').classList.toggle('pulse', data.is_running);
+    }
+    if ('is_auto' in data) {
+        document.getElementById('modeText').textContent = data.is_auto ? 'Automático' : 'Manual';
+    }
+    if ('gesture' in data) {
+        document.getElementById('currentGesture').textContent = data.gesture;
+        document.getElementById('gestureDisplay').textContent = data.gesture_icon || '🤚';
+    }
+    if ('command' in data) {
+        document.getElementById('currentCommand').textContent = data.command;
+        document.getElementById('commandDisplay').textContent = data.command;
+    }
+    if ('left_stick' in data) {
+        sticks[0] = data.left_stick;
+    }
+    if ('right_stick' in data) {
+        sticks[1] = data.right_stick;
+    }
+    if ('left_stick' in data || 'right_stick' in data) {
+        document.getElementById('sticksText').textContent =
+            sticks.map(stick => stick.map(value => value.toFixed(2)).join(', ')).join(' | ');
+    }
+}
+
+function appendMessage(text) {
+    const messagesList = document.getElementById('messagesList');
+    const item = document.createElement('div');
+    item.className = 'message';
+    item.textContent = text;
+    messagesList.appendChild(item);
+    while (messagesList.children.length > MAX_MESSAGES) {
+        messagesList.removeChild(messagesList.firstChild);
+    }
+    messagesList.scrollTop = messagesList.scrollHeight;
+}
+
+function applySnapshot(data) {
+    applyState(data);
+    document.getElementById('messagesList').innerHTML = '';
+    data.messages.forEach(appendMessage);
+}
+
+// Estado completo via polling (só para navegadores sem EventSource)
+function updateStatus() {
+    fetch('/api/status')
+        .then(response => response.json())
+        .then(applySnapshot);
+}
+
+// Canal SSE: snapshot na conexão e depois só deltas; o navegador reconecta sozinho
+function connectEvents() {
+    const source = new EventSource('/api/events');
+    source.addEventListener('snapshot', event => applySnapshot(JSON.parse(event.data)));
+    source.addEventListener('state', event => applyState(JSON.parse(event.data)));
+    source.addEventListener('log', event => appendMessage(JSON.parse(event.data).text));
+}
+
+// Funções de controle
+function startManual() {
+    fetch('/api/start_manual', {method: 'POST'});
+}
+
+function startAuto() {
+    fetch('/api/start_auto', {method: 'POST'});
+}
+
+function stopDetection() {
+    fetch('/api/stop', {method: 'POST'});
+}
+
+// Canal de controle binário (WebSocket): GESTURE = tipo 1, código, sequência (uint16 LE)
+const GESTURE_CODES = {punch: 0, open: 1, point: 2, thumbs: 3, stop: 4};
+let control = null;
+let controlSequence = 0;
+
+function connectControl() {
+    const scheme = location.protocol === 'https:' ? 'wss://' : 'ws://';
+    const socket = new WebSocket(scheme + location.host + '/ws/control');
+    socket.binaryType = 'arraybuffer';
+    socket.onopen = () => { control = socket; };
+    socket.onclose = () => {
+        control = null;
+        setTimeout(connectControl, 2000);
+    };
+}
+
+function sendGesture(gesture) {
+    if (control && control.readyState === WebSocket.OPEN) {
+        const message = new DataView(new ArrayBuffer(4));
+        controlSequence = (controlSequence + 1) & 0xffff;
+        message.setUint8(0, 1);
+        message.setUint8(1, GESTURE_CODES[gesture]);
+        message.setUint16(2, controlSequence, true);
+        control.send(message.buffer);
+        return;
+    }
+    fetch('/api/gesture', {
+        method: 'POST',
+        headers: {'Content-Type': 'application/json'},
+        body: JSON.stringify({gesture: gesture})
+    });
+}
+
+if (window.WebSocket) {
+    connectControl();
+}
+if (window.EventSource) {
+    connectEvents();
+} else {
+    setInterval(updateStatus, 500);
+    updateStatus(); // Primeira atualização
+}
@@ -0,0 +1,300 @@
+"""
+Web Control Module
+Canal de controle remoto da interface web: WebSocket (RFC 6455) com mensagens binárias
+compactas de gesto e analógico, e um agendador único para os resets temporizados
+
+Formato das mensagens (little-endian), sempre com o cabeçalho `tipo, argumento, sequência`:
+
+    GESTURE  <BBH     tipo=1, código do gesto, seq                      (4 bytes)
+    STICK    <BBHhh   tipo=2, 0=esquerdo/1=direito, seq, x, y (±32767)  (8 bytes)
+    PING     <BBH...  tipo=3, 0, seq, payload livre (ecoado na resposta)
+
+Cada mensagem recebe uma resposta com `tipo | 0x80`, o status no argumento e a mesma
+sequência (o PING volta com o payload original), o que permite medir o round-trip.
+
+Author: Renato Castellani
+Version: 1.0.0
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import heapq
+import itertools
+import struct
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Hashable, Iterator, List, Optional, Tuple
+
+from web_events import SocketFanout
+
+WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+OP_CONTINUATION = 0x0
+OP_TEXT = 0x1
+OP_BINARY = 0x2
+OP_CLOSE = 0x8
+OP_PING = 0x9
+OP_PONG = 0xA
+
+CLOSE_PROTOCOL_ERROR = 1002
+CLOSE_UNSUPPORTED = 1003
+CLOSE_TOO_BIG = 1009
+
+# Mensagens de controle são minúsculas: qualquer coisa maior é erro do cliente.
+MAX_PAYLOAD = 125
+
+MSG_GESTURE = 1
+MSG_STICK = 2
+MSG_PING = 3
+ACK_FLAG = 0x80
+
+STATUS_OK = 0
+STATUS_REJECTED = 1
+
+HEADER = struct.Struct("<BBH")
+STICK = struct.Struct("<BBHhh")
+STICK_SCALE = 32767.0
+
+
+class FrameError(ValueError):
+    """Frame recebido inválido; `close_code` é o código de fechamento correspondente."""
+
+    def __init__(self, message: str, close_code: int) -> None:
+        super().__init__(message)
+        self.close_code = close_code
+
+
+def websocket_accept(key: str) -> str:
+    """Valor do Sec-WebSocket-Accept para o Sec-WebSocket-Key do cliente."""
+
+    digest = hashlib.sha1((key.strip() + WS_GUID).encode("ascii")).digest()
+    return base64.b64encode(digest).decode("ascii")
+
+
+def encode_frame(payload: bytes, opcode: int = OP_BINARY, mask: Optional[bytes] = None) -> bytes:
+    """Frame WebSocket completo (FIN); `mask` só é usada do lado do cliente."""
+
+    length = len(payload)
+    header = bytearray([0x80 | opcode])
+    mask_bit = 0x80 if mask is not None else 0
+    if length < 126:
+        header.append(mask_bit | length)
+    elif length < 1 << 16:
+        header.append(mask_bit | 126)
+        header += struct.pack("!H", length)
+    else:
+        header.append(mask_bit | 127)
+        header += struct.pack("!Q", length)
+    if mask is None:
+        return bytes(header) + payload
+    return bytes(header) + mask + _apply_mask(payload, mask)
+
+
+def _apply_mask(payload: bytes, mask: bytes) -> bytes:
+    # XOR em um único inteiro grande: sem laço por byte em Python.
+    repeated = (mask * (len(payload) // 4 + 1))[:len(payload)]
+    value = int.from_bytes(payload, "little") ^ int.from_bytes(repeated, "little")
+    return value.to_bytes(len(payload), "little")
+
+
+def parse_frames(buffer: bytearray, require_mask: bool = True) -> Iterator[Tuple[bool, int, bytes]]:
+    """Consome de `buffer` os frames completos e devolve (fin, opcode, payload).
+
+    Frames incompletos ficam no buffer para a próxima leitura. FrameError indica frame
+    inválido: máscara errada (CLOSE_PROTOCOL_ERROR, RFC 6455 §5.1) ou maior que
+    MAX_PAYLOAD (CLOSE_TOO_BIG).
+    """
+
+    while len(buffer) >= 2:
+        fin = bool(buffer[0] & 0x80)
+        opcode = buffer[0] & 0x0F
+        masked = bool(buffer[1] & 0x80)
+        length = buffer[1] & 0x7F
+        offset = 2
+        if length == 126:
+            if len(buffer) < 4:
+                return
+            length = struct.unpack_from("!H", buffer, 2)[0]
+            offset = 4
+        elif length == 127:
+            if len(buffer) < 10:
+                return
+            length = struct.unpack_from("!Q", buffer, 2)[0]
+            offset = 10
+        if masked != require_mask:
+            raise FrameError("máscara do frame inválida", CLOSE_PROTOCOL_ERROR)
+        if length > MAX_PAYLOAD:
+            raise FrameError("frame grande demais", CLOSE_TOO_BIG)
+        mask = bytes(buffer[offset:offset + 4]) if masked else None
+        offset += 4 if masked else 0
+        if len(buffer) < offset + length:
+            return
+        payload = bytes(buffer[offset:offset + length])
+        del buffer[:offset + length]
+        yield fin, opcode, _apply_mask(payload, mask) if mask else payload
+
+
+@dataclass(frozen=True)
+class ControlMessage:
+    kind: int
+    arg: int
+    sequence: int
+    x: float = 0.0
+    y: float = 0.0
+
+
+def encode_gesture(code: int, sequence: int) -> bytes:
+    return HEADER.pack(MSG_GESTURE, code, sequence & 0xFFFF)
+
+
+def encode_stick(stick: int, x: float, y: float, sequence: int) -> bytes:
+    def scale(value: float) -> int:
+        return int(round(max(-1.0, min(1.0, value)) * STICK_SCALE))
+
+    return STICK.pack(MSG_STICK, stick, sequence & 0xFFFF, scale(x), scale(y))
+
+
+def encode_ping(sequence: int, payload: bytes = b"") -> bytes:
+    return HEADER.pack(MSG_PING, 0, sequence & 0xFFFF) + payload
+
+
+def decode_message(payload: bytes) -> Optional[ControlMessage]:
+    """Decodifica uma mensagem de controle; None se o formato não for reconhecido."""
+
+    if len(payload) < HEADER.size:
+        return None
+    kind, arg, sequence = HEADER.unpack_from(payload)
+    if kind == MSG_STICK:
+        if len(payload) != STICK.size:
+            return None
+        _, _, _, x, y = STICK.unpack(payload)
+        return ControlMessage(kind, arg, sequence, x / STICK_SCALE, y / STICK_SCALE)
+    if kind == MSG_GESTURE and len(payload) != HEADER.size:
+        return None
+    return ControlMessage(kind, arg, sequence)
+
+
+class ControlHub(SocketFanout):
+    """Thread única que lê os WebSockets de controle e responde cada mensagem.
+
+    `handler(message)` roda nesta thread e devolve se a mensagem foi aceita; PING é
+    respondido aqui mesmo. Recebe sockets já com o handshake concluído (`attach`).
+    """
+
+    def __init__(self, handler: Callable[[ControlMessage], bool]) -> None:
+        self.handler = handler
+        self.messages_handled = 0
+        super().__init__(name="ControlHub")
+
+    def _close_with(self, client, code: int) -> None:
+        client.pending += encode_frame(struct.pack("!H", code), OP_CLOSE)
+        self._flush(client)
+        self._drop(client)
+
+    def _reply(self, payload: bytes) -> bytes:
+        message = decode_message(payload)
+        if message is None:
+            return HEADER.pack(ACK_FLAG, STATUS_REJECTED, 0)
+        if message.kind == MSG_PING:
+            return bytes([MSG_PING | ACK_FLAG]) + payload[1:]
+        try:
+            accepted = self.handler(message)
+        except Exception:
+            accepted = False
+        self.messages_handled += 1
+        status = STATUS_OK if accepted else STATUS_REJECTED
+        return HEADER.pack(message.kind | ACK_FLAG, status, message.sequence)
+
+    def _receive(self, client, data: bytes) -> None:
+        client.inbox += data
+        try:
+            for fin, opcode, payload in parse_frames(client.inbox):
+                if not fin or opcode == OP_CONTINUATION:
+                    self._close_with(client, CLOSE_PROTOCOL_ERROR)  # Mensagens fragmentadas não são usadas
+                    return
+                if opcode == OP_BINARY:
+                    client.pending += encode_frame(self._reply(payload))
+                elif opcode == OP_PING:
+                    client.pending += encode_frame(payload, OP_PONG)
+                elif opcode == OP_CLOSE:
+                    client.pending += encode_frame(payload[:2], OP_CLOSE)
+                    self._flush(client)
+                    self._drop(client)
+                    return
+                elif opcode == OP_TEXT:
+                    self._close_with(client, CLOSE_UNSUPPORTED)
+                    return
+        except FrameError as error:
+            self._close_with(client, error.close_code)
+            return
+        self._flush(client)
+
+
+class ResetScheduler:
+    """Uma thread para todos os resets temporizados.
+
+    Agendar de novo a mesma chave substitui o prazo anterior (cliques repetidos adiam o
+    reset em vez de empilhar timers).
+    """
+
+    def __init__(self) -> None:
+        self._condition = threading.Condition()
+        self._heap: List[Tuple[float, int, Hashable]] = []
+        self._entries: Dict[Hashable, Tuple[float, int, Callable[[], None]]] = {}
+        self._counter = itertools.count()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="ResetScheduler", daemon=True)
+        self._thread.start()
+
+    @property
+    def pending(self) -> int:
+        with self._condition:
+            return len(self._entries)
+
+    def schedule(self, key: Hashable, delay: float, callback: Callable[[], None]) -> None:
+        due = time.monotonic() + delay
+        with self._condition:
+            order = next(self._counter)
+            self._entries[key] = (due, order, callback)
+            heapq.heappush(self._heap, (due, order, key))
+            self._condition.notify()
+
+    def cancel(self, key: Hashable) -> None:
+        with self._condition:
+            self._entries.pop(key, None)  # A entrada no heap vira obsoleta e é ignorada
+
+    def close(self) -> None:
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        self._thread.join(timeout=1.0)
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while True:
+                    if self._closed:
+                        return
+                    if not self._heap:
+                        self._condition.wait()
+                        continue
+                    due, order, key = self._heap[0]
+                    entry = self._entries.get(key)
+                    if entry is None or entry[1] != order:
+                        heapq.heappop(self._heap)  # Cancelada ou reagendada
+                        continue
+                    delay = due - time.monotonic()
+                    if delay > 0:
+                        self._condition.wait(delay)
+                        continue
+                    heapq.heappop(self._heap)
+                    del self._entries[key]
+                    callback = entry[2]
+                    break
+            try:
+                callback()
+            except Exception:
+                pass  # Um reset com erro não derruba o agendador
@@ -0,0 +1,330 @@
+"""
+Web Events Module
+Canal de eventos da interface web: difusão dos deltas de estado para os navegadores
+conectados via Server-Sent Events (text/event-stream)
+
+Cada evento é serializado uma única vez em `publish` e os mesmos bytes vão para todos
+os assinantes; um assinante lento não segura os demais: quando o buffer dele enche, o
+atraso é descartado e o cliente recebe um snapshot completo no lugar.
+
+Os streams HTTP não ocupam uma thread cada: depois do cabeçalho, o socket é entregue a
+uma SocketFanout, uma única thread que escreve em todos eles sem bloquear (EventFanout
+para o SSE; o stream MJPEG usa a mesma base).
+
+Author: Renato Castellani
+Version: 1.0.0
+"""
+
+import json
+import queue
+import selectors
+import socket
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple, Union
+
+# Comentário SSE: mantém a conexão viva em proxies e detecta clientes que sumiram.
+HEARTBEAT = b": heartbeat\n\n"
+
+# Marcadores entregues na fila do assinante no lugar de um evento.
+RESYNC = object()
+CLOSED = object()
+
+
+def format_sse(event: str, data: Any, event_id: Optional[int] = None) -> bytes:
+    """Codifica um evento SSE; `data` vira JSON compacto (sempre em uma linha)."""
+
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event}")
+    lines.append("data: " + json.dumps(data, ensure_ascii=False, separators=(",", ":")))
+    return ("\n".join(lines) + "\n\n").encode("utf-8")
+
+
+class EventSubscription:
+    """Fila limitada de eventos já codificados de um cliente."""
+
+    def __init__(self, max_pending: int = 256) -> None:
+        self._queue: "queue.Queue[Union[bytes, object]]" = queue.Queue(max_pending)
+        self.dropped = 0
+
+    def put(self, message: Union[bytes, object]) -> None:
+        try:
+            self._queue.put_nowait(message)
+        except queue.Full:
+            # Cliente lento: descarta o atraso inteiro e pede um snapshot novo.
+            while True:
+                try:
+                    self._queue.get_nowait()
+                    self.dropped += 1
+                except queue.Empty:
+                    break
+            self._queue.put_nowait(message if message is CLOSED else RESYNC)
+
+    def get(self, timeout: Optional[float] = None) -> Optional[Union[bytes, object]]:
+        """Próximo evento, ou None se nada chegou em `timeout` segundos (hora do heartbeat)."""
+
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+
+class EventBroadcaster:
+    """Distribui eventos SSE para N assinantes."""
+
+    def __init__(self, max_pending: int = 256) -> None:
+        self.max_pending = max_pending
+        self._lock = threading.Lock()
+        # Qualquer objeto com `put(message)`: EventSubscription, EventFanout...
+        self._subscribers: List[Any] = []
+        self._last_id = 0
+
+    @property
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return len(self._subscribers)
+
+    @property
+    def last_id(self) -> int:
+        return self._last_id
+
+    def subscribe(self, subscription: Optional[Any] = None) -> Any:
+        """Registra um assinante (por padrão, uma EventSubscription nova) e o devolve."""
+
+        if subscription is None:
+            subscription = EventSubscription(self.max_pending)
+        with self._lock:
+            self._subscribers.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Any) -> None:
+        with self._lock:
+            if subscription in self._subscribers:
+                self._subscribers.remove(subscription)
+
+    def publish(self, event: str, data: Any) -> int:
+        """Codifica o evento uma vez e enfileira para todos; devolve o id do evento."""
+
+        with self._lock:
+            self._last_id += 1
+            message = format_sse(event, data, self._last_id)
+            for subscription in self._subscribers:
+                subscription.put(message)
+            return self._last_id
+
+    def close(self) -> None:
+        """Encerra todos os streams abertos (usado no desligamento do servidor)."""
+
+        with self._lock:
+            subscribers, self._subscribers = self._subscribers, []
+        for subscription in subscribers:
+            subscription.put(CLOSED)
+
+
+class _StreamClient:
+    __slots__ = ("sock", "pending", "since", "last_write", "writing", "inbox")
+
+    def __init__(self, sock: socket.socket, pending: bytes, since: int) -> None:
+        self.sock = sock
+        self.pending = bytearray(pending)
+        self.since = since
+        self.last_write = time.monotonic()
+        self.writing = False
+        self.inbox = bytearray()
+
+
+class SocketFanout:
+    """Uma thread que escreve cada mensagem em N sockets de streaming, sem bloquear em nenhum.
+
+    Mensagens chegam por `put` (é um assinante válido do EventBroadcaster); sockets com
+    escrita pendente são esperados via `selectors` e clientes que fecham a conexão são
+    descartados. Se `heartbeat` não for None, conexões ociosas o recebem a cada
+    `heartbeat_interval` segundos. Subclasses decidem em `_queue` o que fazer com um
+    cliente atrasado e, em `_receive`, o que fazer com o que o cliente envia.
+    """
+
+    heartbeat: Optional[bytes] = None
+
+    def __init__(self, heartbeat_interval: float = 15.0, name: str = "SocketFanout") -> None:
+        self.heartbeat_interval = heartbeat_interval
+        self._lock = threading.Lock()
+        self._messages: Deque[Tuple[int, Union[bytes, object]]] = deque()
+        self._sequence = 0
+        self._incoming: List[_StreamClient] = []
+        self._clients: Dict[int, _StreamClient] = {}
+        self._selector = selectors.DefaultSelector()
+        self._wake_r, self._wake_w = socket.socketpair()
+        self._wake_r.setblocking(False)
+        self._wake_w.setblocking(False)
+        self._selector.register(self._wake_r, selectors.EVENT_READ)
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    @property
+    def client_count(self) -> int:
+        with self._lock:
+            return len(self._clients) + len(self._incoming)
+
+    def _wake(self) -> None:
+        try:
+            self._wake_w.send(b"\0")
+        except (BlockingIOError, OSError):
+            pass  # Já há um despertar pendente (ou a fanout foi encerrada)
+
+    def put(self, message: Union[bytes, object]) -> None:
+        with self._lock:
+            self._sequence += 1
+            self._messages.append((self._sequence, message))
+        self._wake()
+
+    def attach(self, sock: socket.socket, initial: bytes = b"") -> None:
+        """Assume um socket cujo cabeçalho já foi enviado; `initial` sai antes de tudo.
+
+        Eventos publicados antes do attach não são repetidos para este cliente: quem chama
+        deve tirar o snapshot em `initial` sob o mesmo lock que serializa as publicações.
+        """
+
+        sock.setblocking(False)
+        with self._lock:
+            self._incoming.append(_StreamClient(sock, initial, self._sequence))
+        self._wake()
+
+    def close(self) -> None:
+        self.put(CLOSED)
+        self._thread.join(timeout=2.0)
+
+    def _drop(self, client: _StreamClient) -> None:
+        self._clients.pop(client.sock.fileno(), None)
+        try:
+            self._selector.unregister(client.sock)
+        except (KeyError, ValueError):
+            pass
+        try:
+            client.sock.close()
+        except OSError:
+            pass
+
+    def _flush(self, client: _StreamClient) -> None:
+        if client.pending:
+            try:
+                sent = client.sock.send(client.pending)
+            except (BlockingIOError, InterruptedError):
+                sent = 0
+            except OSError:
+                self._drop(client)
+                return
+            del client.pending[:sent]
+            if sent:
+                client.last_write = time.monotonic()
+        writing = bool(client.pending)
+        if writing != client.writing:
+            client.writing = writing
+            events = selectors.EVENT_READ | (selectors.EVENT_WRITE if writing else 0)
+            self._selector.modify(client.sock, events, client)
+
+    def _queue(self, client: _StreamClient, message: bytes) -> None:
+        client.pending += message
+
+    def _receive(self, client: _StreamClient, data: bytes) -> None:
+        """Dados vindos do cliente (roda na thread da fanout); por padrão são ignorados."""
+
+    def _run(self) -> None:
+        while True:
+            timeout = None
+            if self.heartbeat is not None:
+                now = time.monotonic()
+                oldest = min((client.last_write for client in self._clients.values()), default=now)
+                timeout = max(0.0, oldest + self.heartbeat_interval - now)
+            for key, mask in self._selector.select(timeout):
+                if key.fileobj is self._wake_r:
+                    try:
+                        while self._wake_r.recv(4096):
+                            pass
+                    except (BlockingIOError, OSError):
+                        pass
+                    continue
+                client = key.data
+                if mask & selectors.EVENT_READ:
+                    try:
+                        data = client.sock.recv(4096)
+                    except (BlockingIOError, InterruptedError):
+                        data = None
+                    except OSError:
+                        data = b""
+                    if data == b"":
+                        self._drop(client)
+                        continue
+                    if data:
+                        self._receive(client, data)
+                        if client.sock.fileno() not in self._clients:
+                            continue
+                if mask & selectors.EVENT_WRITE:
+                    self._flush(client)
+
+            with self._lock:
+                incoming, self._incoming = self._incoming, []
+                messages = list(self._messages)
+                self._messages.clear()
+
+            for client in incoming:
+                self._clients[client.sock.fileno()] = client
+                self._selector.register(client.sock, selectors.EVENT_READ, client)
+            touched = set(incoming)
+            for sequence, message in messages:
+                if message is CLOSED:
+                    for client in list(self._clients.values()):
+                        self._drop(client)
+                    self._selector.close()
+                    self._wake_r.close()
+                    self._wake_w.close()
+                    return
+                for client in self._clients.values():
+                    if sequence > client.since:
+                        self._queue(client, message)
+                        touched.add(client)
+
+            if self.heartbeat is not None:
+                now = time.monotonic()
+                for client in self._clients.values():
+                    if not client.pending and now - client.last_write >= self.heartbeat_interval:
+                        client.pending += self.heartbeat
+                        touched.add(client)
+            for client in touched:
+                if client.sock.fileno() in self._clients:
+                    self._flush(client)
+
+
+class EventFanout(SocketFanout):
+    """Fanout dos streams SSE: cliente atrasado além de `max_buffer` bytes recebe `snapshot()`.
+
+    Conexões ociosas recebem HEARTBEAT, o que também detecta clientes que sumiram.
+    """
+
+    heartbeat = HEARTBEAT
+
+    def __init__(
+        self,
+        snapshot: Callable[[], bytes],
+        heartbeat_interval: float = 15.0,
+        max_buffer: int = 256 * 1024,
+    ) -> None:
+        self.snapshot = snapshot
+        self.max_buffer = max_buffer
+        self.resyncs = 0
+        super().__init__(heartbeat_interval, name="EventFanout")
+
+    def _queue(self, client: _StreamClient, message: bytes) -> None:
+        if message is RESYNC:
+            message = self.snapshot()
+        if len(client.pending) + len(message) > self.max_buffer:
+            # Cliente lento: o atraso perde sentido, o estado completo substitui tudo.
+            # Só o evento já começado no socket é mantido, para o stream continuar válido.
+            boundary = client.pending.find(b"\n\n")
+            del client.pending[boundary + 2 if boundary >= 0 else 0:]
+            client.pending += self.snapshot()
+            self.resyncs += 1
+        else:
+            client.pending += message
@@ -0,0 +1,12 @@
+"""
+Configuração do pytest: os módulos de src/ são importados pelo nome (como nos
+benchmarks e nos scripts de entrada); benchmarks/ entra no caminho para reaproveitar as
+poses de mão de `fixtures`
+"""
+
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT / "src"))
+sys.path.append(str(ROOT / "benchmarks"))
@@ -0,0 +1,194 @@
+"""
+Testes da captura do camera_detector: o anel de buffers com empréstimos, o descarte
+quando o anel está cheio, a espera por frames novos, a leitora em segundo plano (inclusive
+presa num read()) e o barramento próprio de `share_frames`
+"""
+
+import threading
+import time
+
+import cv2
+import numpy as np
+import pytest
+
+from camera_detector import CameraDetector, FrameRing
+from fixtures import FakeVideoCapture, synthetic_frames
+from frame_bus import FrameBus
+from frame_sources import NpyFrameSource, Pacing
+from frame_types import ColorFormat
+
+FRAMES = synthetic_frames(6, size=(64, 48))
+
+
+def make_detector(ring_size: int = 3, **kwargs) -> CameraDetector:
+    capture = FakeVideoCapture(FRAMES)
+    detector = CameraDetector(ring_size=ring_size, capture_factory=lambda: capture, **kwargs)
+    assert detector.initialize_camera()
+    return detector
+
+
+class BlockingCapture(FakeVideoCapture):
+    """Captura cujo read() fica preso a partir do quarto frame, até `unblock`."""
+
+    def __init__(self) -> None:
+        super().__init__(FRAMES)
+        self.unblock = threading.Event()
+        self.blocked = threading.Event()
+        self.released = False
+
+    def read(self, image=None):
+        if self.position >= 3:
+            self.blocked.set()
+            self.unblock.wait()
+        assert not self.released, "read() depois de release()"
+        return super().read(image)
+
+    def release(self) -> None:
+        self.released = True
+        super().release()
+
+
+def test_ring_skips_leased_and_published_slots():
+    ring = FrameRing((4, 4, 3), size=3)
+    leased = ring.acquire_write_slot()
+    with ring.lock:
+        ring.mark_published(leased, keep_lease=True)
+    published = ring.acquire_write_slot()
+    with ring.lock:
+        ring.mark_published(published)
+
+    writing = ring.acquire_write_slot()
+    assert writing not in (leased, published)
+    assert ring.acquire_write_slot() is None
+
+    ring.release(leased)
+    assert ring.acquire_write_slot() == leased
+
+
+def test_lease_pins_buffer_while_later_frames_arrive():
+    detector = make_detector(ring_size=3)
+    lease = detector.lease_frame()
+    pinned = lease.image.copy()
+
+    for _ in range(10):
+        with detector.lease_frame() as later:
+            assert later.frame.slot != lease.frame.slot
+    np.testing.assert_array_equal(lease.image, pinned)
+    np.testing.assert_array_equal(pinned, cv2.cvtColor(FRAMES[0], cv2.COLOR_BGR2RGB))
+    lease.release()
+    lease.release()  # idempotente: não devolve o slot duas vezes
+    assert detector.ring_overruns == 0
+
+
+def test_full_ring_drops_frame_without_decoding():
+    detector = make_detector(ring_size=2)
+    first, second = detector.lease_frame(), detector.lease_frame()
+    position = detector.capture.position
+
+    assert detector.lease_frame() is None
+    assert detector.ring_overruns == 1
+    assert detector.capture.position == position + 1  # grab(): o frame foi descartado
+    assert detector.is_active
+
+    first.release()
+    with detector.lease_frame() as third:
+        assert third.frame.slot == first.frame.slot
+        assert third.frame.sequence == second.frame.sequence + 1
+    second.release()
+
+
+def test_lease_newer_frame_times_out():
+    detector = make_detector()
+    started = time.perf_counter()
+    assert detector.lease_newer_frame(0, timeout=0.05) is None
+    assert time.perf_counter() - started >= 0.05
+
+    detector.lease_frame().release()
+    assert detector.lease_newer_frame(1, timeout=0.02) is None
+    with detector.lease_newer_frame(0, timeout=0.02) as lease:
+        assert lease.frame.sequence == 1
+
+
+def test_background_replay_from_npy(tmp_path):
+    path = tmp_path / "sessao.npy"
+    np.save(path, np.stack(FRAMES))
+    source = NpyFrameSource(path, pacing=Pacing.FAST, loop=True)
+    detector = CameraDetector(ring_size=4, capture_factory=lambda: source)
+    assert detector.initialize_camera() and detector.start_background_capture()
+
+    expected = [cv2.cvtColor(frame, cv2.COLOR_BGR2RGB) for frame in FRAMES]
+    sequence = 0
+    try:
+        for _ in range(5):
+            lease = detector.lease_newer_frame(sequence, timeout=1.0)
+            assert lease is not None
+            with lease:
+                assert lease.frame.sequence > sequence
+                sequence = lease.frame.sequence
+                assert any(np.array_equal(lease.image, image) for image in expected)
+    finally:
+        detector.release_camera()
+    assert not detector.is_background_capture
+    assert not source.isOpened()
+
+
+def test_stop_and_release_while_reader_is_blocked():
+    capture = BlockingCapture()
+    detector = CameraDetector(capture_factory=lambda: capture)
+    assert detector.initialize_camera() and detector.start_background_capture()
+    assert capture.blocked.wait(1.0)
+
+    assert detector.stop_background_capture(timeout=0.05) is False
+    assert detector.is_background_capture
+    assert detector.start_background_capture() is False  # a leitora antiga ainda tem o dispositivo
+
+    detector.release_camera()
+    assert detector.capture is None
+    assert not capture.released  # liberar agora derrubaria o read() em andamento
+
+    capture.unblock.set()
+    deadline = time.perf_counter() + 1.0
+    while detector.is_background_capture and time.perf_counter() < deadline:
+        time.sleep(0.005)
+    assert not detector.is_background_capture
+    assert capture.released
+    assert detector.stop_background_capture() is True
+
+
+def test_share_frames_publishes_on_owned_bus():
+    detector = make_detector(output_format=ColorFormat.RGB)
+    detector.share_frames(slots=4)
+    assert detector.bus_reader() is None  # o barramento nasce com o primeiro frame
+
+    detector.lease_frame().release()
+    reader = detector.bus_reader()
+    assert reader is not None and detector.bus_reader(reader) is reader
+    assert reader.bus.frame_shape == (48, 64, 3)
+    assert reader.bus.color_format is ColorFormat.RGB
+
+    with detector.lease_frame() as lease:
+        frame = reader.latest()
+        assert frame is not None and frame.is_valid()
+        assert not frame.image.flags.writeable
+        np.testing.assert_array_equal(frame.image, lease.image)
+    del frame
+
+    detector.release_camera()
+    assert detector.frame_bus is None
+    assert detector.bus_reader(reader) is None
+
+
+def test_attach_frame_bus_counts_mismatched_frames():
+    detector = make_detector()
+    with FrameBus.create((10, 10, 3), slots=2) as bus:
+        detector.attach_frame_bus(bus)
+        detector.lease_frame().release()
+        assert detector.bus_mismatches == 1
+        assert bus.write_sequence == 0
+        detector.attach_frame_bus(None)
+
+
+@pytest.mark.parametrize("ring_size", [0, 1])
+def test_ring_needs_two_slots(ring_size):
+    with pytest.raises(ValueError):
+        FrameRing((4, 4, 3), size=ring_size)
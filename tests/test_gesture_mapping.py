@@ -0,0 +1,118 @@
+"""
+Testes do mapeamento gesto → gamepad (gesture_mapping): prioridade de mão específica,
+modos press/hold/toggle/turbo, região do analógico e ida e volta por dicionário
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from gesture_mapping import (
+    ActionMode,
+    CompiledMapping,
+    GestureBinding,
+    GestureMappingEngine,
+    MappingProfile,
+    StickRegion,
+    default_profile,
+)
+from hand_landmarks import GestureType
+from virtual_gamepad import GamepadButton
+
+
+def hand(gesture, handedness="Right", x=0.5, y=0.5):
+    return SimpleNamespace(gesture=gesture, handedness=handedness, x=x, y=y)
+
+
+def engine_for(*bindings):
+    return GestureMappingEngine(MappingProfile("teste", list(bindings)))
+
+
+def pressed_sequence(engine, button, frames):
+    """Estado do botão após cada frame (`frames`: lista de (mãos, instante))."""
+
+    states = []
+    for hands, timestamp in frames:
+        engine.update(hands, timestamp)
+        states.append(engine.is_pressed(button))
+    return states
+
+
+def test_hand_specific_binding_overrides_any():
+    compiled = CompiledMapping(
+        MappingProfile(
+            "teste",
+            [
+                GestureBinding(GestureType.FIST, GamepadButton.A),
+                GestureBinding(GestureType.FIST, GamepadButton.B, hand="left"),
+            ],
+        )
+    )
+    assert compiled.lookup("Right", GestureType.FIST) == 0
+    assert compiled.lookup("Unknown", GestureType.FIST) == 0
+    assert compiled.lookup("Left", GestureType.FIST) == 1
+    assert compiled.lookup("Left", GestureType.PEACE) == -1
+
+
+def test_unknown_hand_in_binding_is_rejected():
+    with pytest.raises(ValueError):
+        CompiledMapping(MappingProfile("teste", [GestureBinding(GestureType.FIST, GamepadButton.A, hand="middle")]))
+
+
+def test_hold_and_press_modes():
+    engine = engine_for(
+        GestureBinding(GestureType.FIST, GamepadButton.A, ActionMode.HOLD),
+        GestureBinding(GestureType.FIST, GamepadButton.B, ActionMode.PRESS, hand="right"),
+    )
+    frames = [([hand(GestureType.FIST)], 0.0), ([hand(GestureType.FIST)], 0.1), ([], 0.2)]
+    assert pressed_sequence(engine, GamepadButton.B, frames) == [True, False, False]
+    engine.reset()
+    assert pressed_sequence(engine, GamepadButton.A, frames) == [False, False, False]  # mão direita → B
+
+    engine.reset()
+    left = [([hand(GestureType.FIST, "Left")], 0.0), ([hand(GestureType.FIST, "Left")], 0.1), ([], 0.2)]
+    assert pressed_sequence(engine, GamepadButton.A, left) == [True, True, False]
+
+
+def test_toggle_mode_flips_on_each_entry():
+    engine = engine_for(GestureBinding(GestureType.PEACE, GamepadButton.X, ActionMode.TOGGLE))
+    peace = [hand(GestureType.PEACE)]
+    frames = [(peace, 0.0), (peace, 0.1), ([], 0.2), ([], 0.3), (peace, 0.4), ([], 0.5)]
+    assert pressed_sequence(engine, GamepadButton.X, frames) == [True, True, True, True, False, False]
+
+
+def test_turbo_mode_alternates_at_rate():
+    engine = engine_for(GestureBinding(GestureType.FIST, GamepadButton.A, ActionMode.TURBO, turbo_hz=10.0))
+    fist = [hand(GestureType.FIST)]
+    # 10 Hz: 50 ms pressionado, 50 ms solto.
+    frames = [(fist, t) for t in (0.0, 0.02, 0.06, 0.09, 0.11)]
+    assert pressed_sequence(engine, GamepadButton.A, frames) == [True, True, False, False, True]
+
+
+def test_stick_region_deadzone_and_direction():
+    region = StickRegion(center=(0.5, 0.5), radius=0.2, deadzone=0.1)
+    assert region.deflection(0.51, 0.5) == (0.0, 0.0)
+    x, y = region.deflection(0.9, 0.5)
+    assert x == pytest.approx(1.0) and y == pytest.approx(0.0)
+    x, y = region.deflection(0.5, 0.4)  # mão acima do centro → analógico para cima
+    assert x == pytest.approx(0.0) and 0.0 < y < 1.0
+    assert StickRegion(invert_x=True).deflection(0.8, 0.5)[0] < 0.0
+
+
+def test_stick_binding_uses_filtered_position():
+    engine = GestureMappingEngine(default_profile())
+    engine.update([hand(GestureType.POINTING, x=0.1, y=0.5)], 0.0, positions=lambda h: (0.9, 0.5))
+    assert engine.stick_values["left"][0] == pytest.approx(1.0)
+    engine.update([], 0.1)
+    assert engine.stick_values["left"] == (0.0, 0.0)
+
+
+def test_profile_round_trip_through_dict():
+    profile = MappingProfile(
+        "completo",
+        [
+            GestureBinding(GestureType.FIST, GamepadButton.A, ActionMode.TURBO, hand="left", turbo_hz=15.0),
+            GestureBinding(GestureType.POINTING, stick=StickRegion("right", (0.4, 0.6), 0.25, 0.05, True)),
+        ],
+    )
+    assert MappingProfile.from_dict(profile.to_dict()) == profile
@@ -0,0 +1,103 @@
+"""
+Testes da suavização de gestos (gesture_smoothing): votação N-de-M, histerese na saída,
+tempo mínimo entre trocas e um filtro independente por mão
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from gesture_smoothing import GestureSmoother, HandGestureFilter
+from hand_landmarks import GestureType
+
+FIST = GestureType.FIST
+OPEN = GestureType.OPEN_HAND
+UNKNOWN = GestureType.UNKNOWN
+
+
+def feed(hand_filter, gestures, start=0.0, step=0.1):
+    """Alimenta o filtro com um rótulo por frame e devolve os eventos emitidos."""
+
+    events = []
+    for idx, gesture in enumerate(gestures):
+        event = hand_filter.update(gesture, start + idx * step)
+        if event is not None:
+            events.append(event)
+    return events
+
+
+def test_gesture_enters_after_enough_votes():
+    hand_filter = HandGestureFilter("Right", window=5, enter_votes=3, exit_votes=2, min_hold=0.0)
+    assert feed(hand_filter, [FIST, FIST]) == []
+    events = feed(hand_filter, [FIST], start=0.2)
+    assert [(e.previous, e.current, e.votes) for e in events] == [(UNKNOWN, FIST, 3)]
+    assert hand_filter.stable is FIST
+
+
+def test_isolated_glitches_do_not_switch():
+    hand_filter = HandGestureFilter("Right", window=5, enter_votes=3, exit_votes=2, min_hold=0.0)
+    feed(hand_filter, [FIST] * 5)
+    assert feed(hand_filter, [OPEN, FIST, OPEN, FIST], start=1.0) == []
+    assert hand_filter.stable is FIST
+
+
+def test_hysteresis_keeps_gesture_until_votes_drop_below_exit():
+    hand_filter = HandGestureFilter("Right", window=5, enter_votes=4, exit_votes=2, min_hold=0.0)
+    feed(hand_filter, [FIST] * 5)
+    # 4 e depois 3 votos de FIST: ainda no limiar de saída ou acima.
+    assert feed(hand_filter, [UNKNOWN, UNKNOWN], start=1.0) == []
+    assert hand_filter.stable is FIST
+    events = feed(hand_filter, [UNKNOWN, UNKNOWN], start=2.0)
+    assert [(e.previous, e.current) for e in events] == [(FIST, UNKNOWN)]
+
+
+def test_min_hold_delays_the_next_switch():
+    hand_filter = HandGestureFilter("Right", window=3, enter_votes=2, exit_votes=1, min_hold=1.0)
+    assert len(feed(hand_filter, [FIST, FIST])) == 1  # entra em t=0.1
+    assert feed(hand_filter, [OPEN, OPEN, OPEN], start=0.2) == []
+    events = feed(hand_filter, [OPEN], start=1.1)
+    assert [(e.previous, e.current) for e in events] == [(FIST, OPEN)]
+
+
+def test_reset_returns_to_unknown():
+    hand_filter = HandGestureFilter("Right", window=3, enter_votes=2, exit_votes=1, min_hold=0.0)
+    feed(hand_filter, [FIST] * 3)
+    hand_filter.reset()
+    assert hand_filter.stable is UNKNOWN
+    assert feed(hand_filter, [FIST]) == []
+
+
+def test_invalid_vote_parameters():
+    with pytest.raises(ValueError):
+        HandGestureFilter("Right", window=4, enter_votes=5, exit_votes=2)
+    with pytest.raises(ValueError):
+        GestureSmoother().configure(exit_votes=6)
+
+
+def test_smoother_keeps_one_filter_per_hand():
+    smoother = GestureSmoother(window=3, enter_votes=2, exit_votes=1, min_hold=0.0)
+    hands = [SimpleNamespace(handedness="Left", gesture=FIST), SimpleNamespace(handedness="Right", gesture=OPEN)]
+    events = []
+    for frame in range(3):
+        events += smoother.update(hands, frame * 0.1)
+    assert sorted((e.hand, e.current) for e in events) == [("Left", FIST), ("Right", OPEN)]
+    assert smoother.stable_gesture("Left") is FIST
+    assert smoother.stable_gesture("Right") is OPEN
+    assert smoother.has_active_gesture
+
+    # A mão que sumiu recebe UNKNOWN e decai sozinha; a outra continua.
+    for frame in range(3, 6):
+        events = smoother.update(hands[1:], frame * 0.1)
+    assert smoother.stable_gesture("Left") is UNKNOWN
+    assert smoother.stable_gesture("Right") is OPEN
+
+
+def test_configure_restarts_filters():
+    smoother = GestureSmoother(window=3, enter_votes=2, exit_votes=1, min_hold=0.0)
+    hands = [SimpleNamespace(handedness="Right", gesture=FIST)]
+    smoother.update(hands, 0.0)
+    smoother.update(hands, 0.1)
+    assert smoother.stable_gesture("Right") is FIST
+    smoother.configure(window=5, enter_votes=4)
+    assert smoother.stable_gesture("Right") is UNKNOWN
+    assert not smoother.has_active_gesture
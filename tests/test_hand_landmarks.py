@@ -0,0 +1,84 @@
+"""
+Testes do classificador vetorizado (hand_landmarks): gestos das poses sintéticas, as
+duas lateralidades e a desconhecida, o caminho rápido de uma mão contra o vetorizado e
+a conversão dos landmarks no formato do MediaPipe
+"""
+
+import types
+
+import numpy as np
+import pytest
+
+from fixtures import GESTURE_POSES, hand_pose
+from hand_landmarks import (
+    GESTURE_CODES,
+    GESTURES_BY_CODE,
+    GestureType,
+    classify_finger_states,
+    classify_gestures,
+    finger_states,
+    hand_centroids,
+    handedness_code,
+    landmarks_to_array,
+    stack_landmarks,
+)
+
+
+def mediapipe_hand(landmarks):
+    return types.SimpleNamespace(landmark=[types.SimpleNamespace(x=x, y=y, z=z) for x, y, z in landmarks.tolist()])
+
+
+@pytest.mark.parametrize("side", [1, -1])
+@pytest.mark.parametrize("gesture", list(GESTURE_POSES))
+def test_poses_are_classified(gesture, side):
+    pose = hand_pose(GESTURE_POSES[gesture], side)
+    codes = classify_gestures(pose, np.array([side]))
+    assert GESTURES_BY_CODE[codes[0]] is GestureType(gesture)
+
+
+def test_unknown_handedness_uses_distance_to_wrist():
+    for side in (1, -1):
+        pose = hand_pose(GESTURE_POSES["thumbs_up"], side)
+        assert GESTURES_BY_CODE[classify_gestures(pose, np.array([0]))[0]] is GestureType.THUMBS_UP
+
+
+def test_unmapped_finger_combination_is_unknown():
+    pose = hand_pose((1, 2, 3), 1)
+    assert GESTURES_BY_CODE[classify_gestures(pose, np.array([1]))[0]] is GestureType.UNKNOWN
+
+
+def test_single_hand_fast_path_matches_vectorised_path():
+    rng = np.random.default_rng(3)
+    poses = [hand_pose(fingers, side) for fingers in GESTURE_POSES.values() for side in (1, -1)]
+    stack = np.stack(poses * 20)
+    stack += rng.normal(0.0, 0.03, stack.shape).astype(np.float32)
+    handedness = np.resize(np.array([1, -1, 0], dtype=np.int8), len(stack))
+
+    vectorised = classify_finger_states(finger_states(stack, handedness))
+    single = np.array([classify_gestures(stack[idx], handedness[idx])[0] for idx in range(len(stack))])
+    np.testing.assert_array_equal(single, vectorised)
+    assert len(set(vectorised.tolist())) > 2  # o ruído precisa cobrir mais de um gesto
+
+
+def test_finger_states_columns():
+    states = finger_states(hand_pose(GESTURE_POSES["peace"], 1), np.array([1]))
+    assert states.tolist() == [[False, True, True, False, False]]
+
+
+def test_stack_landmarks_single_and_multiple_hands():
+    poses = [hand_pose(GESTURE_POSES["fist"], 1), hand_pose(GESTURE_POSES["open_hand"], -1)]
+
+    single = stack_landmarks([mediapipe_hand(poses[0])])
+    assert single.shape == (1, 21, 3) and single.dtype == np.float32
+    np.testing.assert_array_equal(single[0], poses[0])
+
+    both = stack_landmarks(mediapipe_hand(pose) for pose in poses)
+    np.testing.assert_array_equal(both, np.stack(poses))
+    np.testing.assert_array_equal(landmarks_to_array(mediapipe_hand(poses[1])), poses[1])
+
+
+def test_centroids_and_handedness_codes():
+    pose = hand_pose(GESTURE_POSES["fist"], 1)
+    np.testing.assert_allclose(hand_centroids(pose)[0], pose[:, :2].mean(axis=0), rtol=1e-6)
+    assert [handedness_code(label) for label in ("Right", "left", "Unknown")] == [1, -1, 0]
+    assert GESTURES_BY_CODE[GESTURE_CODES[GestureType.PEACE]] is GestureType.PEACE
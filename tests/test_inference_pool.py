@@ -0,0 +1,169 @@
+"""
+Testes do inference_pool com um reconhecedor falso (picklável, como o do
+bench_inference_pool): distribuição por câmera e round-robin, descarte de resultados
+atrasados, reinício de workers mortos e frames sobrescritos no FrameBus
+"""
+
+import os
+import time
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from frame_bus import FrameBus
+from frame_types import ColorFormat
+from hand_landmarks import GestureType, HandPosition
+from inference_pool import InferencePool
+
+SHAPE = (8, 8, 3)
+SLOW, FAILS, CRASHES = 100, 254, 255  # valores do primeiro pixel que mudam o comportamento
+
+
+class FakeRecognizer:
+    """Devolve uma mão com os landmarks iguais ao primeiro pixel / 255.
+
+    Pixel `SLOW` demora, `FAILS` lança exceção e `CRASHES` derruba o processo do worker.
+    """
+
+    def __init__(self, delay: float = 0.3) -> None:
+        self.delay = delay
+
+    def detect_hands(self, frame: np.ndarray, color_format: ColorFormat = ColorFormat.RGB):
+        value = int(frame[0, 0, 0])
+        if value == CRASHES:
+            os._exit(3)
+        if value == FAILS:
+            raise ValueError("frame inválido")
+        if value == SLOW:
+            time.sleep(self.delay)
+        landmarks = np.full((21, 3), value / 255.0, dtype=np.float32)
+        return [HandPosition(0.5, 0.5, GestureType.FIST, score=0.9, handedness="Right", landmarks=landmarks)]
+
+
+def frame(value: int) -> np.ndarray:
+    return np.full(SHAPE, value, dtype=np.uint8)
+
+
+def drain(pool: InferencePool, timeout: float = 20.0):
+    """Coleta resultados até não haver frames em voo."""
+
+    results = []
+    deadline = time.perf_counter() + timeout
+    while pool.in_flight and time.perf_counter() < deadline:
+        results += pool.poll_results(timeout=0.05)
+    assert pool.in_flight == 0, "frames presos no pool"
+    return results
+
+
+@pytest.fixture
+def make_pool():
+    pools = []
+
+    def factory(workers: int = 2, **kwargs) -> InferencePool:
+        kwargs.setdefault("recognizer_factory", FakeRecognizer)
+        pool = InferencePool(workers, frame_shape=SHAPE, **kwargs)
+        pools.append(pool)
+        return pool
+
+    yield factory
+    for pool in pools:
+        pool.close()
+
+def test_per_camera_pins_each_camera_to_a_worker(make_pool):
+    pool = make_pool(workers=2, mode="per_camera", slots_per_worker=2)
+    for camera_id in range(4):
+        assert pool.submit(camera_id, frame(camera_id), sequence=1)
+    # Câmeras 0 e 2 já ocupam os dois slots do worker 0.
+    assert not pool.submit(0, frame(0), sequence=2)
+    assert pool.dropped == 1
+
+    results = drain(pool)
+    assert sorted((result.camera_id, result.worker_id) for result in results) == [(0, 0), (1, 1), (2, 0), (3, 1)]
+    for result in results:
+        hand = result.hands()[0]
+        assert hand.gesture is GestureType.FIST
+        assert hand.handedness == "Right"
+        np.testing.assert_allclose(hand.landmarks, result.camera_id / 255.0)
+
+
+def test_round_robin_spreads_one_camera_over_workers(make_pool):
+    pool = make_pool(workers=2, mode="round_robin", slots_per_worker=1)
+    assert pool.submit(0, frame(1))
+    assert pool.submit(0, frame(2))
+    assert not pool.submit(0, frame(3))  # Os dois workers estão ocupados
+
+    results = drain(pool)
+    assert Counter(result.worker_id for result in results) == {0: 1, 1: 1}
+    assert pool.stale_results == 0  # Sequência 0: sem descarte por ordem
+
+
+def test_results_older_than_the_last_delivered_are_dropped(make_pool):
+    pool = make_pool(workers=2, mode="round_robin", slots_per_worker=1)
+    assert pool.submit(0, frame(SLOW), sequence=1)
+    assert pool.submit(0, frame(5), sequence=2)
+
+    results = drain(pool)
+    assert [result.sequence for result in results] == [2]
+    assert pool.stale_results == 1
+
+
+def test_recognizer_error_returns_empty_result(make_pool):
+    pool = make_pool(workers=1)
+    assert pool.submit(0, frame(FAILS), sequence=1)
+    (result,) = drain(pool)
+    assert result.error.startswith("ValueError")
+    assert result.hands() == []
+    assert pool.failed_frames == 1
+    assert pool.alive_workers == 1
+
+
+def test_dead_worker_restarts_until_max_restarts(make_pool):
+    pool = make_pool(workers=1, max_restarts=2)
+    for restart in range(1, 3):
+        assert pool.submit(0, frame(CRASHES))
+        assert drain(pool) == []
+        assert pool.worker_restarts == [restart]
+        assert pool.alive_workers == 1
+
+    # O worker reiniciado continua atendendo.
+    assert pool.submit(0, frame(7), sequence=1)
+    assert [result.sequence for result in drain(pool)] == [1]
+
+    assert pool.submit(0, frame(CRASHES))
+    deadline = time.perf_counter() + 20.0
+    while pool.alive_workers and time.perf_counter() < deadline:
+        pool.poll_results(timeout=0.05)
+    pool.poll_results()
+    assert pool.alive_workers == 0
+    assert pool.worker_restarts == [2]
+    assert not pool.submit(0, frame(7), sequence=2)  # Desativado: frames descartados
+
+
+def test_submit_bus_reads_without_copy_and_detects_overwrite(make_pool):
+    pool = make_pool(workers=1, slots_per_worker=2)
+    with FrameBus.create(SHAPE, slots=2) as bus:
+        sequence = bus.publish(frame(9))
+        assert pool.submit_bus(3, bus)
+        (result,) = drain(pool)
+        assert (result.camera_id, result.sequence, result.error) == (3, sequence, None)
+        np.testing.assert_allclose(result.landmarks, 9 / 255.0)
+
+        # O produtor sobrescreve o slot enquanto o worker ainda está no frame lento.
+        slow = bus.publish(frame(SLOW))
+        assert pool.submit_bus(3, bus, slow)
+        time.sleep(0.1)
+        bus.publish(frame(10))
+        bus.publish(frame(11))
+        (result,) = drain(pool)
+        assert result.error.startswith("LookupError")
+        assert pool.failed_frames == 1
+
+        assert not pool.submit_bus(3, bus, slow)  # Já saiu do anel
+        assert pool.dropped == 1
+
+
+@pytest.mark.parametrize("kwargs", [{"workers": 0}, {"workers": 1, "mode": "random"}])
+def test_invalid_configuration(kwargs):
+    with pytest.raises(ValueError):
+        InferencePool(frame_shape=SHAPE, recognizer_factory=FakeRecognizer, **kwargs)
@@ -0,0 +1,86 @@
+"""
+Testes da gravação de landmarks (landmark_recording): blocos que cruzam o tamanho do
+chunk, cabeçalho `.npy` atualizado a cada flush, reclassificação e matriz de confusão
+"""
+
+import numpy as np
+import pytest
+
+from fixtures import GESTURE_POSES, hand_pose
+from hand_landmarks import GESTURE_CODES, GESTURES_BY_CODE, GestureType
+from landmark_recording import (
+    LandmarkRecorder,
+    confusion_matrix,
+    gesture_counts,
+    load_landmark_recording,
+    reclassify,
+)
+
+
+def write_frames(recorder, frames):
+    """Grava `frames` frames alternando os gestos das poses, duas mãos por frame."""
+
+    names = list(GESTURE_POSES)
+    for frame in range(frames):
+        gestures = [names[frame % len(names)], names[(frame + 1) % len(names)]]
+        landmarks = np.stack([hand_pose(GESTURE_POSES[gestures[0]], 1), hand_pose(GESTURE_POSES[gestures[1]], -1)])
+        codes = np.array([GESTURE_CODES[GestureType(name)] for name in gestures], dtype=np.int8)
+        recorder.write(frame * 0.033, frame, landmarks, np.array([1, -1]), [0.9, 0.8], codes)
+
+
+def test_records_survive_chunk_boundaries(tmp_path):
+    path = tmp_path / "landmarks.npy"
+    with LandmarkRecorder(path, chunk_size=3) as recorder:
+        write_frames(recorder, 10)
+
+    records = load_landmark_recording(path)
+    assert len(records) == 20
+    assert records["frame"].tolist() == [frame for frame in range(10) for _ in range(2)]
+    assert records["hand"].tolist() == [0, 1] * 10
+    assert records["handedness"].tolist() == [1, -1] * 10
+    np.testing.assert_allclose(records["score"], [0.9, 0.8] * 10, rtol=1e-6)
+    np.testing.assert_array_equal(records["landmarks"][1], hand_pose(GESTURE_POSES["open_hand"], -1))
+
+
+def test_flush_makes_records_visible_while_recording(tmp_path):
+    path = tmp_path / "landmarks.npy"
+    recorder = LandmarkRecorder(path, chunk_size=64)
+    write_frames(recorder, 3)
+    recorder.flush()
+    assert len(load_landmark_recording(path)) == 6
+    write_frames(recorder, 2)
+    recorder.close()
+    assert len(load_landmark_recording(path)) == 10
+    recorder.close()  # fechar de novo não faz nada
+
+
+def test_load_rejects_other_arrays(tmp_path):
+    path = tmp_path / "frames.npy"
+    np.save(path, np.zeros((2, 4, 4, 3), dtype=np.uint8))
+    with pytest.raises(ValueError):
+        load_landmark_recording(path)
+
+
+def test_reclassify_matches_recorded_gestures(tmp_path):
+    path = tmp_path / "landmarks.npy"
+    with LandmarkRecorder(path) as recorder:
+        write_frames(recorder, 10)
+    records = load_landmark_recording(path)
+
+    codes = reclassify(records, chunk_size=7)
+    np.testing.assert_array_equal(codes, records["gesture"])
+    everything_fist = reclassify(records, lambda landmarks, handedness: np.zeros(len(landmarks), dtype=np.int8))
+    assert not everything_fist.any()
+
+
+def test_confusion_matrix_and_counts():
+    fist, peace = GESTURE_CODES[GestureType.FIST], GESTURE_CODES[GestureType.PEACE]
+    reference = np.array([fist, fist, peace], dtype=np.int8)
+    candidate = np.array([fist, peace, peace], dtype=np.int8)
+    matrix = confusion_matrix(reference, candidate)
+    assert matrix.shape == (len(GESTURES_BY_CODE),) * 2
+    assert matrix[fist, fist] == 1 and matrix[fist, peace] == 1 and matrix[peace, peace] == 1
+    assert matrix.sum() == 3
+
+    counts = gesture_counts(candidate)
+    assert counts["fist"] == 1 and counts["peace"] == 2 and counts["unknown"] == 0
@@ -0,0 +1,76 @@
+"""
+Testes dos assets da interface web (static_assets): negociação de Accept-Encoding,
+ETags por representação, URLs com impressão digital e o index reescrito
+"""
+
+import gzip
+
+import pytest
+
+from static_assets import (
+    CACHE_IMMUTABLE,
+    CACHE_REVALIDATE,
+    STATIC_PREFIX,
+    AssetStore,
+    compress_variants,
+    fingerprinted,
+    parse_accept_encoding,
+)
+
+SCRIPT = "console.log('notouchpad');\n" * 50
+
+
+@pytest.fixture
+def store(tmp_path):
+    (tmp_path / "app.js").write_text(SCRIPT, encoding="utf-8")
+    (tmp_path / "index.html").write_text(
+        f'<html><script src="{STATIC_PREFIX}app.js"></script></html>', encoding="utf-8"
+    )
+    return AssetStore(tmp_path)
+
+
+def test_parse_accept_encoding():
+    assert parse_accept_encoding("gzip, br;q=0.8, *;q=0") == {"identity": 1.0, "gzip": 1.0, "br": 0.8, "*": 0.0}
+    assert parse_accept_encoding(None) == {"identity": 1.0}
+    assert parse_accept_encoding("gzip;q=abc")["gzip"] == 0.0
+
+
+def test_compress_variants_keeps_only_smaller_bodies():
+    body = SCRIPT.encode("utf-8")
+    variants = compress_variants(body)
+    assert gzip.decompress(variants["gzip"]) == body
+    assert set(compress_variants(b"x")) == {"identity"}
+
+
+def test_fingerprinted_url():
+    assert fingerprinted("app.js", "0123456789abcdef") == f"{STATIC_PREFIX}app.0123456789ab.js"
+    assert fingerprinted("LICENSE", "0123456789abcdef") == f"{STATIC_PREFIX}LICENSE.0123456789ab"
+
+
+def test_index_points_to_fingerprinted_urls(store):
+    asset = store.lookup(f"{STATIC_PREFIX}app.js")
+    url = fingerprinted("app.js", asset.digest)
+    assert f'"{url}"' in store.index_html
+    assert store.lookup(url).cache_control == CACHE_IMMUTABLE
+    assert asset.cache_control == CACHE_REVALIDATE
+    assert store.lookup("/") is store.lookup("/index.html")
+    assert store.lookup("/").content_type == "text/html; charset=utf-8"
+    assert store.lookup(f"{STATIC_PREFIX}index.html") is None
+    assert store.lookup("/nada.js") is None
+
+
+def test_negotiate_and_etags(store):
+    asset = store.lookup(f"{STATIC_PREFIX}app.js")
+    assert asset.content_type.endswith("; charset=utf-8")
+
+    encoding, body = asset.negotiate("gzip, deflate")
+    assert encoding == "gzip" and gzip.decompress(body) == SCRIPT.encode("utf-8")
+    assert asset.negotiate("gzip;q=0") == ("identity", SCRIPT.encode("utf-8"))
+    assert asset.negotiate(None)[0] == "identity"
+
+    assert asset.etag("gzip") != asset.etag("identity")
+    assert asset.matches(asset.etag("gzip"))
+    assert asset.matches(f'"outro", W/{asset.etag("identity")}')
+    assert asset.matches("*")
+    assert not asset.matches('"outro"')
+    assert not asset.matches(None)
@@ -0,0 +1,157 @@
+"""
+Testes do gamepad virtual (virtual_gamepad) com o RecordingUInputWriter: só mudanças
+são escritas, um SYN_REPORT por frame, valores de direcional/gatilho/analógico e um
+limite superior de latência gesto → evento
+"""
+
+import time
+
+import numpy as np
+import pytest
+
+from gamepad_controller import GamepadController
+from hand_landmarks import GestureType, HandPosition
+from virtual_gamepad import (
+    ABS_HAT0X,
+    ABS_HAT0Y,
+    ABS_RZ,
+    ABS_X,
+    ABS_Y,
+    ABS_Z,
+    BTN_A,
+    BTN_B,
+    EV_ABS,
+    EV_KEY,
+    EV_SYN,
+    STICK_MAX,
+    STICK_MIN,
+    TRIGGER_MAX,
+    GamepadButton,
+    RecordingUInputWriter,
+    UInputGamepad,
+)
+
+SYN = (EV_SYN, 0, 0)
+
+
+def events(writer):
+    """Eventos gravados sem o instante: (tipo, código, valor)."""
+
+    return [event[1:] for event in writer.events]
+
+
+@pytest.fixture
+def writer():
+    return RecordingUInputWriter()
+
+
+@pytest.fixture
+def gamepad(writer):
+    return UInputGamepad(writer)
+
+
+def test_flush_writes_only_changes(gamepad, writer):
+    gamepad.set_button(GamepadButton.A, True)
+    assert gamepad.flush() == 1
+    assert events(writer) == [(EV_KEY, BTN_A, 1), SYN]
+
+    writer.clear()
+    gamepad.set_button(GamepadButton.A, True)
+    gamepad.set_stick("left", 0.0, 0.0)
+    assert gamepad.flush() == 0
+    assert writer.events == []
+    assert writer.reports == 0
+
+
+def test_press_and_release_in_same_frame_writes_nothing(gamepad, writer):
+    gamepad.set_button(GamepadButton.B, True)
+    gamepad.set_button(GamepadButton.B, False)
+    assert gamepad.flush() == 0
+    assert writer.events == []
+
+
+def test_one_syn_report_per_frame(gamepad, writer):
+    gamepad.set_button(GamepadButton.A, True)
+    gamepad.set_button(GamepadButton.B, True)
+    gamepad.set_stick("left", 0.5, -0.5)
+    gamepad.set_button(GamepadButton.RT, True)
+    assert gamepad.flush() == 5
+
+    recorded = events(writer)
+    assert writer.reports == 1
+    assert recorded[-1] == SYN
+    assert SYN not in recorded[:-1]
+    assert {(EV_KEY, BTN_A, 1), (EV_KEY, BTN_B, 1), (EV_ABS, ABS_RZ, TRIGGER_MAX)} <= set(recorded)
+
+
+def test_dpad_hat_values(gamepad, writer):
+    gamepad.set_button(GamepadButton.DPAD_UP, True)
+    gamepad.flush()
+    assert events(writer) == [(EV_ABS, ABS_HAT0Y, -1), SYN]
+
+    # Cima e baixo juntos se anulam; soltar cima deixa só baixo.
+    writer.clear()
+    gamepad.set_button(GamepadButton.DPAD_DOWN, True)
+    gamepad.flush()
+    assert events(writer) == [(EV_ABS, ABS_HAT0Y, 0), SYN]
+
+    writer.clear()
+    gamepad.set_button(GamepadButton.DPAD_UP, False)
+    gamepad.set_button(GamepadButton.DPAD_LEFT, True)
+    gamepad.flush()
+    assert sorted(events(writer)[:-1]) == [(EV_ABS, ABS_HAT0X, -1), (EV_ABS, ABS_HAT0Y, 1)]
+
+
+def test_trigger_axis_values(gamepad, writer):
+    gamepad.set_button(GamepadButton.LT, True)
+    gamepad.set_trigger(GamepadButton.RT, 0.5)
+    gamepad.flush()
+    assert sorted(events(writer)[:-1]) == [(EV_ABS, ABS_Z, TRIGGER_MAX), (EV_ABS, ABS_RZ, 128)]
+
+    writer.clear()
+    gamepad.set_trigger(GamepadButton.RT, 3.0)  # Fora da faixa: satura
+    gamepad.set_button(GamepadButton.LT, False)
+    gamepad.flush()
+    assert sorted(events(writer)[:-1]) == [(EV_ABS, ABS_Z, 0), (EV_ABS, ABS_RZ, TRIGGER_MAX)]
+
+
+def test_stick_values_and_y_inversion(gamepad, writer):
+    gamepad.set_stick("left", 1.0, 1.0)
+    gamepad.flush()
+    assert sorted(events(writer)[:-1]) == [(EV_ABS, ABS_X, STICK_MAX), (EV_ABS, ABS_Y, STICK_MIN)]
+
+    writer.clear()
+    gamepad.set_stick("left", -2.0, -1.0)
+    gamepad.flush()
+    assert sorted(events(writer)[:-1]) == [(EV_ABS, ABS_X, STICK_MIN), (EV_ABS, ABS_Y, STICK_MAX)]
+
+
+def test_close_releases_everything(gamepad, writer):
+    gamepad.set_button(GamepadButton.A, True)
+    gamepad.set_button(GamepadButton.LT, True)
+    gamepad.flush()
+    writer.clear()
+
+    gamepad.close()
+    assert sorted(events(writer)[:-1]) == [(EV_KEY, BTN_A, 0), (EV_ABS, ABS_Z, 0)]
+    assert writer.reports == 1
+    assert writer.closed
+
+
+def test_controller_gesture_to_event_latency(writer):
+    controller = GamepadController(backend=UInputGamepad(writer))
+    gestures = (GestureType.FIST, GestureType.OPEN_HAND)
+    latencies_ms = []
+    for frame in range(200):
+        hand = HandPosition(0.5, 0.5, gestures[frame % 2], score=0.9, handedness="Right")
+        writer.clear()
+        started = time.perf_counter_ns()
+        controller.process_gestures([hand], started / 1e9)
+        assert writer.reports == 1
+        latencies_ms.append((writer.events[-1][0] - started) / 1e6)
+
+    # Alternar punho/mão aberta troca A por B a cada frame.
+    assert {(EV_KEY, BTN_A, 0), (EV_KEY, BTN_B, 1)} <= set(events(writer))
+    # Mapeamento + escrita são só Python em memória: bem abaixo de um frame de câmera.
+    assert np.median(latencies_ms) < 1.0
+    assert max(latencies_ms) < 20.0
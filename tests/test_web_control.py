@@ -0,0 +1,153 @@
+"""
+Testes do canal de controle da interface web (web_control): enquadramento WebSocket
+(parse_frames), mensagens binárias (decode_message) e o ResetScheduler
+"""
+
+import os
+import socket
+import struct
+import threading
+import time
+
+import pytest
+
+from web_control import (
+    CLOSE_PROTOCOL_ERROR,
+    CLOSE_TOO_BIG,
+    MAX_PAYLOAD,
+    MSG_GESTURE,
+    MSG_PING,
+    MSG_STICK,
+    OP_BINARY,
+    OP_CLOSE,
+    OP_PING,
+    OP_TEXT,
+    ControlHub,
+    ControlMessage,
+    FrameError,
+    ResetScheduler,
+    decode_message,
+    encode_frame,
+    encode_gesture,
+    encode_ping,
+    encode_stick,
+    parse_frames,
+    websocket_accept,
+)
+
+MASK = b"\x11\x22\x33\x44"
+
+
+def test_accept_key_from_rfc6455():
+    assert websocket_accept("dGhlIHNhbXBsZSBub25jZQ==") == "s3pPLMBiTxaQ9kYGzzhZRbK+xOo="
+
+
+def test_masked_frames_are_unmasked_and_consumed():
+    buffer = bytearray(encode_frame(b"abc", OP_TEXT, MASK) + encode_frame(encode_gesture(2, 9), OP_BINARY, MASK))
+    frames = list(parse_frames(buffer))
+    assert frames == [(True, OP_TEXT, b"abc"), (True, OP_BINARY, encode_gesture(2, 9))]
+    assert buffer == bytearray()
+
+
+def test_incomplete_frame_stays_in_buffer():
+    frame = encode_frame(os.urandom(40), OP_BINARY, MASK)
+    buffer = bytearray(frame[:-5])
+    assert list(parse_frames(buffer)) == []
+    assert buffer == frame[:-5]
+    buffer += frame[-5:]
+    [(fin, opcode, payload)] = parse_frames(buffer)
+    assert (fin, opcode, len(payload)) == (True, OP_BINARY, 40)
+    assert buffer == bytearray()
+
+
+def test_unmasked_client_frame_is_rejected():
+    with pytest.raises(FrameError) as error:
+        list(parse_frames(bytearray(encode_frame(b"x", OP_PING))))
+    assert error.value.close_code == CLOSE_PROTOCOL_ERROR
+    # Do lado do cliente (respostas do servidor) a máscara não é exigida.
+    assert list(parse_frames(bytearray(encode_frame(b"x", OP_PING)), require_mask=False)) == [(True, OP_PING, b"x")]
+
+
+def test_oversized_frame_is_rejected_before_payload_arrives():
+    header = encode_frame(bytes(MAX_PAYLOAD + 1), OP_BINARY, MASK)[:8]
+    with pytest.raises(FrameError) as error:
+        list(parse_frames(bytearray(header)))
+    assert error.value.close_code == CLOSE_TOO_BIG
+
+
+def test_decode_gesture_stick_and_ping():
+    assert decode_message(encode_gesture(3, 0x1_0005)) == ControlMessage(MSG_GESTURE, 3, 5)
+
+    stick = decode_message(encode_stick(1, 0.5, -2.0, 42))
+    assert (stick.kind, stick.arg, stick.sequence) == (MSG_STICK, 1, 42)
+    assert stick.x == pytest.approx(0.5, abs=1e-4)
+    assert stick.y == pytest.approx(-1.0)  # fora de [-1, 1] é saturado
+
+    assert decode_message(encode_ping(8, b"payload")) == ControlMessage(MSG_PING, 0, 8)
+
+
+def test_decode_rejects_malformed_messages():
+    assert decode_message(b"\x01") is None
+    assert decode_message(encode_gesture(1, 1) + b"\x00") is None
+    assert decode_message(encode_stick(0, 0.0, 0.0, 1)[:-1]) is None
+
+
+@pytest.fixture
+def scheduler():
+    scheduler = ResetScheduler()
+    yield scheduler
+    scheduler.close()
+
+
+def test_scheduler_runs_callbacks_in_due_order(scheduler):
+    fired = []
+    done = threading.Event()
+    scheduler.schedule("b", 0.06, lambda: (fired.append("b"), done.set()))
+    scheduler.schedule("a", 0.02, lambda: fired.append("a"))
+    assert done.wait(1.0)
+    assert fired == ["a", "b"]
+    assert scheduler.pending == 0
+
+
+def test_rescheduling_a_key_replaces_its_deadline(scheduler):
+    fired = []
+    done = threading.Event()
+    scheduler.schedule("botao", 0.02, lambda: fired.append("primeiro"))
+    scheduler.schedule("botao", 0.08, lambda: (fired.append("segundo"), done.set()))
+    started = time.monotonic()
+    assert done.wait(1.0)
+    assert time.monotonic() - started >= 0.07
+    assert fired == ["segundo"]
+
+
+def test_cancel_and_failing_callback(scheduler):
+    fired = []
+    done = threading.Event()
+    scheduler.schedule("cancelado", 0.02, lambda: fired.append("cancelado"))
+    scheduler.cancel("cancelado")
+    scheduler.schedule("erro", 0.01, lambda: 1 / 0)
+    scheduler.schedule("ok", 0.05, lambda: (fired.append("ok"), done.set()))
+    assert done.wait(1.0)
+    assert fired == ["ok"]
+
+
+@pytest.mark.parametrize(
+    "frame, code",
+    [
+        (encode_frame(encode_gesture(1, 1), OP_BINARY), CLOSE_PROTOCOL_ERROR),  # cliente sem máscara
+        (encode_frame(bytes(MAX_PAYLOAD + 1), OP_BINARY, MASK)[:8], CLOSE_TOO_BIG),
+    ],
+)
+def test_hub_closes_with_matching_code(frame, code):
+    hub = ControlHub(lambda message: True)
+    server, client = socket.socketpair()
+    try:
+        hub.attach(server)
+        client.sendall(frame)
+        client.settimeout(2.0)
+        [(_, opcode, payload)] = parse_frames(bytearray(client.recv(64)), require_mask=False)
+        assert opcode == OP_CLOSE
+        assert struct.unpack("!H", payload)[0] == code
+    finally:
+        client.close()
+        hub.close()
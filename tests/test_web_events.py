@@ -0,0 +1,62 @@
+"""
+Testes do canal de eventos da interface web (web_events): formato SSE, difusão com ids
+crescentes e o descarte com RESYNC para assinantes lentos
+"""
+
+import json
+
+from web_events import CLOSED, RESYNC, EventBroadcaster, EventSubscription, format_sse
+
+
+def parse_sse(message: bytes):
+    fields = dict(line.split(": ", 1) for line in message.decode("utf-8").strip().split("\n"))
+    return fields.get("id"), fields["event"], json.loads(fields["data"])
+
+
+def test_format_sse_single_line_json():
+    message = format_sse("state", {"gesto": "punho", "linhas": "a\nb"}, event_id=7)
+    assert message.endswith(b"\n\n")
+    assert message.count(b"\n") == 4
+    assert parse_sse(message) == ("7", "state", {"gesto": "punho", "linhas": "a\nb"})
+    assert b"id:" not in format_sse("ping", None)
+
+
+def test_publish_reaches_every_subscriber_with_same_bytes():
+    broadcaster = EventBroadcaster()
+    first, second = broadcaster.subscribe(), broadcaster.subscribe()
+    assert broadcaster.subscriber_count == 2
+    assert broadcaster.publish("state", {"fps": 30}) == 1
+    assert broadcaster.publish("state", {"fps": 29}) == 2
+
+    received = [first.get(timeout=0), first.get(timeout=0)]
+    assert [parse_sse(message)[0] for message in received] == ["1", "2"]
+    assert second.get(timeout=0) is received[0]
+    assert broadcaster.last_id == 2
+
+
+def test_unsubscribed_client_gets_nothing():
+    broadcaster = EventBroadcaster()
+    subscription = broadcaster.subscribe()
+    broadcaster.unsubscribe(subscription)
+    broadcaster.publish("state", {})
+    assert subscription.get(timeout=0) is None
+    assert broadcaster.subscriber_count == 0
+
+
+def test_slow_subscriber_drops_backlog_and_resyncs():
+    subscription = EventSubscription(max_pending=3)
+    for idx in range(3):
+        subscription.put(b"evento %d" % idx)
+    subscription.put(b"evento 3")
+    assert subscription.get(timeout=0) is RESYNC
+    assert subscription.get(timeout=0) is None
+    assert subscription.dropped == 3
+
+
+def test_close_delivers_closed_even_when_full():
+    broadcaster = EventBroadcaster(max_pending=1)
+    subscription = broadcaster.subscribe()
+    broadcaster.publish("state", {})
+    broadcaster.close()
+    assert subscription.get(timeout=0) is CLOSED
+    assert broadcaster.subscriber_count == 0